@@ -0,0 +1,183 @@
+"""
+Benchmarks do TextDecoder
+
+Uso: python -m benchmarks.bench_text_decoder
+"""
+
+import random
+import string
+import time
+
+from src.decoders import base_n
+from src.decoders.text_decoder import TextDecoder
+
+TEXT_SIZE = 1_000_000
+
+
+def legacy_caesar(text, shift):
+    """Implementação original, caractere a caractere, usada como referência"""
+    result = ""
+    for char in text:
+        if char.isalpha():
+            ascii_offset = ord('A') if char.isupper() else ord('a')
+            result += chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
+        else:
+            result += char
+    return result
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_cipher_kernel(text):
+    decoder = TextDecoder()
+    legacy = timed(legacy_caesar, text, 3)
+    kernel = timed(decoder.caesar_cipher, text, 3)
+    print(f"caesar_cipher 1MB: legado {legacy:.3f}s, tabela {kernel:.4f}s "
+          f"({legacy / kernel:.0f}x)")
+
+
+def bench_caesar_brute_force(text):
+    decoder = TextDecoder()
+    elapsed = timed(decoder.brute_force_caesar, text)
+    print(f"brute_force_caesar 1MB (26 deslocamentos): {elapsed:.3f}s")
+
+
+def bench_vigenere_keyless(text):
+    decoder = TextDecoder()
+    encrypted = decoder.encode_vigenere("ZNALOST:" + text)
+    elapsed = timed(decoder.solve_vigenere, encrypted)
+    print(f"solve_vigenere 1MB (sem chave): {elapsed:.3f}s")
+
+
+def bench_detect_encoding(text):
+    decoder = TextDecoder()
+    elapsed = timed(decoder.detect_encoding, text)
+    print(f"detect_encoding 1MB: {elapsed * 1000:.1f}ms")
+    # Formatos cujas checagens dependem da ordem dos caracteres
+    roman = ' '.join(random.choices(['XIV', 'MCM', 'VII', 'XL', 'CD'], k=TEXT_SIZE // 4))
+    taps = ' / '.join(random.choices(['. ..', '... .....', '.. .'], k=TEXT_SIZE // 8))
+    for name, payload in (("romanos", roman), ("tap", taps)):
+        elapsed = timed(decoder.detect_encoding, payload)
+        print(f"detect_encoding 1MB ({name}): {elapsed * 1000:.1f}ms")
+
+
+def bench_morse(text):
+    decoder = TextDecoder()
+    encoded = decoder.encode_morse(text)
+    elapsed = timed(decoder.decode_morse, encoded)
+    print(f"decode_morse {len(encoded) / 1e6:.1f}MB: {elapsed:.3f}s")
+
+
+def bench_cribs():
+    decoder = TextDecoder()
+    candidates = [''.join(random.choices(string.ascii_uppercase + ' ', k=60)) for _ in range(200_000)]
+    elapsed = timed(decoder.find_cribs, candidates)
+    print(f"find_cribs 200k candidatos: {elapsed:.3f}s")
+
+
+def bench_substitution():
+    decoder = TextDecoder()
+    plain = ("WHEN THE STORM PASSED THE VILLAGERS CAME OUT OF THEIR HOUSES TO COUNT WHAT HAD BEEN LOST "
+             "THE OLD MILL WAS GONE AND THE BRIDGE OVER THE RIVER HAD COLLAPSED BUT NOBODY HAD BEEN HURT "
+             "AND BY EVENING THEY WERE ALREADY PLANNING HOW TO REBUILD IT")
+    key = ''.join(random.sample(string.ascii_uppercase, 26))
+    cipher = plain.translate(str.maketrans(string.ascii_uppercase, key))
+    elapsed = timed(decoder.solve_substitution, cipher)
+    print(f"solve_substitution {len(cipher)} caracteres: {elapsed:.3f}s")
+
+
+def bench_transposition():
+    decoder = TextDecoder()
+    plain = ("THELABYRINTHKEEPSITSSECRETSWELLHIDDENBEHINDDOORSTHATONLYOPEN"
+             "FORTHOSEWHOKNOWTHERIGHTWORDSEVERYROOMHOLDSANOBJECT")
+    # O custo da busca não depende da chave: o próprio texto claro serve
+    elapsed = timed(decoder.search_transposition, plain)
+    print(f"search_transposition {len(plain)} letras (colunar até 9): {elapsed:.3f}s")
+
+
+def bench_xor():
+    decoder = TextDecoder()
+    plain = ("O segredo do labirinto está guardado atrás da porta principal. " * 20_000).encode('utf-8')
+    encrypted = bytes(byte ^ key for byte, key in zip(plain, b'segredo!' * (len(plain) // 8 + 1)))
+    elapsed = timed(decoder.solve_xor, encrypted)
+    print(f"solve_xor {len(encrypted) / 1e6:.1f}MB (chave de 8 bytes): {elapsed:.3f}s")
+
+
+def bench_numeric(text):
+    decoder = TextDecoder()
+    encoded = decoder.encode_ascii(text[:100_000])
+    elapsed = timed(decoder.scan_numeric, encoded)
+    print(f"scan_numeric 100k tokens (todos os esquemas): {elapsed * 1000:.1f}ms")
+
+
+def bench_base_n():
+    decoder = TextDecoder()
+    data = random.randbytes(1_000_000)
+    for codec in ('base32', 'base85', 'base91'):
+        encoded = base_n.encode(data, codec)
+        elapsed = timed(lambda: b''.join(decoder.stream_decode([encoded], codec)))
+        print(f"stream_decode {codec} 1MB: {elapsed:.3f}s")
+
+
+def bench_decode_chain():
+    decoder = TextDecoder()
+    payload = random.randbytes(1_000_000)
+    layered = base_n.encode(payload, 64).encode().hex()
+    elapsed = timed(decoder.decode_chain, layered, ['hex', 'base64'])
+    print(f"decode_chain hex -> base64 1MB: {elapsed:.3f}s")
+
+
+def bench_carver():
+    decoder = TextDecoder()
+    # Prosa (palavras curtas) com um segredo Base64 a cada ~20 KB
+    words = [''.join(random.choices(string.ascii_lowercase, k=random.randint(2, 10))) for _ in range(1000)]
+    prose = ' '.join(random.choices(words, k=200_000))
+    secret = base_n.encode(b"mensagem escondida no meio do dump", 64)
+    dump = ''.join(prose[i:i + 20_000] + " " + secret + " " for i in range(0, len(prose), 20_000)) * 10
+    elapsed = timed(decoder.carve_fragments, dump)
+    print(f"carve_fragments {len(dump) // 1_000_000}MB: {elapsed:.3f}s")
+
+
+def bench_stego(text):
+    decoder = TextDecoder()
+    elapsed = timed(decoder.analyze_stego, text)
+    print(f"analyze_stego 1MB (sem invisíveis): {elapsed:.4f}s")
+    hidden = ''.join(f"{b:08b}" for b in b"x" * 10_000).translate(str.maketrans('01', '\u200b\u200c'))
+    elapsed = timed(decoder.scan_stego, text[:100_000] + hidden)
+    print(f"scan_stego 80k invisíveis: {elapsed:.3f}s")
+
+
+def bench_solve_layers(text):
+    decoder = TextDecoder()
+    payload = base_n.encode(text.encode()[:750_000], 64)
+    for name, data, budget in [('letras', text, 0.5), ('Base64', payload, 0.2)]:
+        elapsed = timed(lambda: decoder.solve_layers(data, time_budget=budget))
+        print(f"solve_layers 1MB de {name} (orçamento {budget}s): {elapsed:.3f}s")
+
+
+def main():
+    random.seed(0)
+    text = ''.join(random.choices(string.ascii_letters + ' ', k=TEXT_SIZE))
+    bench_cipher_kernel(text)
+    bench_caesar_brute_force(text)
+    bench_vigenere_keyless(text)
+    bench_detect_encoding(text)
+    bench_morse(text)
+    bench_cribs()
+    bench_substitution()
+    bench_transposition()
+    bench_xor()
+    bench_numeric(text)
+    bench_base_n()
+    bench_decode_chain()
+    bench_carver()
+    bench_stego(text)
+    bench_solve_layers(text)
+
+
+if __name__ == '__main__':
+    main()
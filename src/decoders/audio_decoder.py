@@ -8,6 +8,8 @@ import soundfile as sf
 import logging
 from typing import Dict, Any
 
+from . import morse
+
 class AudioDecoder:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -19,22 +21,8 @@ class AudioDecoder:
             'threshold': 0.1      # amplitude mínima
         }
         
-        # Tabela Morse inversa
-        self.morse_decode = {
-            '.-': 'A',     '-...': 'B',   '-.-.': 'C',
-            '-..': 'D',    '.': 'E',      '..-.': 'F',
-            '--.': 'G',    '....': 'H',   '..': 'I',
-            '.---': 'J',   '-.-': 'K',    '.-..': 'L',
-            '--': 'M',     '-.': 'N',     '---': 'O',
-            '.--.': 'P',   '--.-': 'Q',   '.-.': 'R',
-            '...': 'S',    '-': 'T',      '..-': 'U',
-            '...-': 'V',   '.--': 'W',    '-..-': 'X',
-            '-.--': 'Y',   '--..': 'Z',
-            '.----': '1',  '..---': '2',  '...--': '3',
-            '....-': '4',  '.....': '5',  '-....': '6',
-            '--...': '7',  '---..': '8',  '----.': '9',
-            '-----': '0'
-        }
+        # Tabela Morse compartilhada com o TextDecoder
+        self.morse_decode = morse.MORSE_CODE
 
     def analyze_audio(self, file_path: str) -> Dict[str, Any]:
         """
@@ -150,10 +138,7 @@ class AudioDecoder:
                 morse_code.append(''.join(current_signal))
             
             # Decodificar
-            text = []
-            for code in morse_code:
-                if code in self.morse_decode:
-                    text.append(self.morse_decode[code])
+            text = morse.decode_symbols(morse_code)
             
             return "".join(text) if text else "Nenhum código Morse detectado"
             
@@ -0,0 +1,198 @@
+"""
+Cifra de Bacon: grupos de 5 bits escondidos em dois "tipos" de caractere
+
+Um classificador transforma o texto num array de bits (A=0, B=1):
+- 'symbols': dois símbolos quaisquer (A/B, 0/1, ./-, ...);
+- 'case': minúsculas = A, maiúsculas = B (o texto de cobertura é legível);
+- 'parity': dígitos pares = A, ímpares = B.
+
+Os bits são decodificados numa única passada vetorizada: o valor de cada
+janela de 5 bits sai de uma convolução, e as 5 fases do enquadramento, as
+duas polaridades (A=0 ou A=1) e os dois alfabetos (24 letras, com I=J e
+U=V, e 26 letras) viram 20 candidatos de uma só indexação, ranqueados
+pelos quadrigramas. Isso é barato o bastante para rodar em toda entrada.
+"""
+
+import string
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from . import language_model
+from . import quadgrams
+
+ALPHABETS = {
+    26: string.ascii_uppercase,
+    24: 'ABCDEFGHIKLMNOPQRSTUWXYZ',   # I=J e U=V
+}
+
+# Grupos fora do alfabeto viram este caractere
+INVALID = '?'
+
+# Quanto cada grupo inválido derruba a nota (em log-prob por quadrigrama)
+INVALID_PENALTY = 10.0
+
+# Grupos do início dos bits decodificados e pontuados no ranking; só os
+# melhores candidatos são decodificados por inteiro
+SAMPLE_SIZE = 4096
+
+# Tabelas valor (0-31) -> code point, uma linha por alfabeto
+_TABLES = np.array([[ord(alphabet[v]) if v < len(alphabet) else ord(INVALID) for v in range(32)]
+                    for alphabet in ALPHABETS.values()], dtype=np.uint32)
+_WEIGHTS = np.array([16, 8, 4, 2, 1])
+
+CLASSIFIERS = ('symbols', 'case', 'parity')
+
+
+def _codes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def text_bits(text: str, classifier: str = 'symbols', symbols: Optional[str] = None) -> np.ndarray:
+    """
+    Bits (A=0, B=1) do texto segundo o classificador; os caracteres que o
+    classificador não usa são ignorados. Em 'symbols', `symbols` dá o par
+    (A, B); sem ele, são os dois símbolos distintos do texto fora espaços.
+    """
+    codes = _codes(text)
+    if classifier == 'symbols':
+        if symbols is None:
+            symbols = bacon_symbols(text)
+            if symbols is None:
+                raise ValueError("O texto não tem exatamente dois símbolos")
+        a, b = (ord(symbol) for symbol in symbols)
+        used = (codes == a) | (codes == b)
+        return (codes[used] == b).astype(np.uint8)
+    if classifier == 'case':
+        lower = (codes >= ord('a')) & (codes <= ord('z'))
+        upper = (codes >= ord('A')) & (codes <= ord('Z'))
+        return upper[lower | upper].astype(np.uint8)
+    if classifier == 'parity':
+        digits = codes[(codes >= ord('0')) & (codes <= ord('9'))]
+        return (digits % 2).astype(np.uint8)
+    raise ValueError(f"Classificador desconhecido: {classifier}")
+
+
+def bacon_symbols(text: str) -> Optional[str]:
+    """
+    Os dois símbolos do texto (fora espaços), com A/B e 0/1 na ordem natural
+    e os demais na ordem em que aparecem; None se não forem exatamente dois.
+    """
+    # Um início com mais de dois símbolos já decide, sem varrer o texto todo
+    if len(dict.fromkeys(''.join(text[:SAMPLE_SIZE].split()))) > 2:
+        return None
+    distinct = dict.fromkeys(''.join(text.split()))
+    if len(distinct) != 2:
+        return None
+    pair = ''.join(distinct)
+    return ''.join(sorted(pair)) if pair.upper() in ('AB', 'BA') or set(pair) == {'0', '1'} else pair
+
+
+def applicable_classifiers(text: str) -> List[str]:
+    """Classificadores que fazem sentido para o texto"""
+    codes = _codes(text)
+    found = []
+    if bacon_symbols(text) is not None:
+        found.append('symbols')
+    if ((codes >= ord('a')) & (codes <= ord('z'))).any() and ((codes >= ord('A')) & (codes <= ord('Z'))).any():
+        found.append('case')
+    if np.count_nonzero((codes >= ord('0')) & (codes <= ord('9'))) >= 5:
+        found.append('parity')
+    return found
+
+
+def decode_bits(bits: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Os 20 candidatos (5 fases x 2 polaridades x 2 alfabetos) de uma vez, na
+    ordem: fase, polaridade normal antes da invertida, 26 antes de 24 letras.
+    """
+    bits = np.asarray(bits, dtype=np.int64)
+    groups = bits.size // 5
+    if groups == 0:
+        return []
+    # Valor da janela de 5 bits que começa em cada posição
+    windows = np.convolve(bits, _WEIGHTS[::-1], mode='valid')
+    # (fases x grupos): a fase o usa as janelas o, o+5, ...; faltas viram -1
+    matrix = np.full((5, groups), -1, dtype=np.int64)
+    for offset in range(5):
+        values = windows[offset::5]
+        matrix[offset, :values.size] = values
+    values = np.stack((matrix, np.where(matrix >= 0, 31 - matrix, -1)), axis=1)   # (fases x 2 x grupos)
+    chars = _TABLES[:, np.maximum(values, 0)]   # (alfabetos x fases x 2 x grupos)
+    sizes = np.array(list(ALPHABETS))[:, None, None, None]
+    valid = (values[None] >= 0) & (values[None] < sizes)
+
+    results = []
+    for offset in range(5):
+        length = int((matrix[offset] >= 0).sum())
+        for inverted in (False, True):
+            for index, size in enumerate(ALPHABETS):
+                row = chars[index, offset, int(inverted), :length]
+                results.append({
+                    'text': row.astype(np.uint32).tobytes().decode('utf-32-le'),
+                    'offset': offset,
+                    'inverted': inverted,
+                    'alphabet': size,
+                    # Fração de grupos válidos; uma fase com um grupo a menos conta a falta
+                    'valid': float(valid[index, offset, int(inverted), :length].sum()) / groups
+                })
+    return results
+
+
+def decode_reading(bits: np.ndarray, offset: int, inverted: bool, alphabet: int) -> Dict[str, Any]:
+    """Um único candidato de `decode_bits` (fase, polaridade e alfabeto dados): texto e fração de grupos válidos"""
+    bits = np.asarray(bits, dtype=np.int64)
+    tail = bits[offset:]
+    values = np.convolve(tail, _WEIGHTS[::-1], mode='valid')[::5] if tail.size >= 5 else tail[:0]
+    if inverted:
+        values = 31 - values
+    row = _TABLES[list(ALPHABETS).index(alphabet)][values]
+    return {
+        'text': row.astype(np.uint32).tobytes().decode('utf-32-le'),
+        'valid': float((values < alphabet).sum()) / max(bits.size // 5, 1)
+    }
+
+
+def _rank(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Nota = quadrigramas (ou frequências de letras, em textos curtos) menos a penalidade dos grupos inválidos"""
+    if not candidates:
+        return []
+    texts = [candidate['text'][:SAMPLE_SIZE] for candidate in candidates]
+    scores = quadgrams.score_batch(texts)
+    short = ~np.isfinite(scores).any(axis=1)
+    if short.any():
+        counts = np.stack([np.bincount(language_model.letter_indices(text), minlength=26) for text in texts])
+        # Na escala dos quadrigramas: quatro letras independentes por quadrigrama
+        scores[short] = 4 * language_model.unigram_scores(counts[short])
+        scores[counts.sum(axis=1) == 0] = -np.inf   # sem nenhuma letra não há o que pontuar
+    best = language_model.best_language(scores)
+    for candidate, value, language in zip(candidates, best['score'], best['language']):
+        candidate['score'] = float(value) - INVALID_PENALTY * (1 - candidate['valid'])
+        candidate['language'] = str(language)
+    return sorted(candidates, key=lambda candidate: -candidate['score'])
+
+
+def scan(text: str, top_k: int = 5, classifiers: Optional[List[str]] = None,
+         symbols: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Decodifica o texto com cada classificador aplicável (ou os indicados) em
+    todas as fases, polaridades e alfabetos, do mais provável ao menos.
+    """
+    if classifiers is None:
+        classifiers = ['symbols'] if symbols else applicable_classifiers(text)
+    candidates = []
+    streams = {}
+    for classifier in classifiers:
+        bits = streams[classifier] = text_bits(text, classifier, symbols)
+        # Todas as fases ranqueadas no início dos bits
+        for candidate in decode_bits(bits[:5 * SAMPLE_SIZE + 4]):
+            candidate['classifier'] = classifier
+            candidates.append(candidate)
+    best = _rank(candidates)[:top_k]
+    for candidate in best:
+        bits = streams[candidate['classifier']]
+        if bits.size > 5 * SAMPLE_SIZE + 4:
+            reading = decode_reading(bits, candidate['offset'], candidate['inverted'], candidate['alphabet'])
+            candidate['score'] += INVALID_PENALTY * (candidate['valid'] - reading['valid'])
+            candidate.update(reading)
+    return sorted(best, key=lambda candidate: -candidate['score'])
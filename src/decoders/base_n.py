@@ -0,0 +1,381 @@
+"""
+Família Base-N: base32, base36, base58, base62, base64, base85/ascii85 e base91
+
+Cada alfabeto vira uma tabela reversa de 256 posições (byte -> valor do
+dígito, -1 fora do alfabeto); decodificar é uma indexação nessa tabela
+seguida de aritmética vetorizada:
+
+- base32/base64: os 5/6 bits de cada dígito são desempacotados e
+  reempacotados em bytes com np.packbits;
+- base85/ascii85: blocos de 5 dígitos viram inteiros de 32 bits numa
+  multiplicação de matriz;
+- base91: cada par de dígitos dá 13 ou 14 bits, decididos pelo próprio par,
+  então todos os pares são expandidos de uma vez;
+- base36/58/62: o texto é um único número; os dígitos são agrupados em
+  blocos que cabem num int64 e só os blocos são combinados em Python.
+
+Espaços e quebras de linha são ignorados, o padding '=' é opcional e o
+base64 aceita os alfabetos padrão e url-safe. Os formatos em blocos também
+decodificam em fluxo, carregando o quantum incompleto entre os pedaços.
+"""
+
+import base64
+import math
+import re
+import string
+from typing import Any, Dict, Iterator, List, Union
+
+import numpy as np
+
+from . import language_model
+from .streaming import CHUNK_SIZE, Source, iter_chunks
+
+# Codec -> (alfabeto, tipo); o tipo escolhe o decodificador
+CODECS = {
+    'base32': ('ABCDEFGHIJKLMNOPQRSTUVWXYZ234567', 'bits'),
+    'base36': (string.digits + string.ascii_uppercase, 'number'),
+    'base58': ('123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz', 'number'),
+    'base62': (string.digits + string.ascii_uppercase + string.ascii_lowercase, 'number'),
+    'base64': (string.ascii_uppercase + string.ascii_lowercase + string.digits + '+/', 'bits'),
+    'base85': (string.digits + string.ascii_uppercase + string.ascii_lowercase + '!#$%&()*+-;<=>?@^_`{|}~',
+               'blocks85'),
+    'ascii85': (''.join(chr(c) for c in range(ord('!'), ord('u') + 1)), 'blocks85'),
+    'base91': (string.ascii_uppercase + string.ascii_lowercase + string.digits +
+               '!#$%&()*+,./:;<=>?@[]^_`{|}~"', 'base91'),
+}
+
+# Nomes aceitos além dos próprios codecs
+ALIASES = {32: 'base32', 36: 'base36', 58: 'base58', 62: 'base62', 64: 'base64', 85: 'base85',
+           91: 'base91', 'a85': 'ascii85', 'b85': 'base85'}
+
+# Caracteres decodificados em cada quantum dos formatos em blocos
+QUANTUM = {'base32': 8, 'base64': 4, 'base85': 5, 'ascii85': 5, 'base91': 2}
+
+# Bytes decodificados usados para pontuar cada candidato no scan
+SAMPLE_SIZE = 4096
+
+# Bytes imprimíveis (como no bitstream), para a nota dos candidatos
+PRINTABLE = np.zeros(256, dtype=bool)
+PRINTABLE[0x20:0x7f] = True
+PRINTABLE[[0x09, 0x0a, 0x0d]] = True
+PRINTABLE[0x80:] = True   # bytes de UTF-8 multibyte
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Espaços ASCII, para a entrada em bytes
+_SPACES = np.zeros(256, dtype=bool)
+_SPACES[list(b' \t\n\r\x0b\x0c')] = True
+
+
+def _lookup(name: str) -> np.ndarray:
+    """Tabela reversa (256,) do codec: byte -> valor do dígito, -1 fora do alfabeto"""
+    alphabet, _ = CODECS[name]
+    table = np.full(256, -1, dtype=np.int64)
+    table[np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)] = np.arange(len(alphabet))
+    if name in ('base32', 'base36'):
+        # Alfabetos de uma caixa só: minúsculas valem o mesmo
+        lower = alphabet.lower().encode('ascii')
+        table[np.frombuffer(lower, dtype=np.uint8)] = np.arange(len(alphabet))
+    if name == 'base64':
+        table[[ord('-'), ord('_')]] = [62, 63]   # url-safe
+    return table
+
+
+LOOKUP = {name: _lookup(name) for name in CODECS}
+
+
+def codec_name(base: Union[int, str]) -> str:
+    """Normaliza 32, '32', 'base32' ou 'a85' para o nome do codec"""
+    key = int(base) if isinstance(base, int) or str(base).isdigit() else str(base).lower()
+    name = ALIASES.get(key, key)
+    if name not in CODECS:
+        raise ValueError(f"Base desconhecida: {base}")
+    return name
+
+
+def _clean(text: str, name: str) -> str:
+    """Remove espaços, padding e delimitadores; expande o 'z' do ascii85"""
+    text = _WHITESPACE.sub('', text)
+    if name in ('base32', 'base64'):
+        text = text.replace('=', '')
+    elif name == 'ascii85':
+        text = text.replace('<~', '').replace('~>', '').replace('z', '!!!!!')
+    return text
+
+
+def _clean_codes(codes: np.ndarray, name: str) -> np.ndarray:
+    """Como _clean, sobre os bytes da entrada (np.uint8) em vez de texto"""
+    codes = codes[~_SPACES[codes]]
+    if name in ('base32', 'base64'):
+        return codes[codes != ord('=')]
+    if name == 'ascii85':
+        data = codes.tobytes().replace(b'<~', b'').replace(b'~>', b'').replace(b'z', b'!!!!!')
+        return np.frombuffer(data, dtype=np.uint8)
+    return codes
+
+
+def _values(text: Union[str, np.ndarray], name: str) -> np.ndarray:
+    """Valores dos dígitos pela tabela reversa; ValueError no primeiro caractere fora do alfabeto"""
+    if isinstance(text, str):
+        if not text.isascii():
+            raise ValueError(f"Texto com caracteres fora do alfabeto {name}")
+        text = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    values = LOOKUP[name][text]
+    bad = np.flatnonzero(values < 0)
+    if bad.size:
+        raise ValueError(f"Caractere {chr(text[bad[0]])!r} fora do alfabeto {name} (posição {bad[0]})")
+    return values
+
+
+# Decodificadores vetorizados (recebem os valores dos dígitos)
+
+def _decode_bits(values: np.ndarray, width: int) -> bytes:
+    """base32/base64: os `width` bits de cada dígito, reempacotados em bytes (sobras descartadas)"""
+    bits = np.unpackbits(values.astype(np.uint8)[:, None], axis=1)[:, 8 - width:].ravel()
+    return np.packbits(bits[:bits.size - bits.size % 8]).tobytes()
+
+
+def _decode_blocks85(values: np.ndarray) -> bytes:
+    """base85/ascii85: blocos de 5 dígitos -> inteiros de 32 bits big-endian"""
+    padding = -values.size % 5
+    if padding == 4:
+        raise ValueError("Base85 truncado: sobrou 1 dígito no final")
+    # O bloco incompleto é completado com o maior dígito e os bytes extras são cortados
+    blocks = np.concatenate((values, np.full(padding, 84))).reshape(-1, 5)
+    words = blocks @ (85 ** np.arange(4, -1, -1, dtype=np.int64))
+    if words.size and words.max() >= 1 << 32:
+        raise ValueError("Bloco base85 maior que 32 bits")
+    return words.astype('>u4').tobytes()[:words.size * 4 - padding]
+
+
+def _base91_bits(values: np.ndarray) -> np.ndarray:
+    """Bits (LSB primeiro) de todos os pares completos do base91: 13 ou 14 por par"""
+    pairs = values[:values.size - values.size % 2].reshape(-1, 2)
+    numbers = pairs[:, 0] + pairs[:, 1] * 91
+    widths = np.where((numbers & 8191) > 88, 13, 14)
+    bits = (numbers[:, None] >> np.arange(14)) & 1
+    return bits[np.arange(14) < widths[:, None]].astype(np.uint8)
+
+
+def _pack_little(bits: np.ndarray) -> tuple:
+    """Bytes completos de um fluxo de bits LSB primeiro e os bits que sobram"""
+    cut = bits.size - bits.size % 8
+    return np.packbits(bits[:cut], bitorder='little').tobytes(), bits[cut:]
+
+
+def _decode_base91(values: np.ndarray) -> bytes:
+    bits = _base91_bits(values)
+    if values.size % 2:
+        # Dígito solitário no fim: completa o último byte
+        bits = np.concatenate((bits, (values[-1] >> np.arange(8)) & 1)).astype(np.uint8)
+    return _pack_little(bits)[0]
+
+
+def _decode_number(values: np.ndarray, base: int) -> bytes:
+    """base36/58/62: o texto é um número; cada zero à esquerda vira um byte 0 (convenção do base58)"""
+    if values.size == 0:
+        return b''
+    zeros = int(np.argmax(values != 0)) if values.any() else values.size
+    # Blocos de k dígitos cabem num int64; só a combinação dos blocos usa inteiros grandes
+    k = int(63 * math.log(2) / math.log(base))
+    digits = np.concatenate((np.zeros(-values.size % k, dtype=np.int64), values)).reshape(-1, k)
+    chunks = digits @ (base ** np.arange(k - 1, -1, -1, dtype=np.int64))
+    number, scale = 0, base ** k
+    for chunk in chunks.tolist():
+        number = number * scale + chunk
+    return b'\x00' * zeros + number.to_bytes((number.bit_length() + 7) // 8, 'big')
+
+
+def decode(text: Union[str, bytes, bytearray, memoryview], base: Union[int, str]) -> bytes:
+    """
+    Decodifica um texto Base-N (espaços, padding e delimitadores são
+    tolerados). Aceita também bytes/memoryview, lidos sem passar por str.
+    """
+    name = codec_name(base)
+    if isinstance(text, str):
+        values = _values(_clean(text, name), name)
+    else:
+        values = _values(_clean_codes(np.frombuffer(text, dtype=np.uint8), name), name)
+    kind = CODECS[name][1]
+    if kind == 'bits':
+        return _decode_bits(values, 5 if name == 'base32' else 6)
+    if kind == 'blocks85':
+        return _decode_blocks85(values)
+    if kind == 'base91':
+        return _decode_base91(values)
+    return _decode_number(values, len(CODECS[name][0]))
+
+
+def encode(data: bytes, base: Union[int, str]) -> str:
+    """Codifica bytes (usado para testes e para gerar desafios)"""
+    name = codec_name(base)
+    if name == 'base32':
+        return base64.b32encode(data).decode('ascii')
+    if name == 'base64':
+        return base64.b64encode(data).decode('ascii')
+    if name == 'base85':
+        return base64.b85encode(data).decode('ascii')
+    if name == 'ascii85':
+        return base64.a85encode(data, adobe=True).decode('ascii')
+    alphabet = CODECS[name][0]
+    if name == 'base91':
+        return _encode_base91(data, alphabet)
+    number = int.from_bytes(data, 'big')
+    digits = []
+    while number:
+        number, digit = divmod(number, len(alphabet))
+        digits.append(alphabet[digit])
+    zeros = len(data) - len(data.lstrip(b'\x00'))
+    return alphabet[0] * zeros + ''.join(reversed(digits))
+
+
+def _encode_base91(data: bytes, alphabet: str) -> str:
+    """Codificador de referência do basE91 (13 ou 14 bits por par de dígitos)"""
+    out, accumulator, count = [], 0, 0
+    for byte in data:
+        accumulator |= byte << count
+        count += 8
+        if count > 13:
+            value = accumulator & 8191
+            if value > 88:
+                accumulator >>= 13
+                count -= 13
+            else:
+                value = accumulator & 16383
+                accumulator >>= 14
+                count -= 14
+            out += [alphabet[value % 91], alphabet[value // 91]]
+    if count:
+        out.append(alphabet[accumulator % 91])
+        if count > 7 or accumulator > 90:
+            out.append(alphabet[accumulator // 91])
+    return ''.join(out)
+
+
+def stream_decode(source: Source, base: Union[int, str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Decodifica em fluxo. Os formatos em blocos carregam o quantum incompleto
+    para o próximo pedaço (o base91 carrega também os bits que não fecham um
+    byte); base36/58/62 são um único número e precisam do texto inteiro.
+    """
+    name = codec_name(base)
+    if name not in QUANTUM:
+        yield decode(''.join(iter_chunks(source, chunk_size)), name)
+        return
+    quantum = QUANTUM[name]
+    carry, bits = '', np.zeros(0, dtype=np.uint8)
+    for chunk in iter_chunks(source, chunk_size):
+        data = carry + _WHITESPACE.sub('', chunk)
+        # No ascii85, '<' ou '~' no fim podem ser metade de um delimitador
+        hold = len(data) - len(data.rstrip('<~')) if name == 'ascii85' else 0
+        cleaned = _clean(data[:len(data) - hold], name)
+        cut = len(cleaned) - len(cleaned) % quantum
+        carry = cleaned[cut:] + data[len(data) - hold:]
+        if not cut:
+            continue
+        values = _values(cleaned[:cut], name)
+        if name == 'base91':
+            output, bits = _pack_little(np.concatenate((bits, _base91_bits(values))))
+            yield output
+        elif name in ('base32', 'base64'):
+            yield _decode_bits(values, 5 if name == 'base32' else 6)
+        else:
+            yield _decode_blocks85(values)
+
+    tail = _clean(carry, name)
+    if name == 'base91':
+        values = _values(tail, name)
+        if values.size:
+            bits = np.concatenate((bits, (values[-1] >> np.arange(8)) & 1)).astype(np.uint8)
+        yield _pack_little(bits)[0]
+    elif tail:
+        yield decode(tail, name)
+
+
+# Detecção e ranking
+
+def detect(text: str) -> Dict[str, float]:
+    """
+    Codecs cujo alfabeto cobre todos os caracteres do texto, com uma
+    confiança que favorece os alfabetos mais específicos. Um único
+    histograma dos bytes é comparado com cada tabela reversa.
+    """
+    # Espaços entre palavras indicam texto comum; quebras de linha são normais
+    if not text.isascii() or ' ' in text.strip():
+        return {}
+    counts = np.bincount(np.frombuffer(text.encode('ascii'), dtype=np.uint8), minlength=256)
+    counts[_SPACES] = 0
+    stripped = text.strip()
+    return detect_counts(counts, stripped.startswith('<~') and stripped.endswith('~>'))
+
+
+def detect_counts(counts: np.ndarray, delimited: bool = False) -> Dict[str, float]:
+    """
+    Como `detect`, a partir do histograma (256,) dos bytes sem os espaços;
+    `delimited` indica um texto entre <~ e ~> (ascii85 do Adobe). A
+    detecção de formatos já tem o histograma e não volta ao texto.
+    """
+    length = int(counts.sum())
+    if length < 4:
+        return {}
+    present = counts > 0
+    digits = counts[ord('0'):ord('9') + 1].any()
+    upper = counts[ord('A'):ord('Z') + 1].any()
+    lower = counts[ord('a'):ord('z') + 1].any()
+    symbols = present.copy()
+    symbols[[ord(c) for c in string.ascii_letters + string.digits]] = False
+
+    def fits(name: str, extra: str = '') -> bool:
+        allowed = LOOKUP[name] >= 0
+        allowed[[ord(c) for c in extra]] = True
+        return not (present & ~allowed).any()
+
+    scores = {}
+    if fits('base32', '=') and (counts[ord('=')] or counts[ord('2'):ord('8')].any()):
+        scores['base32'] = 0.8 if length % 8 == 0 else 0.5
+    if fits('base64', '='):
+        scores['base64'] = 0.5 if length % 4 == 0 else 0.4
+    if delimited:
+        scores['ascii85'] = 0.9
+    elif symbols.any() and fits('ascii85'):
+        scores['ascii85'] = 0.35
+    if symbols.any():
+        if fits('base85'):
+            scores['base85'] = 0.3
+        if fits('base91'):
+            scores['base91'] = 0.25
+    elif digits and upper and lower:
+        # Maiúsculas, minúsculas e dígitos (palavras comuns não têm os três)
+        if fits('base58'):
+            scores['base58'] = 0.4
+        scores['base62'] = 0.35
+    elif digits and (upper or lower):
+        scores['base36'] = 0.3
+    return dict(sorted(scores.items(), key=lambda item: -item[1]))
+
+
+def scan(text: str, top_k: int = 5, codecs: List[str] = None) -> List[Dict[str, Any]]:
+    """
+    Decodifica com cada codec plausível (ou os indicados) e ranqueia pela
+    fração de bytes imprimíveis e pela legibilidade, como no bitstream.
+    """
+    candidates = []
+    for name in codecs if codecs is not None else detect(text):
+        try:
+            data = decode(text, name)
+        except (ValueError, OverflowError):
+            continue
+        if not data:
+            continue
+        sample = data[:SAMPLE_SIZE]
+        try:
+            text_sample = sample.decode('utf-8')
+        except UnicodeDecodeError:
+            text_sample = sample.decode('latin-1')
+        printable = float(PRINTABLE[np.frombuffer(sample, dtype=np.uint8)].mean())
+        score = 0.5 * printable + 0.5 * language_model.text_quality(text_sample)
+        candidates.append({'codec': name, 'data': data, 'score': round(score, 4)})
+    candidates.sort(key=lambda candidate: -candidate['score'])
+    for candidate in candidates:
+        candidate['text'] = candidate['data'].decode('utf-8', errors='replace')
+    return candidates[:top_k]
@@ -0,0 +1,146 @@
+"""
+Decodificação de fluxos de bits com alinhamento e largura desconhecidos
+
+Os '0'/'1' do texto viram um vetor uint8 de bits. Para cada largura (8 bits,
+7 bits ASCII e 5 bits Baudot/ITA2) o valor de todas as janelas é calculado
+de uma vez e cada deslocamento é só um fatiamento desse vetor; os bytes
+(8 bits) saem direto de np.packbits. Os candidatos são pontuados pela
+fração de caracteres válidos e pela legibilidade, multiplicadas pela
+fração dos bits que a leitura usa: bits sobrando no início ou no fim
+indicam largura ou alinhamento errados.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from . import language_model
+
+WIDTHS = (8, 7, 5)
+
+# Caracteres usados para pontuar a legibilidade de cada candidato
+SAMPLE_SIZE = 4096
+
+# Bytes imprimíveis (ASCII visível, espaço, tab e quebras de linha)
+PRINTABLE = np.zeros(256, dtype=bool)
+PRINTABLE[0x20:0x7f] = True
+PRINTABLE[[0x09, 0x0a, 0x0d]] = True
+
+# Baudot (ITA2): tabela de letras e de figuras; 27 e 31 trocam de tabela
+BAUDOT_FIGS = 27
+BAUDOT_LTRS = 31
+BAUDOT_LETTERS = np.array(list('\x00E\nA SIU\rDRJNFCKTZLWHYPQOBG\x00MXV\x00'), dtype=object)
+BAUDOT_FIGURES = np.array(list("\x003\n- '87\r\x004\x00,!:(5+)2$6019?&\x00./=\x00"), dtype=object)
+
+
+def parse_bits(text: str) -> np.ndarray:
+    """Extrai os '0'/'1' do texto (ignorando separadores) como vetor uint8 de bits"""
+    raw = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+    return raw[(raw == ord('0')) | (raw == ord('1'))] - ord('0')
+
+
+def window_values(bits: np.ndarray, width: int) -> np.ndarray:
+    """values[i] = valor dos `width` bits a partir da posição i (MSB primeiro)"""
+    if bits.size < width:
+        return np.zeros(0, dtype=np.int64)
+    weights = 1 << np.arange(width - 1, -1, -1)
+    return np.convolve(bits.astype(np.int64), weights[::-1], mode='valid')
+
+
+def to_bytes(bits: np.ndarray, offset: int = 0) -> bytes:
+    """Empacota os bits em bytes com np.packbits, a partir de `offset` (sobras são descartadas)"""
+    usable = bits[offset:]
+    usable = usable[:usable.size - usable.size % 8]
+    return np.packbits(usable).tobytes()
+
+
+def _baudot_chars(codes: np.ndarray):
+    """Caractere de cada código ITA2 na tabela ativa (letras ou figuras) e a máscara das trocas"""
+    shifts = (codes == BAUDOT_FIGS) | (codes == BAUDOT_LTRS)
+    last_shift = np.maximum.accumulate(np.where(shifts, np.arange(codes.size), -1))
+    figures = (last_shift >= 0) & (codes[np.maximum(last_shift, 0)] == BAUDOT_FIGS)
+    return np.where(figures, BAUDOT_FIGURES[codes], BAUDOT_LETTERS[codes]), shifts
+
+
+def baudot_text(codes: np.ndarray) -> str:
+    """Decodifica códigos ITA2, acompanhando as trocas letras/figuras de forma vetorizada"""
+    if codes.size == 0:
+        return ''
+    chars, shifts = _baudot_chars(codes)
+    return ''.join(chars[~shifts].tolist()).replace('\x00', '')
+
+
+def baudot_valid(codes: np.ndarray) -> float:
+    """Fração dos códigos ITA2 que são caracteres (nem troca de tabela, nem posição vazia)"""
+    if codes.size == 0:
+        return 0.0
+    chars, shifts = _baudot_chars(codes)
+    return float(((chars != '\x00') & ~shifts).mean())
+
+
+def _text(codes: np.ndarray, width: int) -> str:
+    """Converte os códigos de uma largura em texto"""
+    if width == 5:
+        return baudot_text(codes)
+    data = codes.astype(np.uint8).tobytes()
+    if width == 8:
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    return data.decode('latin-1')
+
+
+def _score(codes: np.ndarray, width: int, total_bits: int) -> float:
+    """Caracteres válidos e legibilidade (numa amostra), vezes a fração dos bits usados"""
+    if width == 5:
+        valid = baudot_valid(codes[:SAMPLE_SIZE])
+    else:
+        valid = float(PRINTABLE[codes].mean())
+    sample = _text(codes[:SAMPLE_SIZE], width)
+    coverage = codes.size * width / total_bits
+    return (0.5 * valid + 0.5 * language_model.text_quality(sample)) * coverage
+
+
+def _codes(bits: np.ndarray, width: int, offset: int, values: Optional[np.ndarray] = None) -> np.ndarray:
+    """Códigos de uma largura a partir de `offset` (os bytes saem direto do packbits)"""
+    if width == 8:
+        return np.frombuffer(to_bytes(bits, offset), dtype=np.uint8)
+    if values is None:
+        values = window_values(bits, width)
+    return values[offset::width]
+
+
+def read(text: str, width: int, offset: int = 0) -> Optional[Dict[str, Any]]:
+    """Uma única leitura (largura e deslocamento conhecidos), pontuada como no scan"""
+    bits = parse_bits(text)
+    if bits.size < offset + width:
+        return None
+    codes = _codes(bits, width, offset)
+    return {'width': width, 'offset': offset, 'score': round(_score(codes, width, bits.size), 4),
+            'text': _text(codes, width)}
+
+
+def scan(text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Testa todas as larguras (8, 7 e 5 bits) e deslocamentos (0 até a
+    largura - 1) e retorna os `top_k` melhores candidatos, cada um com
+    largura, deslocamento, texto e nota.
+    """
+    bits = parse_bits(text)
+    candidates = []
+    for width in WIDTHS:
+        values = None if width == 8 else window_values(bits, width)
+        for offset in range(min(width, max(bits.size - width + 1, 0))):
+            codes = _codes(bits, width, offset, values)
+            candidates.append({'width': width, 'offset': offset, 'score': _score(codes, width, bits.size),
+                               'codes': codes})
+
+    candidates.sort(key=lambda candidate: -candidate['score'])
+    results = []
+    for candidate in candidates[:top_k]:
+        codes = candidate.pop('codes')
+        candidate['text'] = _text(codes, candidate['width'])
+        candidate['score'] = round(candidate['score'], 4)
+        results.append(candidate)
+    return results
@@ -0,0 +1,291 @@
+"""
+Motor Braille (graus 1 e 2) baseado em aritmética de code points Unicode
+
+Cada célula Braille é indexada por `ord(ch) - 0x2800` em tabelas planas de
+256 posições. Decodificação e codificação compartilham as mesmas tabelas.
+As contrações do grau 2 ficam num trie de casamento mais longo.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+BRAILLE_BASE = 0x2800
+BLANK = '⠀'     # célula vazia (U+2800), usada como espaço
+CAPITAL = '⠨'   # indicador de maiúscula (⠨⠨ = palavra inteira em maiúsculas)
+NUMBER = '⠼'    # indicador de número
+LETTER = '⠰'    # indicador de letra: encerra o modo numérico antes de a-j
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+LETTER_CELLS = '⠁⠃⠉⠙⠑⠋⠛⠓⠊⠚⠅⠇⠍⠝⠕⠏⠟⠗⠎⠞⠥⠧⠺⠭⠽⠵'
+DIGITS = '1234567890'
+DIGIT_CELLS = '⠁⠃⠉⠙⠑⠋⠛⠓⠊⠚'
+PUNCTUATION = ",'.!?-"
+PUNCTUATION_CELLS = '⠂⠄⠲⠖⠢⠱'
+
+# Tabelas planas de decodificação indexadas por ord(ch) - 0x2800
+CELL_TEXT = [''] * 256
+CELL_DIGIT = [''] * 256
+for _char, _cell in zip(LETTERS + PUNCTUATION, LETTER_CELLS + PUNCTUATION_CELLS):
+    CELL_TEXT[ord(_cell) - BRAILLE_BASE] = _char
+for _char, _cell in zip(DIGITS, DIGIT_CELLS):
+    CELL_DIGIT[ord(_cell) - BRAILLE_BASE] = _char
+CELL_TEXT[0] = ' '
+
+# Tabela de codificação (caractere -> célula) e as tabelas str.translate
+# usadas quando o texto não precisa de indicadores
+ENCODE_CELLS = dict(zip(LETTERS + PUNCTUATION, LETTER_CELLS + PUNCTUATION_CELLS))
+ENCODE_CELLS[' '] = BLANK
+DIGIT_ENCODE_CELLS = dict(zip(DIGITS, DIGIT_CELLS))
+
+DECODE_TABLE = {BRAILLE_BASE + cell: char for cell, char in enumerate(CELL_TEXT) if char}
+ENCODE_TABLE = str.maketrans(ENCODE_CELLS)
+
+_NEEDS_INDICATORS = re.compile(r'[A-Z0-9]')
+_NOT_BRAILLE = re.compile(r'[^⠀-⣿]')
+_WORD = re.compile(r'\S*')
+
+
+def is_braille(char: str) -> bool:
+    """Verdadeiro se o caractere é uma célula Braille Unicode"""
+    return 0 <= ord(char) - BRAILLE_BASE < 256
+
+
+def decode(text: str) -> str:
+    """
+    Decodifica Braille grau 1 em uma única passada.
+
+    ⠨ deixa a próxima letra maiúscula, ⠨⠨ a palavra inteira; ⠼ faz as
+    células a-j valerem 1-0 até o próximo espaço, o indicador de letra ⠰
+    ou uma maiúscula. Caracteres que não são Braille, ou células
+    desconhecidas, são preservados.
+    """
+    return _decode_cells(text)[0]
+
+
+def _decode_cells(text: str, caps: int = 0, number: bool = False) -> Tuple[str, int, bool]:
+    """
+    Laço do grau 1 a partir de um estado (maiúscula pendente, modo numérico);
+    retorna o texto e o estado final, para o grau 2 continuá-lo depois de
+    uma contração.
+    """
+    if not caps and not number and CAPITAL not in text and NUMBER not in text and LETTER not in text:
+        return text.translate(DECODE_TABLE), 0, False
+
+    result = []
+    # caps: 0 normal, 1 próxima letra, 2 palavra inteira
+    for char in text:
+        cell = ord(char) - BRAILLE_BASE
+        if not 0 <= cell < 256:
+            if char.isspace():
+                caps, number = 0, False
+            result.append(char)
+            continue
+
+        if char == CAPITAL:
+            caps = 2 if caps == 1 else 1
+            number = False
+            continue
+        if char == NUMBER:
+            number = True
+            continue
+        if char == LETTER:
+            number = False
+            continue
+        if cell == 0:
+            caps, number = 0, False
+            result.append(' ')
+            continue
+
+        if number:
+            digit = CELL_DIGIT[cell]
+            if digit:
+                result.append(digit)
+                continue
+            number = False
+
+        letter = CELL_TEXT[cell]
+        if not letter:
+            result.append(char)
+        elif caps and letter.isalpha():
+            result.append(letter.upper())
+            if caps == 1:
+                caps = 0
+        else:
+            result.append(letter)
+    return ''.join(result), caps, number
+
+
+def encode(text: str, capitals: bool = True, unknown: Optional[str] = None) -> str:
+    """
+    Codifica texto em Braille grau 1 em uma única passada.
+
+    Maiúsculas recebem ⠨ (se `capitals`), sequências de dígitos recebem ⠼,
+    e uma letra a-j logo depois de dígitos recebe ⠰ para não ser lida como
+    dígito. Células Braille já presentes são mantidas; outros caracteres
+    sem equivalente são preservados ou trocados por `unknown`.
+    """
+    if not _NEEDS_INDICATORS.search(text):
+        result = text.translate(ENCODE_TABLE)
+    else:
+        cells = []
+        number = False
+        for char in text:
+            digit = DIGIT_ENCODE_CELLS.get(char)
+            if digit:
+                if not number:
+                    cells.append(NUMBER)
+                    number = True
+                cells.append(digit)
+                continue
+            lower = char.lower()
+            cell = ENCODE_CELLS.get(lower)
+            if cell and lower != char and capitals:
+                cells.append(CAPITAL)
+            elif number and cell in DIGIT_CELLS and lower in LETTERS:
+                cells.append(LETTER)
+            number = False
+            cells.append(cell or char)
+        result = ''.join(cells)
+
+    if unknown is not None:
+        result = _NOT_BRAILLE.sub(unknown, result)
+    return result
+
+
+# Contrações padrão (grau 2) usadas pelo encode_braille
+DEFAULT_CONTRACTIONS = {
+    'for': '⠿',
+    'st': '⠌',
+    'of': '⠷',
+    'er': '⠻',
+    'ar': '⠜',
+    'or': '⠪'
+}
+
+
+def load_contractions(path) -> Dict[str, str]:
+    """Carrega uma tabela de contrações de um arquivo JSON ({"texto": "células"})"""
+    with open(path, encoding='utf-8') as file:
+        table = json.load(file)
+    if not isinstance(table, dict) or not all(
+            isinstance(key, str) and isinstance(value, str) and key and value
+            for key, value in table.items()):
+        raise ValueError("Tabela de contrações deve ser um objeto JSON de strings não vazias")
+    return table
+
+
+class ContractionTrie:
+    """
+    Trie compilado a partir de uma tabela padrão -> substituição.
+
+    `segments` percorre o texto uma única vez e, em cada posição, aplica a
+    substituição do casamento mais longo; o resultado não depende da ordem
+    da tabela.
+    """
+
+    _END = ''
+
+    def __init__(self, table: Dict[str, str], lower: bool = False):
+        self.lower = lower
+        self.root: Dict[str, Any] = {}
+        for pattern, replacement in table.items():
+            node = self.root
+            for char in (pattern.lower() if lower else pattern):
+                node = node.setdefault(char, {})
+            node[self._END] = (replacement, len(pattern))
+
+        # Só as posições que começam com um primeiro caractere possível são testadas
+        first = ''.join(re.escape(char) for char in self.root)
+        flags = re.IGNORECASE if lower else 0
+        self._starts = re.compile(f'[{first}]', flags) if first else None
+
+    def match(self, text: str, start: int) -> Optional[Tuple[str, int]]:
+        """Casamento mais longo a partir de `start`: (substituição, tamanho) ou None"""
+        node = self.root
+        best = None
+        for index in range(start, len(text)):
+            char = text[index].lower() if self.lower else text[index]
+            node = node.get(char)
+            if node is None:
+                break
+            best = node.get(self._END, best)
+        return best
+
+    def segments(self, text: str) -> Iterator[Tuple[Optional[str], str]]:
+        """
+        Divide o texto em trechos: (substituição, trecho casado) para as
+        contrações e (None, trecho) para os trechos sem contração.
+        """
+        start = 0
+        if self._starts is not None:
+            for candidate in self._starts.finditer(text):
+                index = candidate.start()
+                if index < start:
+                    continue
+                found = self.match(text, index)
+                if found is None:
+                    continue
+                if start < index:
+                    yield None, text[start:index]
+                replacement, size = found
+                yield replacement, text[index:index + size]
+                start = index + size
+        if start < len(text):
+            yield None, text[start:]
+
+
+class Grade2Codec:
+    """Braille grau 2: contrações por casamento mais longo + grau 1 para o resto"""
+
+    def __init__(self, contractions: Optional[Dict[str, str]] = None):
+        self.contractions = dict(DEFAULT_CONTRACTIONS if contractions is None else contractions)
+        self.encoder = ContractionTrie(self.contractions, lower=True)
+        self.decoder = ContractionTrie({cells: text for text, cells in self.contractions.items()})
+
+    @classmethod
+    def from_file(cls, path) -> 'Grade2Codec':
+        """Cria o codec a partir de uma tabela de contrações em JSON"""
+        return cls(load_contractions(path))
+
+    def encode(self, text: str, capitals: bool = True, unknown: Optional[str] = None) -> str:
+        """
+        Codifica em grau 2; maiúsculas casam com as contrações sem distinção
+        de caixa. Uma contração com maiúscula inicial recebe ⠨, e uma toda
+        em maiúsculas recebe ⠨⠨ se o resto da palavra também estiver.
+        """
+        result = []
+        end = 0
+        for cells, chunk in self.encoder.segments(text):
+            end += len(chunk)
+            if cells is None:
+                result.append(encode(chunk, capitals, unknown))
+                continue
+            if capitals and chunk[0].isupper():
+                rest = _WORD.match(text, end).group()
+                whole = len(chunk) > 1 and chunk.isupper() and not any(char.islower() for char in rest)
+                result.append(CAPITAL * 2 if whole else CAPITAL)
+            result.append(cells)
+        return ''.join(result)
+
+    def decode(self, text: str) -> str:
+        """
+        Decodifica grau 2, expandindo as contrações e usando o grau 1 no
+        resto; o estado de maiúsculas e números passa de um trecho para o
+        outro, então ⠨ antes de uma contração vale para a sua expansão.
+        """
+        result = []
+        caps, number = 0, False
+        for expansion, chunk in self.decoder.segments(text):
+            if expansion is None:
+                decoded, caps, number = _decode_cells(chunk, caps, number)
+                result.append(decoded)
+                continue
+            number = False
+            if caps == 2:
+                expansion = expansion.upper()
+            elif caps == 1:
+                expansion = expansion[:1].upper() + expansion[1:]
+                caps = 0
+            result.append(expansion)
+        return ''.join(result)
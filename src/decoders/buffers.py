@@ -0,0 +1,97 @@
+"""
+Representação intermediária em bytes para cadeias de decodificadores
+
+Os decode_* do TextDecoder devolvem texto; aqui cada etapa recebe e
+devolve bytes (bytes, bytearray ou memoryview, lidos sem cópia com
+np.frombuffer) e o texto só é produzido na apresentação, em `to_text`.
+Assim um payload que não é UTF-8 passa de uma etapa para a outra sem
+falhar e sem idas e voltas str -> bytes -> str.
+"""
+
+from typing import Iterable, Union
+
+import numpy as np
+
+from . import base_n
+
+BytesLike = Union[bytes, bytearray, memoryview]
+Data = Union[str, BytesLike]
+
+# Espaços ASCII (os mesmos do \s para bytes), ignorados por todos os formatos
+SPACES = np.zeros(256, dtype=bool)
+SPACES[list(b' \t\n\r\x0b\x0c')] = True
+
+# Separadores de bytes aceitos no hexadecimal (de:ad:be:ef)
+HEX_SEPARATORS = SPACES.copy()
+HEX_SEPARATORS[ord(':')] = True
+
+HEX_VALUES = np.full(256, -1, dtype=np.int16)
+for _digit, _char in enumerate('0123456789abcdef'):
+    HEX_VALUES[ord(_char)] = HEX_VALUES[ord(_char.upper())] = _digit
+
+
+def as_buffer(data: Data) -> memoryview:
+    """Visão em bytes da entrada; texto é codificado em UTF-8 (a única cópia)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    view = memoryview(data)
+    return view if view.format == 'B' and view.ndim == 1 else view.cast('B')
+
+
+def _codes(data: Data, separators: np.ndarray = SPACES) -> np.ndarray:
+    codes = np.frombuffer(as_buffer(data), dtype=np.uint8)
+    return codes[~separators[codes]]
+
+
+def decode_hex(data: Data) -> bytes:
+    """Hexadecimal -> bytes, ignorando espaços, ':' e prefixos 0x"""
+    codes = _codes(data, HEX_SEPARATORS)
+    # Prefixos '0x'/'0X' (como o replace('0x', '') do decode_hex antigo)
+    prefixes = np.flatnonzero((codes[:-1] == ord('0')) & ((codes[1:] | 0x20) == ord('x')))
+    if prefixes.size:
+        keep = np.ones(codes.size, dtype=bool)
+        keep[prefixes] = keep[prefixes + 1] = False
+        codes = codes[keep]
+    values = HEX_VALUES[codes]
+    bad = np.flatnonzero(values < 0)
+    if bad.size:
+        raise ValueError(f"Caractere {chr(codes[bad[0]])!r} não hexadecimal (posição {bad[0]})")
+    if values.size % 2:
+        raise ValueError("Texto hexadecimal com número ímpar de dígitos")
+    return ((values[0::2] << 4) | values[1::2]).astype(np.uint8).tobytes()
+
+
+def decode_binary(data: Data) -> bytes:
+    """Texto binário ('0'/'1', espaços ignorados) -> bytes, 8 bits por byte"""
+    bits = _codes(data) - np.uint8(ord('0'))
+    if bits.size and bits.max() > 1:
+        raise ValueError("Texto contém caracteres não binários")
+    if bits.size % 8:
+        raise ValueError("Comprimento do texto binário deve ser múltiplo de 8")
+    return np.packbits(bits).tobytes()
+
+
+BUFFER_DECODERS = {
+    'hex': decode_hex,
+    'binary': decode_binary
+}
+
+
+def decode(data: Data, encoding: str) -> bytes:
+    """Decodifica hex, binário ou qualquer Base-N (base64, base32, 'a85'...) de bytes para bytes"""
+    if encoding in BUFFER_DECODERS:
+        return BUFFER_DECODERS[encoding](data)
+    return base_n.decode(as_buffer(data), encoding)
+
+
+def decode_chain(data: Data, encodings: Iterable[str]) -> bytes:
+    """Aplica as decodificações em sequência; cada etapa recebe os bytes da anterior"""
+    data = as_buffer(data)
+    for encoding in encodings:
+        data = decode(data, encoding)
+    return bytes(data)
+
+
+def to_text(data: BytesLike, errors: str = 'strict') -> str:
+    """Borda de apresentação: bytes -> texto UTF-8 (com errors='replace', nunca falha)"""
+    return str(data, 'utf-8', errors)
@@ -0,0 +1,164 @@
+"""
+Extração de fragmentos codificados (Base64, hex, binário) em textos mistos
+
+Dumps de pistas misturam prosa com blocos codificados. O texto é varrido
+uma única vez por uma regex de alternância compilada; cada candidato passa
+por uma entropia de Shannon em janelas (vetorizada sobre todos os
+candidatos do pedaço de uma vez) que descarta palavras longas, repetições
+e identificadores. Só os trechos aprovados vão para os decodificadores.
+
+A entrada é lida em pedaços (como no streaming): um fragmento que encosta
+no fim do pedaço é carregado para o próximo, então a memória depende do
+tamanho do pedaço e do maior fragmento, não do tamanho do dump.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+from . import buffers
+from .streaming import CHUNK_SIZE, Source, iter_chunks
+
+_TOKEN = r'A-Za-z0-9+/=_-'
+
+FRAGMENT_PATTERN = re.compile(
+    rf'(?<![{_TOKEN}])(?:'
+    r'(?P<binary>[01]{8}(?:[ ]?[01]{8}){2,})'
+    r'|(?P<hex>[0-9A-Fa-f]{2}(?:[ :]?[0-9A-Fa-f]{2}){7,})'
+    # Base64 precisa de um dígito, '+', '/' ou uma maiúscula depois de minúscula,
+    # senão qualquer palavra longa seria candidata. Blocos quebrados em várias
+    # linhas só são unidos nas larguras usuais (76 do MIME, 64 do PEM). O
+    # teste barato de tamanho vem antes, para as palavras curtas falharem logo
+    r'|(?P<base64>(?=[A-Za-z0-9+/_-]{16})(?=[A-Za-z0-9+/_-]*?(?:[0-9+/_-]|[a-z][A-Z]))(?:'
+    r'(?:[A-Za-z0-9+/]{76}\r?\n)+[A-Za-z0-9+/]{4,76}={0,2}(?=\r?\n|$)'
+    r'|(?:[A-Za-z0-9+/]{64}\r?\n)+[A-Za-z0-9+/]{4,64}={0,2}(?=\r?\n|$)'
+    r'|[A-Za-z0-9+/]{16,}={0,2}|[A-Za-z0-9_-]{16,}={0,2}))'
+    rf')(?![{_TOKEN}])'
+)
+
+# Tamanho da janela de entropia (caracteres)
+WINDOW = 64
+
+# Símbolos de cada formato e a entropia mínima, como fração do máximo
+# possível (log2 do alfabeto ou do tamanho da janela, o que for menor)
+ALPHABET_SIZES = {'binary': 2, 'hex': 16, 'base64': 64}
+MIN_ENTROPY = {'binary': 0.5, 'hex': 0.6, 'base64': 0.75}
+
+# Fração mínima de bytes imprimíveis num fragmento decodificado
+MIN_PRINTABLE = 0.75
+
+# Caracteres no fim de cada pedaço que ainda podem ser o começo de um fragmento
+TAIL = 256
+
+# Fragmentos maiores que isso são entregues em partes (alinhadas em 8 caracteres)
+MAX_FRAGMENT = 1 << 22
+
+# Bytes de controle (os de UTF-8 multibyte contam como imprimíveis)
+CONTROL = bytes(set(range(0x20)) - {0x09, 0x0a, 0x0d}) + b'\x7f'
+
+# c * log2(c) para as contagens possíveis numa janela
+_C_LOG_C = np.array([0.0] + [c * np.log2(c) for c in range(1, WINDOW + 1)])
+
+
+def fragment_entropy(codes: np.ndarray, lengths: np.ndarray, kinds: List[str]) -> np.ndarray:
+    """
+    Entropia normalizada (0-1) de cada fragmento: média das entropias das
+    janelas de WINDOW caracteres, cada uma dividida pelo máximo possível.
+    `codes` são os caracteres de todos os fragmentos concatenados.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if lengths.size == 0:
+        return np.zeros(0)
+    rows = np.repeat(np.arange(lengths.size), lengths)
+    offsets = np.arange(rows.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    # Janelas numeradas em sequência: as de um fragmento vêm depois das do anterior
+    windows_per_fragment = -(-lengths // WINDOW)
+    first_window = np.cumsum(windows_per_fragment) - windows_per_fragment
+    windows = first_window[rows] + offsets // WINDOW
+    n_windows = int(windows_per_fragment.sum())
+
+    counts = np.bincount(windows * 128 + np.minimum(codes, 127), minlength=n_windows * 128).reshape(n_windows, 128)
+    sizes = np.bincount(windows, minlength=n_windows)
+    entropy = np.log2(sizes) - _C_LOG_C[counts].sum(axis=1) / sizes
+
+    owner = np.repeat(np.arange(lengths.size), windows_per_fragment)
+    alphabets = np.array([ALPHABET_SIZES[kind] for kind in kinds])[owner]
+    maximum = np.log2(np.maximum(np.minimum(sizes, alphabets), 2))
+    weighted = np.bincount(owner, weights=entropy / maximum * sizes, minlength=lengths.size)
+    return weighted / lengths
+
+
+def _fragments(buffer: str, matches: List[re.Match], offset: int,
+               keep_binary: bool) -> Iterator[Dict[str, Any]]:
+    """Entropia de todos os candidatos de uma vez; decodifica só os aprovados"""
+    if not matches:
+        return
+    kinds = [match.lastgroup for match in matches]
+    joined = ''.join(match.group() for match in matches)
+    codes = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    lengths = np.array([match.end() - match.start() for match in matches])
+    entropy = fragment_entropy(codes, lengths, kinds)
+    minimum = np.array([MIN_ENTROPY[kind] for kind in kinds])
+
+    for index in np.flatnonzero(entropy >= minimum):
+        match, kind = matches[index], kinds[index]
+        try:
+            data = buffers.decode(match.group(), kind)
+        except ValueError:
+            continue
+        printable = len(data.translate(None, CONTROL)) / len(data) if data else 0.0
+        try:
+            text = data.decode('utf-8') if printable >= MIN_PRINTABLE else None
+        except UnicodeDecodeError:
+            text = None
+        if text is None and not keep_binary:
+            continue
+        yield {
+            'kind': kind,
+            'start': offset + match.start(),
+            'end': offset + match.end(),
+            'entropy': round(float(entropy[index]), 4),
+            'data': data,
+            'text': text
+        }
+
+
+def carve(source: Source, chunk_size: int = CHUNK_SIZE, keep_binary: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Procura fragmentos Base64, hex e binário num texto (ou iterável de
+    pedaços, ou arquivo aberto) e produz, na ordem, cada um com o formato,
+    a posição (start/end no texto inteiro), a entropia, os bytes e o texto
+    decodificado. Fragmentos que não viram texto UTF-8 legível só aparecem
+    com `keep_binary` (com 'text' None).
+    """
+    if isinstance(source, str):
+        source = [source]
+    carry, offset = '', 0
+    for chunk in iter_chunks(source, chunk_size):
+        buffer = carry + chunk
+        matches, cut = [], None
+        for match in FRAGMENT_PATTERN.finditer(buffer):
+            if match.end() > len(buffer) - TAIL:
+                # Pode continuar no próximo pedaço; um fragmento enorme sai em
+                # partes alinhadas e só o resto segue no carry
+                length = match.end() - match.start()
+                cut = match.start()
+                head = FRAGMENT_PATTERN.fullmatch(buffer, cut, cut + length - length % 8) \
+                    if length >= MAX_FRAGMENT else None
+                if head:
+                    matches.append(head)
+                    cut = head.end()
+                break
+            matches.append(match)
+        if cut is None:
+            # O fim do pedaço pode ser o começo de um fragmento: recua até um
+            # espaço perto do fim (sem espaço, corta no limite)
+            limit = max(len(buffer) - TAIL, 0)
+            boundary = max(buffer.rfind(c, max(limit - TAIL, 0), limit) for c in ' \t\n')
+            cut = max(boundary + 1 if boundary >= 0 else limit, matches[-1].end() if matches else 0)
+        yield from _fragments(buffer, matches, offset, keep_binary)
+        carry, offset = buffer[cut:], offset + cut
+
+    if carry:
+        yield from _fragments(carry, list(FRAGMENT_PATTERN.finditer(carry)), offset, keep_binary)
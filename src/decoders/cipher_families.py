@@ -0,0 +1,230 @@
+"""
+Famílias de cifras polialfabéticas como operações sobre índices de letras
+
+Cada família é uma função de decifração (letras cifradas, chave) -> letras
+claras sobre arrays NumPy de índices 0-25, com broadcasting: a chave pode ter
+uma linha por candidato, então muitas chaves são testadas numa única chamada.
+
+Em todas as famílias cada posição da chave só afeta as letras da sua coluna
+(posições i com i % período == coluna; no autokey, a cadeia da coluna). Por
+isso a quebra sem chave resolve uma coluna por vez: primeiro pelas
+frequências de letras, depois refinando com os quadrigramas.
+
+A cifra afim tem só 312 chaves: todas são decifradas juntas como uma
+matriz (312 x n) e ranqueadas numa única chamada ao modelo.
+"""
+
+import math
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from . import cryptanalysis
+from . import language_model
+from . import quadgrams
+
+# Multiplicadores válidos da cifra afim (coprimos com 26) e seus inversos
+AFFINE_MULTIPLIERS = np.array([a for a in range(1, 26) if math.gcd(a, 26) == 1])
+AFFINE_INVERSES = np.array([pow(int(a), -1, 26) for a in AFFINE_MULTIPLIERS])
+
+# Tabela de Porta: PORTA_TABLE[par da chave, letra] (A/B=0, C/D=1, ...); é recíproca
+_HALF = np.arange(26) % 13
+PORTA_TABLE = np.where(np.arange(26)[None, :] < 13,
+                       (_HALF[None, :] + np.arange(13)[:, None]) % 13 + 13,
+                       (_HALF[None, :] - np.arange(13)[:, None]) % 13)
+
+
+def _keystream(key: np.ndarray, n: int) -> np.ndarray:
+    """Repete a chave (última dimensão) até cobrir n letras"""
+    return key[..., np.arange(n) % key.shape[-1]]
+
+
+def _autokey(letters: np.ndarray, primer: np.ndarray) -> np.ndarray:
+    """
+    Autokey de Vigenère: a chave é o primer seguido do próprio texto claro.
+
+    Na coluna j, p[m] = c[m] - p[m-1], então p[m] = (-1)^m (S[m] - primer[j]),
+    com S a soma acumulada de (-1)^t c[t]: a recorrência vira um cumsum.
+    """
+    letters = np.asarray(letters, dtype=np.int64)
+    n = letters.shape[-1]
+    period = primer.shape[-1]
+    rank = np.arange(n) // period   # posição da letra dentro da sua coluna
+    sign = 1 - 2 * (rank % 2)
+    signed = sign * letters
+    cumulative = np.empty_like(signed)
+    for column in range(period):
+        cumulative[..., column::period] = np.cumsum(signed[..., column::period], axis=-1)
+    return (sign * (cumulative - _keystream(primer, n))) % 26
+
+
+FAMILIES: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    'vigenere': lambda c, k: (c - _keystream(k, c.shape[-1])) % 26,
+    'beaufort': lambda c, k: (_keystream(k, c.shape[-1]) - c) % 26,
+    'variant_beaufort': lambda c, k: (c + _keystream(k, c.shape[-1])) % 26,
+    'gronsfeld': lambda c, k: (c - _keystream(k, c.shape[-1])) % 26,
+    'porta': lambda c, k: PORTA_TABLE[_keystream(k, c.shape[-1]), c],
+    'autokey': _autokey,
+}
+
+# Valores possíveis de cada posição da chave
+KEY_OPTIONS = {'gronsfeld': 10, 'porta': 13}
+
+
+def parse_key(family: str, key: str) -> np.ndarray:
+    """Chave em texto -> índices (dígitos no Gronsfeld, pares de letras na Porta)"""
+    if family == 'gronsfeld':
+        if not key.isdigit():
+            raise ValueError("A chave de Gronsfeld deve ter só dígitos")
+        return np.array([int(digit) for digit in key])
+    indices = language_model.letter_indices(key.upper()).astype(np.int64)
+    if indices.size == 0:
+        raise ValueError("Chave sem letras")
+    return indices // 2 if family == 'porta' else indices
+
+
+def format_key(family: str, key: np.ndarray) -> str:
+    """Índices da chave -> texto (a Porta usa a primeira letra de cada par)"""
+    if family == 'gronsfeld':
+        return ''.join(str(int(value)) for value in key)
+    if family == 'porta':
+        key = np.asarray(key) * 2
+    return ''.join(chr(ord('A') + int(value)) for value in key)
+
+
+def _replace_letters(text: str, function: Callable[[np.ndarray], np.ndarray]) -> str:
+    """Aplica `function` às letras A-Z do texto em maiúsculas, preservando o resto"""
+    codes = np.frombuffer(text.upper().encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    mask = (codes >= ord('A')) & (codes <= ord('Z'))
+    codes[mask] = function(codes[mask] - ord('A')) + ord('A')
+    return codes.astype(np.uint32).tobytes().decode('utf-32-le')
+
+
+def decrypt(text: str, family: str, key: str) -> str:
+    """Decifra com uma família e uma chave em texto"""
+    indices = parse_key(family, key)
+    return _replace_letters(text, lambda letters: FAMILIES[family](letters, indices))
+
+
+def affine_decrypt(text: str, a: int, b: int) -> str:
+    """Decifra a cifra afim E(x) = a*x + b"""
+    if math.gcd(a, 26) != 1:
+        raise ValueError(f"Multiplicador {a} não é coprimo com 26")
+    inverse = pow(a, -1, 26)
+    return _replace_letters(text, lambda letters: (inverse * (letters - b)) % 26)
+
+
+def brute_force_affine(text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Testa as 312 chaves afins de uma vez: a amostra de letras vira uma matriz
+    (312 x n), linha a*26 + b, pontuada pelos quadrigramas (ou pelas
+    frequências de letras, em textos com menos de 4 letras).
+    """
+    indices = language_model.letter_indices(text).astype(np.int64)[:cryptanalysis.REFINE_SAMPLE]
+    if indices.size == 0:
+        return []
+    offsets = np.arange(26)
+    # (12 multiplicadores x 26 deslocamentos x n) -> (312 x n)
+    matrix = (AFFINE_INVERSES[:, None, None] *
+              (indices[None, None, :] - offsets[None, :, None])) % 26
+    matrix = matrix.reshape(-1, indices.size)
+    if indices.size >= 4:
+        scores = quadgrams.score_rows(matrix)
+    else:
+        scores = language_model.unigram_scores(language_model.letter_counts(matrix))
+    best = language_model.best_language(scores)
+
+    order = np.argsort(-best['score'], kind='stable')[:top_k]
+    results = []
+    for row in order:
+        a = int(AFFINE_MULTIPLIERS[row // 26])
+        b = int(row % 26)
+        results.append({
+            'a': a,
+            'b': b,
+            'key': f"{a},{b}",
+            'text': affine_decrypt(text, a, b),
+            'score': float(best['score'][row]),
+            'language': str(best['language'][row])
+        })
+    return results
+
+
+def _column_options(letters: np.ndarray, family: str, options: int) -> np.ndarray:
+    """Letras claras de uma coluna sob cada valor da chave: matriz (opções x m)"""
+    keys = np.arange(options)[:, None]
+    return FAMILIES[family](letters[None, :], keys)
+
+
+def _refine(indices: np.ndarray, family: str, key: np.ndarray, lang: int,
+            passes: int = 3) -> np.ndarray:
+    """Ajusta a chave coluna por coluna pelos quadrigramas (como refine_shifts)"""
+    key = key.copy()
+    period = key.size
+    options = KEY_OPTIONS.get(family, 26)
+    columns = np.arange(indices.size) % period
+    for _ in range(passes):
+        changed = False
+        for column in range(period):
+            mask = columns == column
+            rows = np.repeat(FAMILIES[family](indices, key)[None, :], options, axis=0)
+            rows[:, mask] = _column_options(indices[mask], family, options)
+            best = int(quadgrams.score_rows(rows)[:, lang].argmax())
+            if best != key[column]:
+                key[column] = best
+                changed = True
+        if not changed:
+            break
+    return key
+
+
+def solve(text: str, family: str, top_k: int = 5, max_period: int = 12,
+          top_periods: int = 4) -> List[Dict[str, Any]]:
+    """
+    Recupera a chave de uma família periódica (ou o primer do autokey).
+
+    Os períodos vêm do índice de coincidência (no autokey, que não é
+    periódico, todos os tamanhos de primer até `max_period` são testados).
+    Cada coluna é resolvida pelo qui-quadrado sob todos os valores da chave
+    e refinada pelos quadrigramas; os candidatos são ranqueados pelos
+    quadrigramas com a mesma penalidade por letra da chave do Vigenère.
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Família desconhecida: {family}")
+    indices = language_model.letter_indices(text).astype(np.int64)
+    n = indices.size
+    if n < 4:
+        return []
+    options = KEY_OPTIONS.get(family, 26)
+    max_period = max(1, min(max_period, n // 4))
+    if family == 'autokey':
+        periods = np.arange(1, max_period + 1)
+    else:
+        ioc = cryptanalysis.periodic_ioc(indices, max_period)
+        periods = np.argsort(-ioc, kind='stable')[:top_periods] + 1
+
+    sample = indices[:cryptanalysis.REFINE_SAMPLE]
+    candidates = {}
+    for period in periods:
+        positions = np.arange(sample.size) % period
+        # Qui-quadrado de cada coluna sob cada valor: (período x opções x idiomas)
+        chi = np.stack([
+            language_model.chi_squared(language_model.letter_counts(
+                _column_options(sample[positions == column], family, options)))
+            for column in range(period)
+        ])
+        for lang in range(len(language_model.LANGUAGES)):
+            key = _refine(sample, family, chi[:, :, lang].argmin(axis=1), lang)
+            name = format_key(family, key)
+            if family != 'autokey':
+                name = cryptanalysis._minimal_key(name)
+            candidates.setdefault(name, len(name))
+
+    ranked = [{'key': key, 'period': period, 'text': decrypt(text, family, key)}
+              for key, period in candidates.items()]
+    best = language_model.best_language(quadgrams.score_batch([c['text'] for c in ranked]))
+    for candidate, value, language in zip(ranked, best['score'], best['language']):
+        candidate['score'] = float(value) - 2 * candidate['period'] * np.log(options) / max(n - 3, 1)
+        candidate['language'] = str(language)
+    ranked.sort(key=lambda c: -c['score'])
+    return ranked[:top_k]
@@ -0,0 +1,80 @@
+"""
+Núcleo das cifras de substituição baseado em tabelas de tradução pré-computadas
+"""
+
+import string
+from functools import lru_cache
+from typing import Union
+
+import numpy as np
+
+UPPER = string.ascii_uppercase
+LOWER = string.ascii_lowercase
+
+TextLike = Union[str, bytes, bytearray]
+
+
+@lru_cache(maxsize=None)
+def shift_table(shift: int) -> dict:
+    """Tabela str.maketrans que desloca as letras mantendo maiúsculas/minúsculas"""
+    shift %= 26
+    return str.maketrans(
+        UPPER + LOWER,
+        UPPER[shift:] + UPPER[:shift] + LOWER[shift:] + LOWER[:shift]
+    )
+
+
+@lru_cache(maxsize=None)
+def shift_table_bytes(shift: int) -> bytes:
+    """Tabela bytes.maketrans equivalente a shift_table"""
+    shift %= 26
+    return bytes.maketrans(
+        (UPPER + LOWER).encode('ascii'),
+        (UPPER[shift:] + UPPER[:shift] + LOWER[shift:] + LOWER[:shift]).encode('ascii')
+    )
+
+
+@lru_cache(maxsize=None)
+def atbash_table() -> dict:
+    """Tabela str.maketrans da cifra Atbash (A<->Z, a<->z)"""
+    return str.maketrans(UPPER + LOWER, UPPER[::-1] + LOWER[::-1])
+
+
+@lru_cache(maxsize=None)
+def atbash_table_bytes() -> bytes:
+    """Tabela bytes.maketrans da cifra Atbash"""
+    return bytes.maketrans((UPPER + LOWER).encode('ascii'),
+                           (UPPER[::-1] + LOWER[::-1]).encode('ascii'))
+
+
+def rotate(text: TextLike, shift: int) -> TextLike:
+    """Desloca as letras ASCII de `shift` posições (str ou bytes)"""
+    if isinstance(text, (bytes, bytearray)):
+        return text.translate(shift_table_bytes(shift % 26))
+    return text.translate(shift_table(shift % 26))
+
+
+def atbash(text: TextLike) -> TextLike:
+    """Aplica a cifra Atbash (str ou bytes)"""
+    if isinstance(text, (bytes, bytearray)):
+        return text.translate(atbash_table_bytes())
+    return text.translate(atbash_table())
+
+
+def vigenere(text: str, key: str, decrypt: bool = True) -> str:
+    """
+    Aplica a cifra de Vigenère às letras A-Z de um texto em maiúsculas.
+
+    A chave só avança nas letras; os demais caracteres são preservados.
+    Todo o trabalho é feito sobre os code points em um array NumPy.
+    """
+    shifts = np.frombuffer(key.upper().encode('ascii'), dtype=np.uint8).astype(np.int32) - ord('A')
+    if decrypt:
+        shifts = -shifts
+
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int32)
+    mask = (codes >= ord('A')) & (codes <= ord('Z'))
+    letters = codes[mask] - ord('A')
+    letters = (letters + np.resize(shifts, letters.size)) % 26
+    codes[mask] = letters + ord('A')
+    return codes.astype(np.uint32).tobytes().decode('utf-32-le')
@@ -0,0 +1,262 @@
+"""
+Detecção de "cribs" (palavras conhecidas do jogo) em textos candidatos
+
+Um autômato de Aho-Corasick é montado uma única vez com as palavras-chave
+do labirinto, os nomes dos arquivos dos itens e cribs extras. Ele vira uma
+tabela de transições completa (estados x símbolos), então muitos textos são
+varridos juntos: a cada passo, um vetor com o estado de cada texto avança
+por uma única indexação NumPy. Cada texto é percorrido uma vez, em tempo
+linear, não importa quantos cribs existam.
+
+Os textos são normalizados (maiúsculas, sem acentos). Cribs longos
+atravessam espaços e pontuação, então "ZNA LOST" e "Demo_disc" casam com
+ZNALOST e DEMODISC; os curtos (COW, D20) só casam como palavras inteiras,
+senão aparecem entre palavras de qualquer decifração errada. São duas
+tabelas (na dos longos, a fronteira de palavra mantém o estado, como o
+preenchimento) combinadas numa só sobre os pares de estados.
+
+No ranking, os cribs são um bônus limitado somado à nota do modelo de
+linguagem, não um critério à parte: um acerto casual não passa na frente
+de uma decifração claramente melhor.
+"""
+
+import re
+import unicodedata
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import DECODER_CONFIG
+
+# Cribs mais curtos que isso aparecem por acaso em qualquer texto
+MIN_CRIB_LENGTH = 3
+
+# Cribs mais curtos que isso só casam como palavras inteiras
+SPANNING_LENGTH = 6
+
+# Bônus de cada letra de crib na log-probabilidade total do texto; dividido
+# pelo tamanho, vira uma fração da nota média e some nos textos longos
+CRIB_WEIGHT = 2.0
+
+# Teto do bônus somado à nota média de um candidato
+MAX_CRIB_BONUS = 1.0
+
+# Caracteres lidos de cada candidato ao ranquear resultados de força bruta
+SCAN_LIMIT = 10000
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+N_SYMBOLS = len(ALPHABET)
+BOUNDARY = N_SYMBOLS    # qualquer outro caractere: fronteira de palavra
+PAD = N_SYMBOLS + 1     # preenchimento das linhas curtas: mantém o estado
+
+# Byte -> símbolo
+_SYMBOLS = np.full(256, BOUNDARY, dtype=np.uint8)
+for _index, _char in enumerate(ALPHABET):
+    _SYMBOLS[ord(_char)] = _index
+    _SYMBOLS[ord(_char.lower())] = _index
+
+
+def normalize(text: str) -> str:
+    """Maiúsculas, sem acentos, só letras e dígitos"""
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^A-Z0-9]', '', text.upper())
+
+
+def game_cribs(items: Optional[Sequence[Dict[str, Any]]] = None) -> List[str]:
+    """Palavras-chave do labirinto mais os nomes de arquivo dos itens"""
+    if items is None:
+        from .labyrinth_decoder import LabyrinthDecoder
+        items = LabyrinthDecoder().items
+    cribs = list(DECODER_CONFIG["labyrinth"]["known_keywords"])
+    for item in items:
+        cribs.extend(name.strip() for name in item.get("files", "").split(','))
+    return cribs
+
+
+class CribDetector:
+    """Autômato de Aho-Corasick sobre letras e dígitos, compilado em tabela"""
+
+    def __init__(self, cribs: Iterable[str]):
+        self.cribs: List[str] = []
+        seen = set()
+        for crib in cribs:
+            pattern = normalize(crib)
+            if len(pattern) >= MIN_CRIB_LENGTH and pattern not in seen:
+                seen.add(pattern)
+                self.cribs.append(pattern)
+
+        spanning, words = [], []
+        for number, pattern in enumerate(self.cribs):
+            symbols = [ALPHABET.index(char) for char in pattern]
+            if len(pattern) >= SPANNING_LENGTH:
+                spanning.append((number, symbols))
+            else:
+                words.append((number, [BOUNDARY] + symbols + [BOUNDARY]))
+        self.n_words = max(1, -(-len(self.cribs) // 64))
+        self.delta, self.outputs = self._product(self._compile(spanning, skip_boundary=True),
+                                                self._compile(words, skip_boundary=False))
+
+    def _compile(self, patterns: List[Tuple[int, List[int]]], skip_boundary: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Trie dos padrões (número do crib, símbolos) resolvida numa tabela de
+        transições completa, mais a bitmask de saída de cada estado em
+        palavras de 64 bits (estados x palavras)
+        """
+        goto: List[Dict[int, int]] = [{}]
+        outputs: List[int] = [0]   # bitmask dos cribs que terminam em cada estado
+        for number, pattern in patterns:
+            state = 0
+            for symbol in pattern:
+                if symbol not in goto[state]:
+                    goto.append({})
+                    outputs.append(0)
+                    goto[state][symbol] = len(goto) - 1
+                state = goto[state][symbol]
+            outputs[state] |= 1 << number
+
+        # Links de falha em largura, já resolvidos na tabela completa
+        n_states = len(goto)
+        n_symbols = N_SYMBOLS if skip_boundary else N_SYMBOLS + 1
+        delta = np.zeros((n_states, PAD + 1), dtype=np.int32)
+        delta[:, PAD] = np.arange(n_states)
+        if skip_boundary:
+            delta[:, BOUNDARY] = np.arange(n_states)
+        fail = [0] * n_states
+        queue = deque()
+        for symbol in range(n_symbols):
+            child = goto[0].get(symbol, 0)
+            delta[0, symbol] = child
+            if child:
+                queue.append(child)
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            for symbol in range(n_symbols):
+                child = goto[state].get(symbol)
+                if child is None:
+                    delta[state, symbol] = delta[fail[state], symbol]
+                else:
+                    fail[child] = delta[fail[state], symbol]
+                    delta[state, symbol] = child
+                    queue.append(child)
+
+        masks = np.array([[(mask >> (64 * word)) & (2 ** 64 - 1) for word in range(self.n_words)]
+                          for mask in outputs], dtype=np.uint64)
+        return delta, masks
+
+    @staticmethod
+    def _product(first: Tuple[np.ndarray, np.ndarray], second: Tuple[np.ndarray, np.ndarray]):
+        """
+        Junta as duas tabelas numa só, sobre os pares de estados alcançáveis,
+        para a varredura fazer uma indexação por coluna. O estado inicial já
+        leu a fronteira implícita do começo do texto e é o de número 0.
+        """
+        (delta_a, out_a), (delta_b, out_b) = first, second
+        start = (0, int(delta_b[0, BOUNDARY]))
+        index = {start: 0}
+        pairs = [start]
+        rows = []
+        for a, b in pairs:
+            row = []
+            for pair in zip(delta_a[a].tolist(), delta_b[b].tolist()):
+                if pair not in index:
+                    index[pair] = len(pairs)
+                    pairs.append(pair)
+                row.append(index[pair])
+            rows.append(row)
+        a, b = np.array(pairs).T
+        return np.array(rows, dtype=np.int32), out_a[a] | out_b[b]
+
+    def scan(self, texts: Sequence[str], limit: Optional[int] = None) -> List[List[str]]:
+        """
+        Retorna, para cada texto, os cribs encontrados (na ordem da lista).
+        Com `limit`, só os primeiros `limit` caracteres de cada texto são lidos.
+        """
+        return self._scan(texts, limit)[0]
+
+    def scan_one(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Cribs encontrados num único texto"""
+        return self.scan([text], limit)[0]
+
+    def bonus(self, cribs: Sequence[str], letters: int) -> float:
+        """Bônus na nota média de um texto com `letters` letras e dígitos que contém os `cribs`"""
+        if not cribs:
+            return 0.0
+        return min(MAX_CRIB_BONUS, CRIB_WEIGHT * sum(map(len, cribs)) / max(letters - 3, 1))
+
+    def rank(self, candidates: List[Dict[str, Any]], key: str = 'text',
+             limit: Optional[int] = None, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Grava em cada candidato a lista 'cribs', soma o bônus dos cribs à
+        'score' e reordena pela nota, mantendo a ordem original entre os
+        empatados. `exclude` nomeia um campo do candidato cujo valor não
+        conta como crib (a palavra-chave de uma grade, que ela soletra).
+        """
+        hits, letters = self._scan([candidate[key] for candidate in candidates], limit)
+        for candidate, cribs, size in zip(candidates, hits, letters.tolist()):
+            if exclude is not None:
+                excluded = normalize(candidate[exclude])
+                cribs = [crib for crib in cribs if crib != excluded]
+            candidate['cribs'] = cribs
+            candidate['score'] += self.bonus(cribs, size)
+        return sorted(candidates, key=lambda candidate: -candidate['score'])
+
+    def _scan(self, texts: Sequence[str], limit: Optional[int]):
+        """Cribs de cada texto e o número de letras e dígitos lidos de cada um"""
+        if not texts:
+            return [], np.zeros(0, dtype=np.int64)
+        if limit is not None:
+            texts = [text[:limit] for text in texts]
+        symbols, lengths = self._symbols(texts)
+        found = np.zeros((len(texts), self.n_words), dtype=np.uint64)
+
+        # Linhas de tamanhos parecidos são varridas juntas (faixas de potência de 2)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        buckets = np.ceil(np.log2(np.maximum(lengths, 1))).astype(int)
+        for bucket in np.unique(buckets):
+            members = np.flatnonzero(buckets == bucket)
+            sizes = lengths[members]
+            matrix = np.full((members.size, int(sizes.max())), PAD, dtype=np.uint8)
+            rows = np.repeat(np.arange(members.size), sizes)
+            columns = np.arange(rows.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            matrix[rows, columns] = symbols[np.repeat(starts[members], sizes) + columns]
+            found[members] = self._run(matrix)
+
+        names: List[List[str]] = [[] for _ in texts]
+        for index in np.flatnonzero(found.any(axis=1)):
+            names[index] = self._names(found[index])
+        alphanumeric = np.concatenate(([0], np.cumsum(symbols < N_SYMBOLS)))
+        ends = np.cumsum(lengths)
+        return names, alphanumeric[ends] - alphanumeric[ends - lengths]
+
+    @staticmethod
+    def _symbols(texts: Sequence[str]):
+        """Símbolos de todos os textos (letras e dígitos 0-35, fronteira 36), concatenados, e o tamanho de cada um"""
+        pieces = [(text if text.isascii() else unicodedata.normalize('NFKD', text)).encode('ascii', 'ignore')
+                  for text in texts]
+        symbols = _SYMBOLS[np.frombuffer(b''.join(pieces), dtype=np.uint8)]
+        return symbols, np.array([len(piece) for piece in pieces], dtype=np.int64)
+
+    def _run(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Avança o autômato de todas as linhas juntas, uma coluna por vez; no
+        fim, a fronteira implícita fecha as palavras inteiras
+        """
+        states = np.zeros(matrix.shape[0], dtype=np.int32)
+        found = np.zeros((matrix.shape[0], self.n_words), dtype=np.uint64)
+        for column in matrix.T:
+            states = self.delta[states, column]
+            found |= self.outputs[states]
+        return found | self.outputs[self.delta[states, BOUNDARY]]
+
+    def _names(self, masks: np.ndarray) -> List[str]:
+        """Converte a bitmask de uma linha nos nomes dos cribs"""
+        numbers = []
+        for word, mask in enumerate(masks.tolist()):
+            while mask:
+                low = mask & -mask
+                numbers.append(word * 64 + low.bit_length() - 1)
+                mask ^= low
+        return [self.cribs[number] for number in sorted(numbers)]
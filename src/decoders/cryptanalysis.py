@@ -0,0 +1,195 @@
+"""
+Criptoanálise vetorizada das cifras clássicas (força bruta com ranking)
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from . import cipher_tables
+from . import language_model
+from . import quadgrams
+
+
+# Letras do início do texto pontuadas pelos quadrigramas (força bruta de
+# César, refinamento e ranking das chaves de Vigenère): o suficiente para
+# decidir, sem que o custo cresça com o tamanho do texto
+REFINE_SAMPLE = 1000
+
+
+def brute_force_caesar(text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Testa os 26 deslocamentos de César de uma só vez.
+
+    As primeiras REFINE_SAMPLE letras viram uma matriz (26 x n) de índices,
+    e cada linha é pontuada pelo modelo de quadrigramas do português e do
+    inglês (ou pelas frequências de letras, em textos com menos de 4
+    letras). Só os `top_k` melhores candidatos são decifrados por inteiro,
+    do mais provável para o menos provável.
+    """
+    indices = language_model.letter_indices(text)[:REFINE_SAMPLE]
+    shifts = np.arange(26, dtype=np.uint8)
+
+    # Linha s = texto decifrado com deslocamento s
+    candidates = (indices[None, :] + (26 - shifts)[:, None]) % 26
+    if indices.size >= 4:
+        scores = quadgrams.score_rows(candidates)
+    else:
+        scores = language_model.unigram_scores(language_model.letter_counts(candidates))
+    best = language_model.best_language(scores)
+
+    order = np.argsort(-best['score'], kind='stable')[:top_k]
+    upper = text.upper()
+    return [
+        {
+            'shift': int(shift),
+            'text': cipher_tables.rotate(upper, -int(shift)),
+            'score': float(best['score'][shift]),
+            'language': str(best['language'][shift])
+        }
+        for shift in order
+    ]
+
+
+def periodic_ioc(indices: np.ndarray, max_period: int = 20) -> np.ndarray:
+    """
+    Índice de coincidência médio das colunas para cada período 1..max_period.
+
+    Para cada período, as letras são agrupadas por coluna com um único
+    bincount; o resultado `ioc[p - 1]` é a média das colunas do período p.
+    """
+    n = indices.size
+    positions = np.arange(n)
+    ioc = np.zeros(max_period)
+    for period in range(1, max_period + 1):
+        counts = np.bincount((positions % period) * 26 + indices,
+                             minlength=period * 26).reshape(period, 26)
+        sizes = counts.sum(axis=1)
+        pairs = np.maximum(sizes * (sizes - 1), 1)
+        ioc[period - 1] = np.mean((counts * (counts - 1)).sum(axis=1) / pairs)
+    return ioc
+
+
+def _minimal_key(key: str) -> str:
+    """Reduz uma chave repetida (KEYKEY) à sua menor unidade (KEY)"""
+    for size in range(1, len(key) + 1):
+        if len(key) % size == 0 and key[:size] * (len(key) // size) == key:
+            return key[:size]
+    return key
+
+
+def refine_shifts(indices: np.ndarray, shifts: np.ndarray, lang: int,
+                  passes: int = 3, deadline: Optional[float] = None) -> np.ndarray:
+    """
+    Ajusta, coluna por coluna, os deslocamentos de uma chave periódica pelo
+    modelo de quadrigramas: para cada coluna, as 26 alternativas são
+    pontuadas juntas como uma matriz (26 x n). Repete até nada mudar, ou
+    até o prazo `deadline`, com os deslocamentos ajustados até ali.
+    """
+    shifts = shifts.copy()
+    period = shifts.size
+    columns = np.arange(indices.size) % period
+    options = np.arange(26)[:, None]
+    # Só o idioma da chave é pontuado
+    model = quadgrams.get_model()[lang]
+    for _ in range(passes):
+        changed = False
+        for column in range(period):
+            if deadline is not None and time.monotonic() >= deadline:
+                return shifts
+            rows = np.repeat(((indices - shifts[columns]) % 26)[None, :], 26, axis=0)
+            mask = columns == column
+            rows[:, mask] = (indices[mask][None, :] - options) % 26
+            best = int(model[quadgrams.pack(rows)].sum(axis=1).argmax())
+            if best != shifts[column]:
+                shifts[column] = best
+                changed = True
+        if not changed:
+            break
+    return shifts
+
+
+def solve_vigenere(text: str, top_k: int = 5, max_period: int = 20,
+                   top_periods: int = 5, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Recupera a chave de Vigenère sem conhecê-la.
+
+    Os períodos mais prováveis são escolhidos pelo índice de coincidência;
+    para cada um, o deslocamento de todas as colunas é resolvido de uma vez
+    pelo qui-quadrado contra português e inglês e depois refinado pelos
+    quadrigramas numa amostra do início do texto. As chaves candidatas são
+    ranqueadas de uma vez pelos quadrigramas nessa mesma amostra, e só as
+    `top_k` melhores são aplicadas ao texto inteiro. Com `deadline` (um
+    instante de time.monotonic), o refinamento para e os períodos e
+    idiomas seguintes deixam de ser testados quando o prazo passa.
+    """
+    indices = language_model.letter_indices(text).astype(np.int64)
+    n = indices.size
+    if n == 0:
+        return []
+
+    # Pelo menos ~4 letras por coluna para a estatística fazer sentido
+    max_period = max(1, min(max_period, n // 4))
+    ioc = periodic_ioc(indices, max_period)
+    periods = np.argsort(-ioc, kind='stable')[:top_periods] + 1
+
+    # rolls[s, j] = (j + s) % 26: histograma da coluna decifrada com deslocamento s
+    rolls = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+    positions = np.arange(n)
+
+    # Amostra usada no refinamento: o suficiente para os quadrigramas decidirem
+    sample = indices[:REFINE_SAMPLE]
+
+    candidates = {}
+    for period in periods:
+        if deadline is not None and candidates and time.monotonic() >= deadline:
+            break
+        counts = np.bincount((positions % period) * 26 + indices,
+                             minlength=period * 26).reshape(period, 26)
+        # (período x 26 deslocamentos x 26 letras) -> (período x 26 x idiomas)
+        shifted = counts[:, rolls]
+        chi = language_model.chi_squared(shifted.reshape(-1, 26)).reshape(period, 26, -1)
+
+        # Melhor deslocamento por coluna, para cada idioma
+        best_shifts = chi.argmin(axis=1)
+        for lang, language in enumerate(language_model.LANGUAGES):
+            if deadline is not None and candidates and time.monotonic() >= deadline:
+                break
+            shifts = best_shifts[:, lang]
+            if sample.size >= 4:
+                shifts = refine_shifts(sample, shifts, lang, deadline=deadline)
+            key = _minimal_key(''.join(chr(ord('A') + int(s)) for s in shifts))
+            if key in candidates:
+                continue
+
+            # Penalidade tipo BIC: cada coluna é um parâmetro livre, o que evita
+            # que períodos longos "decorem" o texto
+            plain_counts = shifted[np.arange(period), shifts].sum(axis=0)
+            score = language_model.unigram_scores(plain_counts[None, :])[0, lang]
+            score -= len(key) * np.log(n) / (2 * n)
+            candidates[key] = {
+                'key': key,
+                'period': len(key),
+                'score': float(score),
+                'language': language
+            }
+
+    # Os candidatos são poucos (no máximo um por período e idioma): a amostra
+    # decifrada por cada chave vira uma linha, e todas são pontuadas juntas
+    # pelos quadrigramas; como no AIC, cada letra da chave (escolhida entre
+    # 26) custa 2·log(26) na verossimilhança total da amostra
+    ranked = list(candidates.values())
+    if sample.size >= 4:
+        keys = [np.array([ord(c) - ord('A') for c in candidate['key']]) for candidate in ranked]
+        rows = np.stack([(sample - np.resize(shifts, sample.size)) % 26 for shifts in keys])
+        best = language_model.best_language(quadgrams.score_rows(rows))
+        for candidate, value, language in zip(ranked, best['score'], best['language']):
+            candidate['score'] = float(value) - 2 * candidate['period'] * np.log(26) / (sample.size - 3)
+            candidate['language'] = str(language)
+    ranked.sort(key=lambda c: -c['score'])
+
+    upper = text.upper()
+    for candidate in ranked[:top_k]:
+        candidate['text'] = cipher_tables.vigenere(upper, candidate['key'])
+    return ranked[:top_k]
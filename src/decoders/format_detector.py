@@ -0,0 +1,245 @@
+"""
+Detecção do formato de codificação de um texto em uma única passada
+
+A passada é um histograma dos code points; as classes, as letras (para
+Bacon e o índice de coincidência) e os alfabetos Base-N saem dele. As
+checagens que precisam da ordem dos caracteres (tap code, algarismos
+romanos, esteganografia) só rodam quando as classes permitem o formato.
+"""
+
+import re
+from typing import Dict
+
+import numpy as np
+
+from . import base_n
+from . import stego
+
+# Classes de caracteres
+C_OTHER = 0       # qualquer caractere não classificado (acentos, símbolos Unicode...)
+C_SPACE = 1       # espaço, tab
+C_BIN = 2         # 0 1
+C_DIGIT = 3       # 2-9
+C_HEX_UPPER = 4   # A-F
+C_HEX_LOWER = 5   # a-f
+C_UPPER = 6       # G-Z (exceto X)
+C_LOWER = 7       # g-z (exceto x)
+C_X = 8           # x X (prefixo 0x)
+C_PLUS = 9        # +
+C_SLASH = 10      # /
+C_MINUS = 11      # -
+C_UNDERSCORE = 12 # _
+C_EQUALS = 13     # =
+C_DOT = 14        # .
+C_PIPE = 15       # |
+C_PUNCT = 16      # demais sinais ASCII imprimíveis
+C_BRAILLE = 17    # U+2800-U+28FF
+C_NEWLINE = 18    # quebras de linha
+N_CLASSES = 19
+
+# Tabela de classes indexada pelo code point; tudo acima dela é C_OTHER
+_TABLE_SIZE = 0x2900
+CHAR_CLASSES = np.full(_TABLE_SIZE + 1, C_OTHER, dtype=np.uint8)
+CHAR_CLASSES[[ord(c) for c in ' \t']] = C_SPACE
+CHAR_CLASSES[[ord(c) for c in '\r\n\x0b\x0c']] = C_NEWLINE
+CHAR_CLASSES[0x21:0x7f] = C_PUNCT
+CHAR_CLASSES[[ord('0'), ord('1')]] = C_BIN
+CHAR_CLASSES[ord('2'):ord('9') + 1] = C_DIGIT
+CHAR_CLASSES[ord('A'):ord('Z') + 1] = C_UPPER
+CHAR_CLASSES[ord('a'):ord('z') + 1] = C_LOWER
+CHAR_CLASSES[ord('A'):ord('F') + 1] = C_HEX_UPPER
+CHAR_CLASSES[ord('a'):ord('f') + 1] = C_HEX_LOWER
+CHAR_CLASSES[[ord('x'), ord('X')]] = C_X
+CHAR_CLASSES[ord('+')] = C_PLUS
+CHAR_CLASSES[ord('/')] = C_SLASH
+CHAR_CLASSES[ord('-')] = C_MINUS
+CHAR_CLASSES[ord('_')] = C_UNDERSCORE
+CHAR_CLASSES[ord('=')] = C_EQUALS
+CHAR_CLASSES[ord('.')] = C_DOT
+CHAR_CLASSES[ord('|')] = C_PIPE
+CHAR_CLASSES[0x2800:0x2900] = C_BRAILLE
+
+_LETTERS = [C_HEX_UPPER, C_HEX_LOWER, C_UPPER, C_LOWER, C_X]
+_HEX = [C_BIN, C_DIGIT, C_HEX_UPPER, C_HEX_LOWER]
+_BASE64 = [C_BIN, C_DIGIT, C_HEX_UPPER, C_HEX_LOWER, C_UPPER, C_LOWER, C_X]
+
+# Índice de coincidência a partir do qual o texto parece monoalfabético
+MONO_IOC = 0.055
+
+# Letras que não são algarismos romanos (índices 0-25 de A-Z)
+_NOT_ROMAN = [ord(c) - ord('A') for c in 'ABEFGHJKNOPQRSTUWYZ']
+
+# Separadores das palavras de algarismos romanos
+_ROMAN_SEPARATORS = re.compile(r'[\s/-]+')
+
+
+def code_point_counts(text: str) -> np.ndarray:
+    """
+    Histograma dos code points do texto até o fim da tabela de classes
+    (tudo acima cai na última posição); texto ASCII é lido byte a byte
+    """
+    if text.isascii():
+        return np.bincount(np.frombuffer(text.encode('ascii'), dtype=np.uint8), minlength=128)
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    return np.bincount(np.minimum(codes, _TABLE_SIZE), minlength=_TABLE_SIZE + 1)
+
+
+def _class_counts(points: np.ndarray) -> np.ndarray:
+    return np.bincount(CHAR_CLASSES[:points.size], weights=points, minlength=N_CLASSES).astype(np.int64)
+
+
+def char_class_counts(text: str) -> np.ndarray:
+    """Histograma das classes de caracteres do texto (uma passada vetorizada)"""
+    return _class_counts(code_point_counts(text))
+
+
+def detect_encoding(text: str) -> Dict[str, float]:
+    """
+    Classifica o texto e retorna os formatos possíveis com a confiança (0-1),
+    do mais provável para o menos provável. Nenhum decodificador é executado.
+    """
+    points = code_point_counts(text)
+    counts = _class_counts(points)
+    total = int(counts.sum() - counts[C_SPACE] - counts[C_NEWLINE])
+    if total == 0:
+        return {}
+
+    def only(*classes) -> bool:
+        """Verdadeiro se todos os caracteres (fora espaços) estão nas classes dadas"""
+        return int(counts[list(classes)].sum()) == total
+
+    letters = int(counts[_LETTERS].sum())
+    # Letras A-Z sem distinção de caixa
+    alphabet = points[ord('A'):ord('Z') + 1] + points[ord('a'):ord('z') + 1]
+    has_space = counts[C_SPACE] + counts[C_NEWLINE] > 0
+    scores = {}
+
+    # Caracteres invisíveis (largura zero, espaços e tabs no fim das linhas)
+    # em quantidade suficiente para um byte escondido; os de largura zero
+    # estão em C_OTHER e o canal de fim de linha precisa de tabs
+    if (counts[C_OTHER] or points[ord('\t')]) and stego.analyze(text)['suspicious']:
+        scores['stego'] = 0.97
+
+    if counts[C_BRAILLE] / total >= 0.9:
+        scores['braille'] = 0.95
+
+    if only(C_DOT, C_MINUS, C_SLASH, C_PIPE) and counts[C_DOT] + counts[C_MINUS]:
+        scores['morse'] = 0.95 if has_space or counts[C_SLASH] or counts[C_PIPE] else 0.6
+        if not counts[C_MINUS] and not counts[C_PIPE] and _tap_groups(text):
+            # Só pontos, em pares de grupos de 1 a 5 batidas: mais provável tap code
+            scores['tap'] = 0.96
+
+    if only(C_BIN, C_DIGIT) and _polybius_digits(text):
+        scores['polybius'] = 0.5
+
+    if only(C_BIN):
+        scores['binary'] = 1.0 if counts[C_BIN] % 8 == 0 else 0.7
+
+    if only(C_BIN, C_DIGIT) and has_space:
+        scores['ascii'] = 0.8
+    elif only(C_BIN, C_DIGIT, C_MINUS, C_SLASH, C_PIPE) and counts[C_BIN] + counts[C_DIGIT] and \
+            counts[C_MINUS] + counts[C_SLASH] + counts[C_PIPE]:
+        # Números separados por hífens ou barras (A1Z26: 8-5-12-12-15)
+        scores['ascii'] = 0.7
+    elif letters and only(*_LETTERS, C_MINUS, C_SLASH) and not alphabet[_NOT_ROMAN].any() and \
+            _roman_tokens(text):
+        scores['ascii'] = 0.5
+
+    if only(*_HEX):
+        digits = int(counts[_HEX].sum())
+        if digits % 2 == 0:
+            # Só dígitos decimais também podem ser ASCII decimal ou outra coisa
+            scores['hex'] = 0.9 if counts[C_HEX_UPPER] + counts[C_HEX_LOWER] else 0.5
+    elif only(C_BIN, C_DIGIT, C_HEX_UPPER, C_HEX_LOWER, C_X) and counts[C_X]:
+        # Notação 0x48 0x65 ...
+        scores['hex'] = 0.85
+
+    url_safe = counts[C_MINUS] + counts[C_UNDERSCORE]
+    standard = counts[C_PLUS] + counts[C_SLASH]
+    if only(*_BASE64, C_PLUS, C_SLASH, C_MINUS, C_UNDERSCORE, C_EQUALS) and \
+            counts[C_EQUALS] <= 2 and not (url_safe and standard):
+        # Quebras de linha são comuns em Base64, espaços não
+        confidence = 0.4
+        if total % 4 == 0:
+            confidence += 0.3
+        if letters and counts[C_BIN] + counts[C_DIGIT]:
+            confidence += 0.1
+        if (counts[C_UPPER] + counts[C_HEX_UPPER]) and (counts[C_LOWER] + counts[C_HEX_LOWER]):
+            confidence += 0.1
+        if counts[C_SPACE]:
+            confidence -= 0.3
+        if total - counts[C_EQUALS] >= 4:
+            scores['base64'] = round(confidence, 2)
+
+    # Outros alfabetos Base-N (base32, base58, ascii85...): o base64 já foi tratado acima
+    if not counts[C_SPACE] and points.size <= 128 and total >= 4:
+        ascii_counts = np.zeros(256, dtype=np.int64)
+        ascii_counts[:128] = points
+        ascii_counts[[ord(c) for c in '\n\r\x0b\x0c']] = 0
+        stripped = text.strip()
+        delimited = stripped.startswith('<~') and stripped.endswith('~>')
+        for codec, confidence in base_n.detect_counts(ascii_counts, delimited).items():
+            if codec != 'base64':
+                scores[codec] = confidence
+
+    if only(C_HEX_UPPER, C_HEX_LOWER) and _only_a_b(alphabet):
+        scores['bacon'] = 0.95 if total % 5 == 0 else 0.7
+    elif letters >= 25 and (counts[C_UPPER] + counts[C_HEX_UPPER]) and (counts[C_LOWER] + counts[C_HEX_LOWER]):
+        # Maiúsculas e minúsculas misturadas podem esconder bits de Bacon
+        scores['bacon'] = 0.2
+
+    if letters and letters / total >= 0.8 and not counts[C_BRAILLE]:
+        # Texto cifrado só com letras: o índice de coincidência separa
+        # substituição simples (César, Atbash) de polialfabética (Vigenère);
+        # em textos curtos a estatística não é confiável e César é mais comum
+        if letters < 40 or _index_of_coincidence(alphabet) >= MONO_IOC:
+            scores['caesar'] = 0.6
+            scores['vigenere'] = 0.3
+        else:
+            scores['vigenere'] = 0.6
+            scores['caesar'] = 0.3
+
+    return dict(sorted(scores.items(), key=lambda item: -item[1]))
+
+
+def _tap_groups(text: str) -> bool:
+    """Verdadeiro se cada palavra tem um número par de grupos de 1 a 5 pontos (texto só de pontos, barras e espaços)"""
+    if '.' * 6 in text:
+        return False
+    raw = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    dots = raw == ord('.')
+    starts = dots.copy()
+    starts[1:] &= ~dots[:-1]
+    # Grupos acumulados em cada barra: a diferença é o número de grupos da palavra
+    groups = np.cumsum(starts, dtype=np.int32)
+    bounds = groups[np.flatnonzero(raw == ord('/'))]
+    per_word = np.diff(bounds, prepend=0, append=groups[-1])
+    return bool(groups[-1]) and not (per_word % 2).any()
+
+
+def _polybius_digits(text: str) -> bool:
+    """Verdadeiro se o texto tem um número par de dígitos, todos de 1 a 6"""
+    digits = ''.join(text.split())
+    return len(digits) >= 2 and len(digits) % 2 == 0 and not digits.strip('123456')
+
+
+def _roman_tokens(text: str) -> bool:
+    """
+    Verdadeiro se o texto tem ao menos 3 palavras (separadas por espaços,
+    '/' ou '-'); as classes já garantiram que as letras são algarismos romanos
+    """
+    words = _ROMAN_SEPARATORS.split(text.strip(' \t\r\n\x0b\x0c/-'), maxsplit=2)
+    return len(words) == 3
+
+
+def _only_a_b(alphabet: np.ndarray) -> bool:
+    """Verdadeiro se as letras (contagens de A-Z) são só A e B"""
+    return bool(alphabet[:2].all()) and not alphabet[2:].any()
+
+
+def _index_of_coincidence(alphabet: np.ndarray) -> float:
+    """Índice de coincidência das contagens de A-Z"""
+    n = alphabet.sum()
+    if n < 2:
+        return 0.0
+    return float((alphabet * (alphabet - 1)).sum() / (n * (n - 1)))
@@ -0,0 +1,240 @@
+"""
+Cifras de grade: tap code, Polybius 5x5/6x6, Nihilist e ADFGVX/ADFGX
+
+Toda grade é um array de símbolos (0-25 letras, 26-35 dígitos), linha por
+linha; decodificar é converter os pares (linha, coluna) em posições e fazer
+uma única indexação na grade. Uma grade com palavra-chave põe as letras da
+palavra primeiro (sem repetir) e o resto do alfabeto depois.
+
+Quando a palavra que montou a grade é desconhecida, as grades de milhares
+de palavras candidatas viram uma matriz (palavras x células); o texto claro
+de todas sai de uma indexação e é pontuado de uma vez pelos quadrigramas.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.config import DECODER_CONFIG
+
+from . import language_model
+from . import quadgrams
+from . import transposition
+
+SYMBOLS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+_SYMBOL_CODES = np.array([ord(c) for c in SYMBOLS], dtype=np.uint32)
+
+# Alfabetos de cada grade e a letra que é fundida em outra
+GRID_ALPHABETS = {
+    'polybius': ('ABCDEFGHIKLMNOPQRSTUVWXYZ', {'J': 'I'}),
+    'tap': ('ABCDEFGHIJLMNOPQRSTUVWXYZ', {'K': 'C'}),
+    'polybius6': (SYMBOLS, {}),
+}
+
+ADFGVX_LABELS = {5: 'ADFGX', 6: 'ADFGVX'}
+
+# Letras do texto claro pontuadas na busca de palavras-chave
+SAMPLE_SIZE = 300
+
+
+def grid_alphabet(size: int, tap: bool = False):
+    """Alfabeto e fusões da grade: tap code (K=C), Polybius 5x5 (I=J) ou 6x6"""
+    if size == 6:
+        return GRID_ALPHABETS['polybius6']
+    return GRID_ALPHABETS['tap' if tap else 'polybius']
+
+
+def keyed_grid(keyword: str = '', size: int = 5, tap: bool = False) -> np.ndarray:
+    """Grade (size*size,) de índices de SYMBOLS: palavra-chave primeiro, depois o resto do alfabeto"""
+    alphabet, merges = grid_alphabet(size, tap)
+    keyword = ''.join(merges.get(c, c) for c in keyword.upper())
+    order = dict.fromkeys(c for c in keyword + alphabet if c in alphabet)
+    return np.array([SYMBOLS.index(c) for c in order], dtype=np.int64)
+
+
+def keyed_grids(keywords: Sequence[str], size: int = 5, tap: bool = False) -> np.ndarray:
+    """Grades de várias palavras-chave: matriz (palavras x células)"""
+    if not keywords:
+        return np.zeros((0, size * size), dtype=np.int64)
+    return np.stack([keyed_grid(keyword, size, tap) for keyword in keywords])
+
+
+def _render(symbols: np.ndarray) -> str:
+    return _SYMBOL_CODES[symbols].tobytes().decode('utf-32-le')
+
+
+def _cells(rows: np.ndarray, columns: np.ndarray, size: int) -> np.ndarray:
+    """Pares (linha, coluna) começando em 1 -> posição na grade"""
+    rows = np.asarray(rows, dtype=np.int64)
+    columns = np.asarray(columns, dtype=np.int64)
+    if rows.size and (rows.min() < 1 or rows.max() > size or columns.min() < 1 or columns.max() > size):
+        raise ValueError(f"Coordenada fora da grade {size}x{size}")
+    return (rows - 1) * size + columns - 1
+
+
+# Coordenadas de cada formato (listas de posições, uma por palavra)
+
+def tap_cells(text: str) -> List[np.ndarray]:
+    """Tap code: grupos de batidas (qualquer símbolo repetido) em pares; '/' separa palavras"""
+    words = []
+    for word in text.split('/'):
+        counts = np.array([len(group) for group in word.split()], dtype=np.int64)
+        if counts.size % 2:
+            raise ValueError("Tap code com número ímpar de grupos de batidas")
+        if counts.size:
+            words.append(_cells(counts[0::2], counts[1::2], 5))
+    return words
+
+
+def digit_cells(text: str, size: int = 5) -> List[np.ndarray]:
+    """Polybius: dígitos de linha e coluna em pares (espaços opcionais); '/' separa palavras"""
+    words = []
+    for word in text.split('/'):
+        digits = np.array([int(d) for d in re.findall(r'\d', word)], dtype=np.int64)
+        if digits.size % 2:
+            raise ValueError("Polybius com número ímpar de dígitos")
+        if digits.size:
+            words.append(_cells(digits[0::2], digits[1::2], size))
+    return words
+
+
+def nihilist_cells(text: str, key: str, grid: np.ndarray, size: int = 5) -> List[np.ndarray]:
+    """
+    Nihilist: cada número é a coordenada do texto claro (linha*10 + coluna)
+    somada à coordenada da letra da chave na mesma grade.
+    """
+    numbers = np.array([int(n) for n in re.findall(r'\d+', text)], dtype=np.int64)
+    positions = np.empty(len(SYMBOLS), dtype=np.int64)
+    positions[grid] = np.arange(grid.size)
+    key_cells = positions[_key_symbols(key, size)]
+    key_numbers = (key_cells // size + 1) * 10 + key_cells % size + 1
+    plain = numbers - np.resize(key_numbers, numbers.size)
+    return [_cells(plain // 10, plain % 10, size)]
+
+
+def _key_symbols(key: str, size: int) -> List[int]:
+    """Símbolos de uma chave (com as fusões da grade), na ordem e com repetições"""
+    alphabet, merges = grid_alphabet(size)
+    symbols = [SYMBOLS.index(merges.get(c, c)) for c in key.upper() if merges.get(c, c) in alphabet]
+    if not symbols:
+        raise ValueError("Chave sem símbolos da grade")
+    return symbols
+
+
+def adfgvx_cells(text: str, key: str, size: int = 6) -> List[np.ndarray]:
+    """ADFGVX (6x6) ou ADFGX (5x5): desfaz a transposição colunar e lê os pares de rótulos"""
+    labels = ADFGVX_LABELS[size]
+    letters = [labels.index(c) for c in text.upper() if c in labels]
+    if len(letters) % 2:
+        raise ValueError("ADFGVX com número ímpar de letras")
+    stream = np.array(letters, dtype=np.int64)
+    if key and stream.size:
+        stream = stream[transposition.columnar_permutations(stream.size, transposition.keyword_ranks(key))[0]]
+    return [_cells(stream[0::2] + 1, stream[1::2] + 1, size)]
+
+
+def decode_cells(words: List[np.ndarray], grid: np.ndarray) -> str:
+    """Posições -> texto, com as palavras separadas por espaço"""
+    return ' '.join(_render(grid[cells]) for cells in words)
+
+
+# Decodificadores com grade conhecida
+
+def decode_tap(text: str) -> str:
+    return decode_cells(tap_cells(text), keyed_grid(tap=True))
+
+
+def decode_polybius(text: str, keyword: str = '', size: Optional[int] = None) -> str:
+    """Polybius 5x5 ou 6x6 (o tamanho é deduzido pelos dígitos, se não for dado)"""
+    if size is None:
+        size = 6 if re.search(r'6', text) else 5
+    return decode_cells(digit_cells(text, size), keyed_grid(keyword, size))
+
+
+def decode_nihilist(text: str, key: str, keyword: str = '') -> str:
+    grid = keyed_grid(keyword)
+    return decode_cells(nihilist_cells(text, key, grid), grid)
+
+
+def decode_adfgvx(text: str, key: str, keyword: str = '') -> str:
+    """ADFGVX, ou ADFGX se o texto não tiver a letra V"""
+    size = 6 if 'V' in text.upper() else 5
+    return decode_cells(adfgvx_cells(text, key, size), keyed_grid(keyword, size))
+
+
+# Busca da palavra-chave da grade
+
+def default_keywords() -> List[str]:
+    """Palavras do jogo e as mais comuns do português e do inglês"""
+    from .cribs import game_cribs
+    words = list(game_cribs()) + list(DECODER_CONFIG["labyrinth"]["known_keywords"])
+    for language in language_model.LANGUAGES:
+        words.extend(language_model.COMMON_WORDS[language])
+    return list(dict.fromkeys(word.upper() for word in words if word))
+
+
+def load_keywords(path) -> List[str]:
+    """Lê uma palavra-chave por linha"""
+    with open(path, encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def search_keywords(text: str, cipher: str = 'polybius', key: str = '',
+                    words: Optional[Iterable[str]] = None, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Procura a palavra-chave da grade (Polybius, Nihilist ou ADFGVX; `key` é a
+    chave da transposição do ADFGVX ou a chave aditiva do Nihilist).
+
+    As posições do texto na grade só dependem do cifrado, então são
+    calculadas uma vez; todas as grades candidatas são aplicadas juntas.
+    """
+    keywords = [''] + list(dict.fromkeys(words if words is not None else default_keywords()))
+    if cipher == 'polybius':
+        size = 6 if re.search(r'6', text) else 5
+        words_cells = digit_cells(text, size)
+    elif cipher == 'adfgvx':
+        size = 6 if 'V' in text.upper() else 5
+        words_cells = adfgvx_cells(text, key, size)
+    elif cipher == 'nihilist':
+        # A soma da chave depende da grade, então cada palavra tem suas posições
+        return _search_nihilist(text, key, keywords, top_k)
+    else:
+        raise ValueError(f"Cifra de grade desconhecida: {cipher}")
+
+    cells = np.concatenate(words_cells) if words_cells else np.zeros(0, dtype=np.int64)
+    if cells.size < 4:
+        return []
+    grids = keyed_grids(keywords, size)
+    return _rank(keywords, grids[:, cells[:SAMPLE_SIZE]],
+                 lambda index: decode_cells(words_cells, grids[index]), top_k)
+
+
+def _search_nihilist(text: str, key: str, keywords: List[str], top_k: int) -> List[Dict[str, Any]]:
+    rows, usable = [], []
+    for keyword in keywords:
+        grid = keyed_grid(keyword)
+        try:
+            rows.append(grid[nihilist_cells(text, key, grid)[0][:SAMPLE_SIZE]])
+            usable.append(keyword)
+        except ValueError:
+            continue   # a chave nesta grade gera coordenadas impossíveis
+    if not rows or rows[0].size < 4:
+        return []
+    return _rank(usable, np.stack(rows), lambda index: decode_nihilist(text, key, usable[index]), top_k)
+
+
+def _rank(keywords: List[str], symbols: np.ndarray, render, top_k: int) -> List[Dict[str, Any]]:
+    """Pontua todas as linhas de símbolos juntas e monta os `top_k` melhores"""
+    letters = np.where(symbols < 26, symbols, -1)
+    best = language_model.best_language(quadgrams.score_masked_rows(letters))
+    order = np.argsort(-best['score'], kind='stable')[:top_k]
+    return [
+        {
+            'keyword': keywords[index],
+            'text': render(index),
+            'score': float(best['score'][index]),
+            'language': str(best['language'][index])
+        }
+        for index in order
+    ]
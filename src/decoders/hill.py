@@ -0,0 +1,184 @@
+"""
+Cifra de Hill (2x2 e 3x3) com recuperação da chave por álgebra em lote
+
+Com os blocos do cifrado como colunas de uma matriz C (d x m), o texto claro
+é P = D @ C mod 26, onde D é a inversa da chave. Cada linha de D produz
+sozinha as letras de uma posição do bloco (linha r -> r @ C), então:
+
+- 2x2: as linhas possíveis são aplicadas numa única multiplicação
+  (676 x 2) @ (2 x m); cada chave inversível é só um par de linhas, e todas
+  (~157 mil) são pontuadas juntas pelos quadrigramas numa amostra.
+- 3x3: testar 26^9 chaves é inviável, mas cada uma das 17.576 linhas pode
+  ser avaliada sozinha pelas frequências de letras do que ela produz. As
+  melhores linhas são combinadas em trincas ordenadas e inversíveis, e só
+  essas são pontuadas pelos quadrigramas.
+"""
+
+import itertools
+import math
+from typing import Any, Dict, List
+
+import numpy as np
+
+from . import language_model
+from . import quadgrams
+
+# Letras do texto claro pontuadas pelos quadrigramas na busca (o resto só
+# entra na nota final) e blocos usados para avaliar cada linha no 3x3
+SAMPLE_LETTERS = 60
+ROW_SAMPLE_BLOCKS = 300
+
+# Linhas candidatas por posição na busca 3x3
+TOP_ROWS = 12
+
+FINALISTS = 20
+
+
+def _rows(size: int) -> np.ndarray:
+    """
+    Linhas que podem estar numa matriz inversível mod 26: (linhas x size).
+    Uma linha com todos os valores pares (ou múltiplos de 13) tornaria o
+    determinante par (ou múltiplo de 13), então ela nem é testada.
+    """
+    rows = np.array(list(itertools.product(range(26), repeat=size)), dtype=np.int64)
+    return rows[(rows % 2 == 1).any(axis=1) & (rows % 13 != 0).any(axis=1)]
+
+
+def determinant(matrices: np.ndarray) -> np.ndarray:
+    """Determinante inteiro de matrizes 2x2 ou 3x3 (em lote, última duas dimensões)"""
+    m = np.asarray(matrices, dtype=np.int64)
+    if m.shape[-1] == 2:
+        return m[..., 0, 0] * m[..., 1, 1] - m[..., 0, 1] * m[..., 1, 0]
+    return (m[..., 0, 0] * (m[..., 1, 1] * m[..., 2, 2] - m[..., 1, 2] * m[..., 2, 1]) -
+            m[..., 0, 1] * (m[..., 1, 0] * m[..., 2, 2] - m[..., 1, 2] * m[..., 2, 0]) +
+            m[..., 0, 2] * (m[..., 1, 0] * m[..., 2, 1] - m[..., 1, 1] * m[..., 2, 0]))
+
+
+def invertible(matrices: np.ndarray) -> np.ndarray:
+    """Máscara das matrizes inversíveis mod 26 (determinante ímpar e não múltiplo de 13)"""
+    det = determinant(matrices) % 26
+    return (det % 2 == 1) & (det % 13 != 0)
+
+
+def inverse(matrix: np.ndarray) -> np.ndarray:
+    """Inversa de uma matriz mod 26 (pela adjunta)"""
+    matrix = np.asarray(matrix, dtype=np.int64)
+    det = int(determinant(matrix)) % 26
+    if math.gcd(det, 26) != 1:
+        raise ValueError("Matriz não inversível mod 26")
+    size = matrix.shape[0]
+    cofactors = np.empty_like(matrix)
+    for i in range(size):
+        for j in range(size):
+            minor = np.delete(np.delete(matrix, i, axis=0), j, axis=1)
+            value = int(determinant(minor)) if size == 3 else int(minor[0, 0])
+            cofactors[i, j] = (-1) ** (i + j) * value
+    return (pow(det, -1, 26) * cofactors.T) % 26
+
+
+def parse_key(key) -> np.ndarray:
+    """Chave como palavra de 4 ou 9 letras, números separados ou matriz"""
+    if isinstance(key, str):
+        letters = language_model.letter_indices(key.upper())
+        values = letters if key.strip().isalpha() else [int(v) for v in key.replace(',', ' ').split()]
+    else:
+        values = np.ravel(key)
+    values = np.asarray(values, dtype=np.int64) % 26
+    size = math.isqrt(values.size)
+    if size not in (2, 3) or size * size != values.size:
+        raise ValueError("A chave de Hill deve ter 4 ou 9 valores")
+    return values.reshape(size, size)
+
+
+def _blocks(text: str, size: int) -> np.ndarray:
+    """Letras do texto como matriz de blocos (size x m); um bloco incompleto no fim é descartado"""
+    letters = language_model.letter_indices(text.upper()).astype(np.int64)
+    m = letters.size // size
+    return letters[:m * size].reshape(m, size).T
+
+
+def _text(plain: np.ndarray) -> str:
+    """Matriz (size x m) de letras claras -> texto"""
+    return ''.join(chr(ord('A') + int(v)) for v in plain.T.ravel())
+
+
+def encrypt(text: str, key) -> str:
+    """Cifra as letras do texto (completando o último bloco com X)"""
+    matrix = parse_key(key)
+    size = matrix.shape[0]
+    letters = language_model.letter_indices(text.upper()).astype(np.int64)
+    letters = np.concatenate((letters, np.full(-letters.size % size, ord('X') - ord('A'))))
+    return _text((matrix @ letters.reshape(-1, size).T) % 26)
+
+
+def decrypt(text: str, key) -> str:
+    """Decifra com a chave de cifração (a inversa é calculada aqui)"""
+    matrix = parse_key(key)
+    return _text((inverse(matrix) @ _blocks(text, matrix.shape[0])) % 26)
+
+
+def _interleave(streams: np.ndarray, combos: np.ndarray) -> np.ndarray:
+    """Texto claro de cada combinação de linhas: (combinações x m*size)"""
+    # (combinações x size x m) -> letras na ordem dos blocos
+    return streams[combos].transpose(0, 2, 1).reshape(combos.shape[0], -1)
+
+
+def _finalists(streams: np.ndarray, combos: np.ndarray) -> np.ndarray:
+    """Índices das combinações com melhor nota de quadrigramas na amostra"""
+    size = combos.shape[1]
+    streams = streams[:, :SAMPLE_LETTERS // size]
+    scores = quadgrams.score_rows(_interleave(streams, combos)).max(axis=1)
+    if scores.size > FINALISTS:
+        return np.argpartition(-scores, FINALISTS)[:FINALISTS]
+    return np.arange(scores.size)
+
+
+def _candidate_rows(size: int, sample: np.ndarray) -> tuple:
+    """Linhas testadas e as letras que cada uma produz na amostra (uint8, para poupar memória)"""
+    rows = _rows(size)
+    return rows, ((rows @ sample) % 26).astype(np.uint8)
+
+
+def solve(text: str, size: int = 2, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Recupera a chave de Hill (2x2 ou 3x3) sem conhecê-la. Retorna a chave de
+    cifração (letras, linha por linha), a matriz, o texto e a nota.
+    """
+    if size not in (2, 3):
+        raise ValueError("Só chaves 2x2 e 3x3 são suportadas")
+    blocks = _blocks(text, size)
+    if blocks.shape[1] * size < 4:
+        return []
+    sample = blocks[:, :ROW_SAMPLE_BLOCKS]
+    rows, streams = _candidate_rows(size, sample)
+
+    if size == 2:
+        # Todos os pares de linhas que formam matriz inversível
+        first, second = np.meshgrid(np.arange(rows.shape[0]), np.arange(rows.shape[0]), indexing='ij')
+        combos = np.stack((first.ravel(), second.ravel()), axis=1)
+        combos = combos[invertible(rows[combos])]
+    else:
+        # Decomposição por linha: cada linha é avaliada pelas letras que produz
+        chi = language_model.chi_squared(language_model.letter_counts(streams)).min(axis=1)
+        best_rows = np.argsort(chi, kind='stable')[:TOP_ROWS]
+        combos = np.array(list(itertools.permutations(best_rows, size)), dtype=np.int64)
+        combos = combos[invertible(rows[combos])]
+    if combos.size == 0:
+        return []
+
+    chosen = combos[_finalists(streams, combos)]
+    candidates = []
+    for combo in chosen:
+        decryption = rows[combo]
+        key = inverse(decryption)
+        candidates.append({
+            'key': ''.join(chr(ord('A') + int(v)) for v in key.ravel()),
+            'matrix': key.tolist(),
+            'text': _text((decryption @ blocks) % 26)
+        })
+    best = language_model.best_language(quadgrams.score_batch([c['text'] for c in candidates]))
+    for candidate, value, language in zip(candidates, best['score'], best['language']):
+        candidate['score'] = float(value)
+        candidate['language'] = str(language)
+    candidates.sort(key=lambda c: -c['score'])
+    return candidates[:top_k]
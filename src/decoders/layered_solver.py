@@ -0,0 +1,251 @@
+"""
+Busca automática de decodificações em camadas (ex.: Base64 dentro de hex dentro de César)
+"""
+
+import hashlib
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.config import SECURITY_CONFIG
+
+from . import base_n
+from . import buffers
+from . import cipher_tables
+from . import cryptanalysis
+from . import grid_ciphers
+from . import language_model
+from . import numeric
+from . import xor_analysis
+
+# Textos com nota abaixo disso são descartados da busca
+MIN_QUALITY = 0.15
+
+# Operações tentadas para cada formato detectado
+FORMAT_OPERATIONS = {
+    'base64': ['base64'],
+    'hex': ['hex'],
+    'binary': ['binary'],
+    'ascii': ['ascii'],
+    'morse': ['morse'],
+    'braille': ['braille'],
+    'bacon': ['bacon'],
+    'tap': ['tap'],
+    'polybius': ['polybius'],
+    'stego': ['stego'],
+    **{codec: [codec] for codec in base_n.CODECS if codec != 'base64'},
+    'caesar': ['caesar', 'atbash'],
+    'vigenere': ['vigenere', 'caesar', 'atbash']
+}
+
+# Formatos estruturais: um texto claramente nesses formatos é uma camada
+# intermediária e segue na busca mesmo com nota baixa de legibilidade
+STRUCTURAL_FORMATS = {'base64', 'hex', 'binary', 'ascii', 'morse', 'braille', 'bacon', 'tap', 'polybius',
+                      'base32', 'ascii85'}
+
+# Cifras clássicas: compor duas delas só "decora" o texto, então cada
+# cadeia tem no máximo uma
+CIPHER_OPERATIONS = {'caesar', 'atbash', 'vigenere'}
+
+# Esquemas numéricos (decimal, octal, A1Z26...) tentados por texto
+NUMERIC_CANDIDATES = 2
+
+# Chaves XOR tentadas quando um payload decodificado não é UTF-8, e o
+# tamanho mínimo do payload para isso (em poucos bytes, quase toda chave
+# produz algum UTF-8 válido)
+XOR_CANDIDATES = 2
+MIN_XOR_BYTES = 32
+
+# Letras mínimas por coluna para confiar numa chave de Vigenère
+MIN_VIGENERE_COLUMN = 10
+
+# Abaixo desse tamanho a nota de legibilidade é proporcionalmente reduzida:
+# em poucas letras a frequência é ruído, e uma decodificação espúria de
+# quatro letras comuns não pode valer mais que uma frase inteira
+MIN_SCORED_LENGTH = 8
+
+# Caracteres usados para pontuar a legibilidade de cada nó, e caracteres
+# (ou bytes) usados para recuperar as chaves de Vigenère e XOR, depois
+# aplicadas ao texto inteiro: o custo de um nó ou de uma operação não cresce
+# com o tamanho do texto. O prazo também é consultado dentro das buscas de
+# chave e antes de cada decodificação; filhos gerados depois dele são descartados
+NODE_SAMPLE = 4096
+CIPHER_SAMPLE = 20000
+
+
+def _content_key(text: str) -> bytes:
+    """Hash do conteúdo, usado para memorizar textos já visitados"""
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class LayeredSolver:
+    """
+    Busca em feixe (beam search) sobre os decodificadores do TextDecoder.
+
+    A cada nível, cada texto do feixe é expandido apenas pelas operações
+    compatíveis com o formato detectado; os filhos são pontuados por
+    `language_model.text_quality` (ou pela confiança do formato, se ainda
+    parecerem codificados) e só os `beam_width` melhores seguem. Textos
+    repetidos (pelo hash do conteúdo) não são visitados de novo.
+    """
+
+    def __init__(self, decoder, beam_width: int = 8, max_depth: int = 4,
+                 time_budget: Optional[float] = None):
+        self.decoder = decoder
+        self.beam_width = beam_width
+        self.max_depth = max_depth
+        # O orçamento nunca passa do limite de segurança global
+        limit = SECURITY_CONFIG["max_processing_time"]
+        self.time_budget = limit if time_budget is None else min(time_budget, limit)
+        # Prazo da busca em andamento, consultado dentro das operações mais caras
+        self._deadline = float('inf')
+
+        self.operations: Dict[str, Callable[[str], Iterator[Tuple[str, str]]]] = {
+            **{name: self._bytes_operation(name) for name in ('hex', 'binary', *base_n.CODECS)},
+            'ascii': self._ascii,
+            'morse': self._text_operation('morse', decoder.decode_morse),
+            'braille': self._text_operation('braille', decoder.decode_braille),
+            'bacon': self._text_operation('bacon', decoder.decode_bacon),
+            'tap': self._text_operation('tap', decoder.decode_tap),
+            'polybius': self._text_operation('polybius', grid_ciphers.decode_polybius),
+            'stego': self._text_operation('stego', decoder.decode_stego),
+            'atbash': self._text_operation('atbash', cipher_tables.atbash),
+            'caesar': self._caesar,
+            'vigenere': self._vigenere
+        }
+
+    def solve(self, text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retorna as `top_k` melhores cadeias de decodificação encontradas,
+        cada uma com o texto final, a nota e o caminho de transformações.
+        """
+        self._deadline = time.monotonic() + self.time_budget
+        max_length = SECURITY_CONFIG["max_text_length"]
+
+        visited = {_content_key(text)}
+        beam = [self._node(text, [])]
+        found = []
+
+        for _ in range(self.max_depth):
+            children = []
+            for node in beam:
+                allow_ciphers = not any(label.split('(')[0] in CIPHER_OPERATIONS for label in node['path'])
+                for label, child in self._expand(node, allow_ciphers):
+                    # Um filho que só ficou pronto depois do prazo é descartado
+                    if self._expired():
+                        break
+                    if not child or len(child) > max_length:
+                        continue
+                    key = _content_key(child)
+                    if key in visited:
+                        continue
+                    visited.add(key)
+                    child_node = self._node(child, node['path'] + [label])
+                    if self._expired():
+                        break
+                    if child_node['priority'] >= MIN_QUALITY:
+                        children.append(child_node)
+
+            if not children:
+                break
+            children.sort(key=lambda node: -node['priority'])
+            beam = children[:self.beam_width]
+            found.extend(beam)
+            if self._expired():
+                break
+
+        found.sort(key=lambda node: (-node['score'], len(node['path'])))
+        return [{'text': node['text'], 'path': node['path'], 'score': node['score']}
+                for node in found[:top_k]]
+
+    def _node(self, text: str, path: List[str]) -> Dict[str, Any]:
+        """Pontua um texto (numa amostra do início) e detecta seus formatos uma única vez"""
+        score = language_model.text_quality(text[:NODE_SAMPLE]) * min(1.0, len(text) / MIN_SCORED_LENGTH)
+        formats = self.decoder.detect_encoding(text)
+        structural = max((confidence for fmt, confidence in formats.items()
+                          if fmt in STRUCTURAL_FORMATS), default=0.0)
+        return {
+            'text': text,
+            'path': path,
+            'score': score,
+            'formats': formats,
+            'priority': max(score, 0.9 * structural)
+        }
+
+    def _expand(self, node: Dict[str, Any], allow_ciphers: bool = True) -> Iterator[Tuple[str, str]]:
+        """Aplica ao texto as operações compatíveis com os formatos detectados"""
+        text = node['text']
+        tried = set()
+        for fmt in node['formats']:
+            for name in FORMAT_OPERATIONS.get(fmt, []):
+                if name in tried or (name in CIPHER_OPERATIONS and not allow_ciphers):
+                    continue
+                tried.add(name)
+                if self._expired():
+                    return
+                try:
+                    yield from self.operations[name](text)
+                except (ValueError, OverflowError, UnicodeError):
+                    continue
+
+    def _expired(self) -> bool:
+        return time.monotonic() >= self._deadline
+
+    def _bytes_operation(self, name: str) -> Callable[[str], Iterator[Tuple[str, str]]]:
+        """
+        Operação que decodifica para bytes e só segue se o resultado for UTF-8;
+        bytes que não são UTF-8 podem estar ofuscados com XOR, então as chaves
+        mais prováveis são tentadas (sobre os mesmos bytes) antes de desistir.
+        """
+        def operation(text: str) -> Iterator[Tuple[str, str]]:
+            data = buffers.decode(text, name)
+            try:
+                yield name, buffers.to_text(data)
+                return
+            except UnicodeDecodeError:
+                if len(data) < MIN_XOR_BYTES:
+                    raise
+            # Chaves recuperadas numa amostra do início e aplicadas ao payload inteiro
+            if self._expired():
+                return
+            for candidate in xor_analysis.solve(data[:CIPHER_SAMPLE], top_k=XOR_CANDIDATES, deadline=self._deadline):
+                if self._expired():
+                    return
+                try:
+                    plain = xor_analysis.apply_key(data, candidate['key'])
+                    yield f"{name}+xor({candidate['key_hex']})", buffers.to_text(plain)
+                except UnicodeDecodeError:
+                    continue
+        return operation
+
+    @staticmethod
+    def _text_operation(name: str, func) -> Callable[[str], Iterator[Tuple[str, str]]]:
+        """Operação simples de texto para texto"""
+        def operation(text: str) -> Iterator[Tuple[str, str]]:
+            result = func(text)
+            if result:
+                yield name, result
+        return operation
+
+    @staticmethod
+    def _ascii(text: str) -> Iterator[Tuple[str, str]]:
+        """Tokens numéricos nos esquemas mais prováveis (decimal fica só 'ascii')"""
+        for candidate in numeric.scan(text, top_k=NUMERIC_CANDIDATES):
+            scheme = candidate['scheme']
+            yield ('ascii' if scheme == 'decimal' else f"ascii({scheme})"), candidate['text']
+
+    @staticmethod
+    def _caesar(text: str) -> Iterator[Tuple[str, str]]:
+        for candidate in cryptanalysis.brute_force_caesar(text, top_k=3):
+            if candidate['shift']:
+                yield f"caesar({candidate['shift']})", candidate['text']
+
+    def _vigenere(self, text: str) -> Iterator[Tuple[str, str]]:
+        """Chaves recuperadas numa amostra do início; a chave avança só nas letras, então vale no texto todo"""
+        sample = text[:CIPHER_SAMPLE]
+        letters = len(language_model.letter_indices(sample))
+        for candidate in cryptanalysis.solve_vigenere(sample, top_k=2, deadline=self._deadline):
+            if self._expired():
+                return
+            if candidate['key'].strip('A') and letters >= candidate['period'] * MIN_VIGENERE_COLUMN:
+                plain = candidate['text'] if len(text) <= CIPHER_SAMPLE else cipher_tables.vigenere(text.upper(), candidate['key'])
+                yield f"vigenere({candidate['key']})", plain
@@ -0,0 +1,159 @@
+"""
+Motor Morse baseado na árvore binária do código
+
+Cada símbolo vira um índice de heap: começa em 1, ponto desce para 2i e
+traço para 2i + 1. Assim a tabela de decodificação é um vetor plano e um
+texto inteiro é convertido com operações NumPy, sem consultas símbolo a
+símbolo. TextDecoder e AudioDecoder compartilham estas tabelas.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+MORSE_CODE = {
+    '.-': 'A', '-...': 'B', '-.-.': 'C', '-..': 'D', '.': 'E',
+    '..-.': 'F', '--.': 'G', '....': 'H', '..': 'I', '.---': 'J',
+    '-.-': 'K', '.-..': 'L', '--': 'M', '-.': 'N', '---': 'O',
+    '.--.': 'P', '--.-': 'Q', '.-.': 'R', '...': 'S', '-': 'T',
+    '..-': 'U', '...-': 'V', '.--': 'W', '-..-': 'X', '-.--': 'Y',
+    '--..': 'Z', '.----': '1', '..---': '2', '...--': '3', '....-': '4',
+    '.....': '5', '-....': '6', '--...': '7', '---..': '8', '----.': '9',
+    '-----': '0', '.-.-.-': '.', '--..--': ',', '..--..': '?',
+    '.----.': "'", '-.-.--': '!', '-..-.': '/', '-.--.': '(',
+    '-.--.-': ')', '.-...': '&', '---...': ':', '-.-.-.': ';',
+    '-...-': '=', '.-.-.': '+', '-....-': '-', '..--.-': '_',
+    '.-..-.': '"', '...-..-': '$', '.--.-.': '@', '...---...': 'SOS'
+}
+
+# Caractere -> símbolo (o prosign SOS fica de fora)
+MORSE_ENCODE = {char: symbol for symbol, char in MORSE_CODE.items() if len(char) == 1}
+
+MAX_SYMBOL = max(len(symbol) for symbol in MORSE_CODE)
+
+
+def symbol_index(symbol: str) -> int:
+    """Índice do símbolo na árvore binária (0 se não for só pontos e traços)"""
+    index = 1
+    for mark in symbol:
+        if mark == '.':
+            index = 2 * index
+        elif mark == '-':
+            index = 2 * index + 1
+        else:
+            return 0
+    return index
+
+
+# Árvore plana: TREE[índice] = texto do símbolo ('' = desconhecido)
+TREE = np.full(1 << (MAX_SYMBOL + 1), '', dtype=object)
+for _symbol, _char in MORSE_CODE.items():
+    TREE[symbol_index(_symbol)] = _char
+
+# Classes de caracteres do texto Morse
+M_OTHER = 0   # qualquer outro caractere (torna o símbolo desconhecido)
+M_DOT = 1
+M_DASH = 2
+M_SPACE = 3   # separa letras; dois ou mais seguidos separam palavras
+M_WORD = 4    # '/', '|' e quebras de linha separam palavras
+
+_TABLE_SIZE = 0x80
+_CLASSES = np.full(_TABLE_SIZE + 1, M_OTHER, dtype=np.uint8)
+_CLASSES[ord('.')] = M_DOT
+_CLASSES[ord('-')] = M_DASH
+_CLASSES[[ord(c) for c in ' \t']] = M_SPACE
+_CLASSES[[ord(c) for c in '/|\r\n\x0b\x0c']] = M_WORD
+
+
+def lookup(symbol: str) -> str:
+    """Texto de um único símbolo ('' se desconhecido)"""
+    index = symbol_index(symbol)
+    return TREE[index] if 0 < index < TREE.size else ''
+
+
+def decode_symbols(symbols: Iterable[str]) -> List[str]:
+    """Decodifica símbolos já separados (ex.: vindos do áudio), sem os desconhecidos"""
+    return [char for char in map(lookup, symbols) if char]
+
+
+def decode_report(text: str, unknown: str = '') -> Tuple[str, Dict[str, int]]:
+    """
+    Decodifica um texto Morse inteiro e conta os símbolos desconhecidos.
+
+    Letras são separadas por espaço; palavras por '/', '|', quebras de linha
+    ou dois ou mais espaços. Símbolos desconhecidos viram `unknown` (ou
+    somem, se vazio) e são devolvidos num Counter, sem log por símbolo.
+    """
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    if codes.size == 0:
+        return '', {}
+    classes = _CLASSES[np.minimum(codes, _TABLE_SIZE)]
+
+    # Símbolos são as sequências máximas de caracteres que não são separadores
+    marks = classes < M_SPACE
+    edges = np.diff(np.concatenate(([False], marks, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size == 0:
+        return '', {}
+
+    # Índice na árvore: 2^L + bits dos traços; símbolos longos demais ou com
+    # caracteres estranhos ficam com índice 0
+    symbol_id = np.cumsum(edges[:-1] == 1) - 1
+    lengths = ends - starts
+    positions = np.flatnonzero(marks)
+    owner = symbol_id[positions]
+    from_end = ends[owner] - positions - 1
+    dash_bits = np.where((classes[positions] == M_DASH) & (from_end < MAX_SYMBOL),
+                         np.left_shift(1, np.minimum(from_end, MAX_SYMBOL)), 0)
+    bits = np.bincount(owner, weights=dash_bits, minlength=starts.size).astype(np.int64)
+    others = np.bincount(owner, weights=classes[positions] == M_OTHER, minlength=starts.size)
+    valid = (lengths <= MAX_SYMBOL) & (others == 0)
+    indices = np.where(valid, np.left_shift(1, np.minimum(lengths, MAX_SYMBOL)) + bits, 0)
+    chars = TREE[indices]
+
+    # Quebra de palavra antes do símbolo k: separador de palavra ou 2+ espaços no intervalo
+    word_seps = np.concatenate(([0], np.cumsum(classes == M_WORD)))
+    breaks = np.zeros(starts.size, dtype=bool)
+    gaps = starts[1:] - ends[:-1]
+    breaks[1:] = (gaps >= 2) | (word_seps[starts[1:]] > word_seps[ends[:-1]])
+
+    missing = chars == ''
+    unknown_counts = Counter(text[start:end] for start, end in zip(starts[missing], ends[missing]))
+    if unknown:
+        chars[missing] = unknown
+        keep = np.ones(starts.size, dtype=bool)
+    else:
+        keep = ~missing
+
+    # Palavras vazias (só símbolos descartados) não geram espaços duplicados
+    groups = np.cumsum(breaks)[keep]
+    pieces = np.empty(2 * groups.size, dtype=object)
+    pieces[0::2] = np.where(np.concatenate(([False], groups[1:] != groups[:-1])), ' ', '')
+    pieces[1::2] = chars[keep]
+    return ''.join(pieces.tolist()), dict(unknown_counts)
+
+
+def decode(text: str, unknown: str = '') -> str:
+    """Decodifica um texto Morse (veja decode_report)"""
+    return decode_report(text, unknown)[0]
+
+
+def encode(text: str) -> Tuple[str, List[str]]:
+    """
+    Codifica texto em Morse: letras separadas por espaço e palavras por ' / '.
+    Retorna também os caracteres sem equivalente, que são ignorados.
+    """
+    words = []
+    unsupported = []
+    for word in text.upper().split():
+        symbols = []
+        for char in word:
+            symbol = MORSE_ENCODE.get(char)
+            if symbol:
+                symbols.append(symbol)
+            else:
+                unsupported.append(char)
+        words.append(' '.join(symbols))
+    return ' / '.join(words), unsupported
@@ -0,0 +1,149 @@
+"""
+Segmentação de Morse sem separadores (ex.: "......-...-..---" -> "HELLO")
+
+Programação dinâmica sobre as posições da sequência de pontos e traços.
+De cada posição saem as palavras do dicionário cujo código Morse casa ali
+(percorrendo um trie de pontos e traços) e, como recurso, letras soltas
+com custo alto. Cada posição guarda só os `beam` caminhos mais baratos,
+então o tempo é linear no tamanho da entrada.
+"""
+
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config import DECODER_CONFIG
+
+from . import language_model
+from . import morse
+
+# Custo fixo de cada palavra (evita quebrar o texto em palavras de uma letra)
+WORD_PENALTY = 3.0
+# Custo de cada letra fora do dicionário
+LETTER_COST = 8.0
+
+_NOT_MARK = re.compile(r'[^.-]+')
+
+
+def load_word_list(path) -> Dict[str, float]:
+    """
+    Lê uma lista de palavras ("PALAVRA" ou "PALAVRA CONTAGEM" por linha) e
+    converte as contagens em custos (-log da frequência relativa).
+    """
+    counts = {}
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            parts = line.split()
+            if not parts:
+                continue
+            counts[parts[0].upper()] = float(parts[1]) if len(parts) > 1 else 1.0
+    total = sum(counts.values())
+    return {word: -math.log(count / total) for word, count in counts.items()}
+
+
+class MorseSegmenter:
+    """
+    Encontra as leituras mais prováveis de um fluxo de pontos e traços.
+
+    `words` mapeia palavra -> custo; por padrão usa as palavras comuns de
+    português e inglês mais as palavras-chave conhecidas do labirinto.
+    """
+
+    _END = ''
+
+    def __init__(self, words: Optional[Dict[str, float]] = None, beam: int = 8):
+        if words is None:
+            words = language_model.word_costs(DECODER_CONFIG["labyrinth"]["known_keywords"])
+        self.beam = beam
+
+        # Trie dos códigos das palavras (concatenados, sem separadores)
+        self.root: Dict[str, Any] = {}
+        for word, cost in words.items():
+            code = self._word_code(word)
+            if code is None:
+                continue
+            node = self.root
+            for mark in code:
+                node = node.setdefault(mark, {})
+            node.setdefault(self._END, []).append((word, WORD_PENALTY + cost))
+
+        # Letras e dígitos avulsos (pontuação e prosigns ficam de fora)
+        self.letters = {symbol: char for symbol, char in morse.MORSE_CODE.items()
+                        if len(char) == 1 and char.isalnum()}
+        self.max_letter = max(len(symbol) for symbol in self.letters)
+
+    @staticmethod
+    def _word_code(word: str) -> Optional[str]:
+        """Código Morse concatenado da palavra, ou None se algum caractere não existe"""
+        symbols = [morse.MORSE_ENCODE.get(char) for char in word.upper()]
+        if not symbols or None in symbols:
+            return None
+        return ''.join(symbols)
+
+    def _transitions(self, marks: str, start: int) -> Iterable[Tuple[int, str, bool, float]]:
+        """Palavras e letras que começam em `start`: (fim, texto, é_palavra, custo)"""
+        node = self.root
+        for index in range(start, len(marks)):
+            node = node.get(marks[index])
+            if node is None:
+                break
+            for word, cost in node.get(self._END, ()):
+                yield index + 1, word, True, cost
+        for size in range(1, min(self.max_letter, len(marks) - start) + 1):
+            char = self.letters.get(marks[start:start + size])
+            if char:
+                yield start + size, char, False, LETTER_COST
+
+    def segment(self, text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retorna as `top_k` leituras mais baratas do texto (só os pontos e
+        traços são considerados), cada uma com o texto e o custo total.
+        """
+        marks = _NOT_MARK.sub('', text)
+        n = len(marks)
+        if n == 0:
+            return []
+        beam = max(self.beam, 2 * top_k)
+
+        # best[i] = caminhos até a posição i: (custo, posição anterior, rank anterior, texto, é_palavra)
+        best: List[List[Tuple[float, int, int, str, bool]]] = [[] for _ in range(n + 1)]
+        best[0] = [(0.0, -1, -1, '', False)]
+        for start in range(n):
+            paths = best[start]
+            if not paths:
+                continue
+            if len(paths) > beam:
+                paths.sort(key=lambda path: path[0])
+                del paths[beam:]
+            for end, token, is_word, cost in self._transitions(marks, start):
+                best[end].extend((path[0] + cost, start, rank, token, is_word)
+                                 for rank, path in enumerate(paths))
+        final = sorted(best[n], key=lambda path: path[0])
+
+        readings = []
+        seen = set()
+        for path in final:
+            reading = self._render(best, path)
+            if reading not in seen:
+                seen.add(reading)
+                readings.append({'text': reading, 'cost': round(path[0], 3)})
+                if len(readings) == top_k:
+                    break
+        return readings
+
+    @staticmethod
+    def _render(best, path) -> str:
+        """Reconstrói o texto de um caminho; letras soltas vizinhas ficam juntas"""
+        tokens = []
+        while path[1] >= 0:
+            tokens.append((path[3], path[4]))
+            path = best[path[1]][path[2]]
+        pieces = []
+        letters = False
+        for token, is_word in reversed(tokens):
+            if not is_word and letters:
+                pieces[-1] += token
+            else:
+                pieces.append(token)
+            letters = not is_word
+        return ' '.join(pieces)
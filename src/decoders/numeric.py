@@ -0,0 +1,199 @@
+"""
+Decodificação de tokens numéricos em várias bases e esquemas
+
+O texto é tokenizado uma única vez por uma regex compilada (números e
+algarismos romanos). Os dígitos de todos os tokens viram um único vetor;
+o valor de cada token em cada base sai de uma multiplicação de uma matriz
+(tokens x dígitos) pelas potências da base, sem um int() por token.
+
+Esquemas:
+- 'decimal' e 'octal': code points (ASCII/Unicode) na base 10 ou 8;
+- 'a1z26': 1 = A ... 26 = Z;
+- 't9': teclado de telefone por toques repetidos (44 = H, 0 = espaço);
+- 'roman' e 'roman_ascii': algarismos romanos como A1Z26 ou como code points.
+
+Todos são avaliados na mesma passada e ranqueados pela fração de tokens
+válidos e pela legibilidade, como no bitstream.
+"""
+
+import re
+from typing import Any, Dict, List
+
+import numpy as np
+
+from . import language_model
+
+TOKEN_PATTERN = re.compile(r'(?P<digits>[0-9]+)|(?P<roman>\b[IVXLCDM]+\b)', re.IGNORECASE)
+
+# Separadores de palavra entre tokens (como no Morse, além de dois ou mais
+# espaços); com hífens dentro das palavras (8-5-12-12-15), um espaço também
+# separa palavras
+WORD_SEPARATORS = '/|\n'
+
+# Esquema -> (leitura dos tokens, conversão dos valores em caracteres)
+SCHEMES = {
+    'decimal': ('decimal', 'codepoint'),
+    'octal': ('octal', 'codepoint'),
+    'a1z26': ('decimal', 'letters'),
+    't9': ('t9', 'letters'),
+    'roman': ('roman', 'letters'),
+    'roman_ascii': ('roman', 'codepoint'),
+}
+
+# Tokens maiores que isso estourariam o int64 e são inválidos
+MAX_DIGITS = 18
+
+# Caracteres usados para pontuar a legibilidade de cada candidato
+SAMPLE_SIZE = 4096
+
+INVALID = ord('?')
+
+# Teclado T9: T9_KEYS[dígito, toques - 1] = letra (0 no teclado é espaço)
+_KEYPAD = {2: 'ABC', 3: 'DEF', 4: 'GHI', 5: 'JKL', 6: 'MNO', 7: 'PQRS', 8: 'TUV', 9: 'WXYZ', 0: ' '}
+T9_KEYS = np.full((10, 4), INVALID, dtype=np.uint32)
+for _digit, _letters in _KEYPAD.items():
+    T9_KEYS[_digit, :len(_letters)] = [ord(c) for c in _letters]
+
+_ROMAN_VALUES = np.zeros(128, dtype=np.int64)
+for _char, _value in zip('IVXLCDM', (1, 5, 10, 50, 100, 500, 1000)):
+    _ROMAN_VALUES[ord(_char)] = _ROMAN_VALUES[ord(_char.lower())] = _value
+
+# Code points imprimíveis na faixa ASCII; acima de U+00A0 tudo conta como imprimível
+_PRINTABLE_ASCII = np.zeros(0xa0, dtype=bool)
+_PRINTABLE_ASCII[0x20:0x7f] = True
+_PRINTABLE_ASCII[[0x09, 0x0a, 0x0d]] = True
+
+
+def tokenize(text: str) -> Dict[str, Any]:
+    """
+    Tokeniza o texto numa passada da regex. Retorna, por token, se é romano,
+    o tamanho e se há separação de palavra antes dele; por caractere de
+    token, o code point e o token a que pertence; e a matriz de dígitos
+    (tokens x MAX_DIGITS, alinhada à direita) dos tokens numéricos.
+    """
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    spans = np.array([match.span() for match in TOKEN_PATTERN.finditer(text)], dtype=np.int64).reshape(-1, 2)
+    starts, ends = spans[:, 0], spans[:, 1]
+    lengths = ends - starts
+    rows = np.repeat(np.arange(starts.size), lengths)
+    offsets = np.arange(rows.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    chars = codes[starts[rows] + offsets]
+    roman = codes[starts] > ord('9')
+
+    # Separadores de palavra entre tokens: contagem acumulada dos caracteres
+    # que separam, comparada no fim de um token e no início do seguinte
+    whitespace = np.isin(codes, [ord(c) for c in ' \t\r\n'])
+    marks = np.isin(codes, [ord(c) for c in WORD_SEPARATORS])
+    marks[:-1] |= whitespace[:-1] & whitespace[1:]
+    if (codes == ord('-')).any():
+        marks |= whitespace
+    counts = np.concatenate(([0], np.cumsum(marks)))
+    breaks = np.zeros(starts.size, dtype=bool)
+    breaks[1:] = counts[starts[1:]] > counts[ends[:-1]]
+
+    numeric = ~roman & (lengths <= MAX_DIGITS)
+    keep = numeric[rows]
+    digits = np.zeros((starts.size, MAX_DIGITS), dtype=np.int64)
+    digits[rows[keep], (MAX_DIGITS - lengths[rows] + offsets)[keep]] = chars[keep] - ord('0')
+    return {'roman': roman, 'lengths': lengths, 'breaks': breaks, 'rows': rows, 'chars': chars,
+            'numeric': numeric, 'digits': digits}
+
+
+def parse_radix(tokens: Dict[str, Any], base: int) -> np.ndarray:
+    """Valor de cada token numérico na base dada; tokens inválidos (ou romanos) viram -1"""
+    digits = tokens['digits']
+    valid = tokens['numeric'] & (digits < base).all(axis=1)
+    powers = base ** np.arange(MAX_DIGITS - 1, -1, -1, dtype=np.int64)
+    return np.where(valid, digits @ powers, -1)
+
+
+def parse_roman(tokens: Dict[str, Any]) -> np.ndarray:
+    """Valor de cada token romano (um símbolo menor antes de um maior é subtraído); os demais viram -1"""
+    rows, roman = tokens['rows'], tokens['roman']
+    values = np.where(roman[rows], _ROMAN_VALUES[np.minimum(tokens['chars'], 127)], 0)
+    # Valor do símbolo seguinte dentro do mesmo token (0 no último)
+    following = np.zeros_like(values)
+    same = rows[1:] == rows[:-1]
+    following[:-1][same] = values[1:][same]
+    signed = np.where(values < following, -values, values)
+    totals = np.bincount(rows, weights=signed, minlength=roman.size).astype(np.int64)
+    return np.where(roman & (totals > 0), totals, -1)
+
+
+def t9_codes(tokens: Dict[str, Any]) -> np.ndarray:
+    """Code point de cada token T9 (um dígito repetido até 4 vezes); os demais viram INVALID"""
+    rows, chars, lengths = tokens['rows'], tokens['chars'], tokens['lengths']
+    first = chars[np.cumsum(lengths) - lengths] if chars.size else np.zeros(0, dtype=np.int64)
+    mismatches = np.bincount(rows, weights=chars != first[rows], minlength=lengths.size)
+    valid = ~tokens['roman'] & (lengths <= 4) & (mismatches == 0)
+    keys = T9_KEYS[np.clip(first - ord('0'), 0, 9), np.clip(lengths - 1, 0, 3)]
+    return np.where(valid, keys, INVALID).astype(np.uint32)
+
+
+def _characters(values: np.ndarray, mapping: str) -> np.ndarray:
+    """Valores -> code points (INVALID onde o valor não representa um caractere)"""
+    if mapping == 'letters':
+        valid = (values >= 1) & (values <= 26)
+        return np.where(valid, values + ord('A') - 1, INVALID).astype(np.uint32)
+    valid = (values >= 0) & (values <= 0x10ffff) & ((values < 0xd800) | (values > 0xdfff))
+    return np.where(valid, values, INVALID).astype(np.uint32)
+
+
+def _render(codes: np.ndarray, breaks: np.ndarray, mapping: str) -> str:
+    """Code points -> texto; nos esquemas de letras, as separações de palavra viram espaços"""
+    if mapping == 'letters' and breaks.any():
+        codes = np.insert(codes, np.flatnonzero(breaks), ord(' '))
+    return codes.astype(np.uint32).tobytes().decode('utf-32-le')
+
+
+def scheme_codes(tokens: Dict[str, Any], scheme: str) -> np.ndarray:
+    """Code points dos tokens num esquema (um por token; INVALID onde o token não serve)"""
+    reader, mapping = SCHEMES[scheme]
+    if reader == 't9':
+        return t9_codes(tokens)
+    if reader == 'roman':
+        values = parse_roman(tokens)
+    else:
+        values = parse_radix(tokens, 10 if reader == 'decimal' else 8)
+    return _characters(values, mapping)
+
+
+def decode(text: str, scheme: str = 'decimal') -> str:
+    """Decodifica os tokens num esquema; ValueError se algum token não servir"""
+    if scheme not in SCHEMES:
+        raise ValueError(f"Esquema numérico desconhecido: {scheme}")
+    tokens = tokenize(text)
+    codes = scheme_codes(tokens, scheme)
+    if not codes.size or (codes == INVALID).any():
+        raise ValueError(f"Tokens inválidos para o esquema {scheme}")
+    return _render(codes, tokens['breaks'], SCHEMES[scheme][1])
+
+
+def scan(text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Avalia todos os esquemas de uma vez e retorna os `top_k` melhores, cada um
+    com o esquema, o texto, a fração de tokens válidos e a nota.
+    """
+    tokens = tokenize(text)
+    if not tokens['roman'].size:
+        return []
+    candidates = []
+    for scheme, (_, mapping) in SCHEMES.items():
+        codes = scheme_codes(tokens, scheme)
+        valid = codes != INVALID
+        if not valid.any():
+            continue
+        printable = np.where(codes < 0xa0, _PRINTABLE_ASCII[np.minimum(codes, 0x9f)], True)
+        fraction = float((valid & printable).mean())
+        sample = _render(codes[:SAMPLE_SIZE], tokens['breaks'][:SAMPLE_SIZE], mapping)
+        score = 0.5 * fraction + 0.5 * language_model.text_quality(sample)
+        candidates.append({'scheme': scheme, 'valid': round(float(valid.mean()), 4),
+                           'score': score, 'codes': codes, 'mapping': mapping})
+
+    candidates.sort(key=lambda candidate: -candidate['score'])
+    results = []
+    for candidate in candidates[:top_k]:
+        candidate['text'] = _render(candidate.pop('codes'), tokens['breaks'], candidate.pop('mapping'))
+        candidate['score'] = round(candidate['score'], 4)
+        results.append(candidate)
+    return results
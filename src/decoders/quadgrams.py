@@ -0,0 +1,284 @@
+"""
+Modelo de quadrigramas (português e inglês) para ranquear textos candidatos
+
+O modelo é uma matriz float32 (idiomas x 26^4) com o log da probabilidade de
+cada sequência de 4 letras, indexada pelo código empacotado
+a*26^3 + b*26^2 + c*26 + d. Ele é montado a partir das contagens de
+n-gramas distribuídas em resources/quadgram_counts.npz (unigramas a
+trigramas completos, quadrigramas vistos ao menos MIN_COUNT vezes), com
+cada ordem interpolada com a anterior para que quadrigramas raros não
+sejam impossíveis.
+
+As contagens vêm de corpora reais de alguns MB por idioma: para o
+português, as traduções pt/pt_BR dos catálogos gettext do sistema; para o
+inglês, os textos originais desses catálogos, licenças, páginas de manual,
+a documentação do Python e a Óptica de Newton.
+
+A matriz montada fica num cache (resources/language_models, fora do git)
+carregado com memory-mapping, então vários processos compartilham as
+mesmas páginas. O cabeçalho do cache guarda um hash das contagens e dos
+parâmetros do modelo; se algum mudar, o cache é refeito.
+
+Para regenerar as contagens a partir de corpora próprios:
+    python -m src.decoders.quadgrams corpus_pt.txt corpus_en.txt
+"""
+
+import hashlib
+import os
+import sys
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from src.config import RESOURCES_DIR
+
+from . import language_model
+
+COUNTS_PATH = RESOURCES_DIR / "quadgram_counts.npz"
+MODEL_PATH = RESOURCES_DIR / "language_models" / "quadgrams.bin"
+N_QUADGRAMS = 26 ** 4
+
+# Versão da montagem do modelo: mudar build_model exige incrementar
+MODEL_VERSION = 2
+
+# Cabeçalho do cache: assinatura, hash (contagens + parâmetros) e preenchimento
+CACHE_MAGIC = b'QGRAMS'
+HEADER_SIZE = 64
+
+# Quadrigramas vistos menos vezes que isso não são distribuídos (ficam com
+# a estimativa dos trigramas)
+MIN_COUNT = 2
+
+# Quanto um contexto precisa ser visto para suas contagens valerem mais
+# que a ordem anterior na interpolação
+SMOOTHING = 2.0
+
+
+def _letters(text: str) -> np.ndarray:
+    """Índices 0-25 das letras do texto, com os acentos removidos"""
+    plain = unicodedata.normalize('NFKD', text)
+    return language_model.letter_indices(plain)
+
+
+def pack(indices: np.ndarray) -> np.ndarray:
+    """Códigos dos quadrigramas de uma sequência (ou linhas de uma matriz) de índices 0-25"""
+    indices = np.asarray(indices, dtype=np.int32)
+    a, b, c, d = (indices[..., i:indices.shape[-1] - 3 + i] for i in range(4))
+    return ((a * 26 + b) * 26 + c) * 26 + d
+
+
+def _ngram_counts(indices: np.ndarray, order: int) -> np.ndarray:
+    """Contagens dos n-gramas de uma sequência, como vetor de 26**order posições"""
+    codes = np.zeros(max(indices.size - order + 1, 0), dtype=np.int64)
+    for offset in range(order):
+        codes = codes * 26 + indices[offset:indices.size - order + 1 + offset]
+    return np.bincount(codes, minlength=26 ** order)
+
+
+def build_counts(corpora: Dict[str, str]) -> Dict[str, np.ndarray]:
+    """
+    Contagens de um texto por idioma: unigramas a trigramas completos e os
+    quadrigramas vistos ao menos MIN_COUNT vezes (códigos e contagens).
+    """
+    counts = {}
+    for language in language_model.LANGUAGES:
+        indices = _letters(corpora[language]).astype(np.int64)
+        for order in (1, 2, 3):
+            counts[f"{language}_{order}"] = _ngram_counts(indices, order).astype(np.uint32)
+        quads = _ngram_counts(indices, 4)
+        kept = np.flatnonzero(quads >= MIN_COUNT)
+        counts[f"{language}_4_codes"] = kept.astype(np.uint32)
+        counts[f"{language}_4"] = quads[kept].astype(np.uint32)
+    return counts
+
+
+def save_counts(counts: Dict[str, np.ndarray], path: Path = COUNTS_PATH) -> None:
+    np.savez_compressed(path, **counts)
+
+
+def load_counts(path: Path = COUNTS_PATH) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _interpolate(counts: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """
+    P(letra | contexto) interpolada com a ordem anterior (estilo Witten-Bell):
+    contextos vistos muitas vezes confiam nas contagens, os raros na ordem anterior.
+    """
+    seen = counts.sum(axis=-1, keepdims=True)
+    weight = seen / (seen + SMOOTHING)
+    observed = counts / np.maximum(seen, 1)
+    return weight * observed + (1 - weight) * lower
+
+
+def build_model(counts: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Monta a matriz (idiomas x 26^4) de log-probabilidades a partir das
+    contagens. Cada ordem (bigrama, trigrama, quadrigrama) é interpolada com
+    a anterior; os quadrigramas podados caem na estimativa dos trigramas.
+    """
+    model = np.empty((len(language_model.LANGUAGES), N_QUADGRAMS), dtype=np.float32)
+    for row, language in enumerate(language_model.LANGUAGES):
+        unigram = (counts[f"{language}_1"] + 1.0) / (counts[f"{language}_1"].sum() + 26)
+        bigram = _interpolate(counts[f"{language}_2"].reshape(26, 26).astype(np.float64), unigram[None, :])
+        trigram = _interpolate(counts[f"{language}_3"].reshape(26, 26, 26).astype(np.float64),
+                               bigram[None, :, :])
+        quads = np.zeros(N_QUADGRAMS)
+        quads[counts[f"{language}_4_codes"]] = counts[f"{language}_4"]
+        quadgram = _interpolate(quads.reshape(26, 26, 26, 26), trigram[None, :, :, :])
+        joint = (unigram[:, None, None, None] * bigram[:, :, None, None] *
+                 trigram[:, :, :, None] * quadgram)
+        model[row] = np.log(joint).ravel()
+    return model
+
+
+def model_key(counts_path: Path = COUNTS_PATH) -> bytes:
+    """Hash das contagens e dos parâmetros que mudam o modelo montado"""
+    digest = hashlib.blake2b(counts_path.read_bytes(), digest_size=16)
+    digest.update(repr((MODEL_VERSION, MIN_COUNT, SMOOTHING, language_model.LANGUAGES)).encode())
+    return digest.digest()
+
+
+def _cached_key(path: Path) -> bytes:
+    """Hash gravado no cabeçalho do cache (vazio se não houver cache válido)"""
+    try:
+        with open(path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+    except OSError:
+        return b''
+    expected = HEADER_SIZE + len(language_model.LANGUAGES) * N_QUADGRAMS * 4
+    if not header.startswith(CACHE_MAGIC) or path.stat().st_size != expected:
+        return b''
+    return header[len(CACHE_MAGIC):len(CACHE_MAGIC) + 16]
+
+
+def save_model(model: np.ndarray, key: bytes, path: Path = MODEL_PATH) -> None:
+    """Grava o cache (cabeçalho + matriz float32) num arquivo temporário e troca de uma vez"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporary, 'wb') as file:
+        file.write((CACHE_MAGIC + key).ljust(HEADER_SIZE, b'\0'))
+        file.write(np.ascontiguousarray(model, dtype=np.float32).tobytes())
+    os.replace(temporary, path)
+
+
+@lru_cache(maxsize=None)
+def get_model(path: Path = MODEL_PATH, counts_path: Path = COUNTS_PATH) -> np.ndarray:
+    """
+    Carrega o modelo com memory-mapping, uma vez por processo. Se o cache
+    não existir ou tiver sido montado de outras contagens ou parâmetros,
+    monta de novo e tenta salvá-lo.
+    """
+    key = model_key(counts_path)
+    if _cached_key(path) != key:
+        model = build_model(load_counts(counts_path))
+        try:
+            save_model(model, key, path)
+        except OSError:
+            return model
+    return np.memmap(path, dtype=np.float32, mode='r', offset=HEADER_SIZE,
+                     shape=(len(language_model.LANGUAGES), N_QUADGRAMS))
+
+
+def score_rows(rows: np.ndarray) -> np.ndarray:
+    """
+    Log-probabilidade média por quadrigrama de cada linha de uma matriz
+    (k x n) de índices 0-25, para cada idioma: resultado (k x idiomas).
+    """
+    rows = np.atleast_2d(rows)
+    if rows.shape[1] < 4:
+        return np.full((rows.shape[0], len(language_model.LANGUAGES)), -np.inf)
+    codes = pack(rows)
+    model = get_model()
+    return np.stack([model[lang][codes].mean(axis=1) for lang in range(model.shape[0])], axis=1)
+
+
+def score_masked_rows(rows: np.ndarray) -> np.ndarray:
+    """
+    Como score_rows, mas as posições com índice negativo (o que não é
+    letra) são aceitas: os quadrigramas que as contêm não contam.
+    """
+    rows = np.atleast_2d(rows)
+    model = get_model()
+    if rows.shape[1] < 4:
+        return np.full((rows.shape[0], model.shape[0]), -np.inf)
+    valid = rows >= 0
+    quad_valid = valid[:, :-3] & valid[:, 1:-2] & valid[:, 2:-1] & valid[:, 3:]
+    codes = pack(np.maximum(rows, 0))
+    counts = np.maximum(quad_valid.sum(axis=1), 1)
+    scores = np.stack([np.where(quad_valid, model[lang][codes], 0).sum(axis=1) / counts
+                       for lang in range(model.shape[0])], axis=1)
+    scores[~quad_valid.any(axis=1)] = -np.inf
+    return scores
+
+
+def score_batch(texts: Sequence[str]) -> np.ndarray:
+    """
+    Pontua muitos textos de tamanhos diferentes numa única chamada.
+
+    As letras de todos os textos são concatenadas; os quadrigramas que
+    atravessam a fronteira entre dois textos são descartados e as somas
+    por texto saem de um bincount. Resultado: (textos x idiomas), com -inf
+    para textos com menos de 4 letras.
+    """
+    model = get_model()
+    n_langs = model.shape[0]
+    if not texts:
+        return np.zeros((0, n_langs))
+    pieces = [_letters(text) for text in texts]
+    lengths = np.array([piece.size for piece in pieces])
+    counts = np.maximum(lengths - 3, 0)
+    scores = np.full((len(texts), n_langs), -np.inf)
+    if not counts.any():
+        return scores
+
+    indices = np.concatenate(pieces)
+    codes = pack(indices)
+    # Posição inicial de cada texto; um quadrigrama vale se cabe inteiro no texto
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    owner = np.repeat(np.arange(len(texts)), lengths)[:codes.size]
+    valid = np.arange(codes.size) + 3 < (starts + lengths)[owner]
+    owner, codes = owner[valid], codes[valid]
+
+    has_quads = counts > 0
+    for lang in range(n_langs):
+        totals = np.bincount(owner, weights=model[lang][codes], minlength=len(texts))
+        scores[has_quads, lang] = totals[has_quads] / counts[has_quads]
+    return scores
+
+
+def score(text: str) -> Dict[str, Any]:
+    """Nota do melhor idioma para um único texto: {'score', 'language'}"""
+    best = language_model.best_language(score_batch([text]))
+    return {'score': float(best['score'][0]), 'language': str(best['language'][0])}
+
+
+def rank(candidates: List[Dict[str, Any]], key: str = 'text') -> List[Dict[str, Any]]:
+    """
+    Ordena candidatos (dicionários com o texto em `key`) do mais provável
+    para o menos provável, gravando 'quadgram' e 'language' em cada um.
+    """
+    best = language_model.best_language(score_batch([candidate[key] for candidate in candidates]))
+    for candidate, value, language in zip(candidates, best['score'], best['language']):
+        candidate['quadgram'] = float(value)
+        candidate['language'] = str(language)
+    return sorted(candidates, key=lambda candidate: -candidate['quadgram'])
+
+
+def main(paths: List[str]) -> None:
+    """Regenera as contagens a partir de um corpus por idioma (na ordem de LANGUAGES)"""
+    if len(paths) != len(language_model.LANGUAGES):
+        raise SystemExit(f"Uso: python -m src.decoders.quadgrams {' '.join(f'corpus_{lang}.txt' for lang in language_model.LANGUAGES)}")
+    corpora = {language: Path(path).read_text(encoding='utf-8')
+               for language, path in zip(language_model.LANGUAGES, paths)}
+    save_counts(build_counts(corpora))
+    get_model.cache_clear()
+    print(f"Contagens salvas em {COUNTS_PATH}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,196 @@
+"""
+Esteganografia em caracteres invisíveis de textos colados
+
+Dois canais:
+- largura zero: U+200B, U+200C, U+200D e U+FEFF espalhados pelo texto;
+- espaços e tabs no fim das linhas (como no SNOW).
+
+Os caracteres escondidos de cada canal são extraídos por regex e viram
+dígitos numa passada de str.translate. Todas as convenções comuns
+(polaridade dos bits, um caractere como separador de bytes, 2 bits por
+caractere, grupos de espaços do SNOW) são montadas sobre esses dígitos e
+decodificadas pelo bitstream (larguras 8/7/5 e todos os deslocamentos).
+Uma leitura enquadrada (separadores delimitando caracteres de largura
+fixa, ou bytes alinhados num total de bits múltiplo de 8) ganha
+FRAMED_BONUS: em canais curtos, leituras de 5 ou 7 bits desalinhadas
+parecem texto com frequência.
+
+A checagem de entrada é só um isascii() e um count() por caractere, então
+pode rodar em todo texto: a detecção de formatos usa `analyze` para
+sinalizar textos com invisíveis suspeitos.
+"""
+
+import itertools
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from . import bitstream
+from . import language_model
+
+ZERO_WIDTH = '\u200b\u200c\u200d\ufeff'
+
+# Caractere invisível -> dígito (posição em ZERO_WIDTH)
+ZERO_WIDTH_DIGITS = str.maketrans({char: str(index) for index, char in enumerate(ZERO_WIDTH)})
+
+# Polaridades do canal de fim de linha
+TRAILING_CONVENTIONS = {
+    'espaço=0 tab=1': str.maketrans(' \t', '01'),
+    'espaço=1 tab=0': str.maketrans(' \t', '10')
+}
+
+# Dois bits por caractere quando os quatro invisíveis aparecem
+QUATERNARY_BITS = str.maketrans({str(digit): f"{digit:02b}" for digit in range(4)})
+
+_ZERO_WIDTH_PATTERN = re.compile(f'[{ZERO_WIDTH}]+')
+_TRAILING_PATTERN = re.compile(r'[ \t]+(?=\r?$)', re.MULTILINE)
+
+# Caracteres escondidos mínimos (um byte) para o texto ser suspeito
+MIN_HIDDEN = 8
+
+# Bits de cada grupo do SNOW (0 a 7 espaços antes de cada tab)
+SNOW_BITS = 3
+
+# Bits máximos de um grupo entre separadores (o maior code point tem 21)
+MAX_GROUP_BITS = 21
+
+# Bônus na nota das leituras enquadradas
+FRAMED_BONUS = 0.15
+
+
+def _zero_width_count(text: str) -> int:
+    if text.isascii():
+        return 0
+    return sum(text.count(char) for char in ZERO_WIDTH)
+
+
+def _trailing(text: str) -> str:
+    """Espaços e tabs do fim das linhas, na ordem (só procura se houver tabs)"""
+    if '\t' not in text:
+        return ''
+    return ''.join(_TRAILING_PATTERN.findall(text))
+
+
+def analyze(text: str) -> Dict[str, Any]:
+    """
+    Conta os caracteres invisíveis de cada canal e a densidade no texto.
+    Um BOM (U+FEFF) no início é normal; espaços no fim das linhas só são
+    suspeitos misturados com tabs.
+    """
+    zero_width = _zero_width_count(text)
+    trailing = _trailing(text)
+    hidden = zero_width - text.startswith('\ufeff')
+    suspicious = hidden >= MIN_HIDDEN or (len(trailing) >= MIN_HIDDEN and ' ' in trailing)
+    return {
+        'zero_width': zero_width,
+        'trailing': len(trailing),
+        'density': round((zero_width + len(trailing)) / len(text), 4) if text else 0.0,
+        'suspicious': suspicious
+    }
+
+
+def _label(digit: str) -> str:
+    return f"{ord(ZERO_WIDTH[int(digit)]):04x}"
+
+
+def zero_width_conventions(digits: str) -> Iterator[Tuple[str, str]]:
+    """
+    Convenções dos dígitos de largura zero -> (nome, bits '0'/'1'). Com dois
+    símbolos, as duas polaridades; com três, cada um como separador (vira
+    espaço nos bits); com quatro, 2 bits por caractere.
+    """
+    symbols = sorted(set(digits))
+    if len(symbols) == 4:
+        yield 'quaternário', digits.translate(QUATERNARY_BITS)
+    separators = symbols if len(symbols) == 3 else [None]
+    for separator in separators:
+        pair = [symbol for symbol in symbols if symbol != separator]
+        if len(pair) != 2:
+            continue
+        for zero, one in itertools.permutations(pair):
+            name = f"{_label(zero)}=0 {_label(one)}=1"
+            table = {zero: '0', one: '1'}
+            if separator:
+                name += f" sep {_label(separator)}"
+                table[separator] = ' '
+            yield name, digits.translate(str.maketrans(table))
+
+
+def snow_bits(trailing: str) -> str:
+    """SNOW: cada tab fecha um grupo de 0 a 7 espaços, que vale 3 bits (vazio se algum grupo passar de 7)"""
+    groups = trailing.split('\t')[:-1]
+    if any(len(group) >= 1 << SNOW_BITS for group in groups):
+        return ''
+    return ''.join(f"{len(group):03b}" for group in groups)
+
+
+def _grouped(bits: str) -> Optional[Dict[str, Any]]:
+    """Grupos entre separadores lidos como números de tamanho variável, um caractere por grupo"""
+    groups = bits.split()
+    if not groups or max(len(group) for group in groups) > MAX_GROUP_BITS:
+        return None
+    codes = np.array([int(group, 2) for group in groups], dtype=np.int64)
+    if (codes > 0x10ffff).any() or ((codes >= 0xd800) & (codes <= 0xdfff)).any():
+        return None
+    text = ''.join(map(chr, codes.tolist()))
+    printable = float(np.where(codes < 0x100, bitstream.PRINTABLE[np.minimum(codes, 0xff)], True).mean())
+    score = 0.5 * printable + 0.5 * language_model.text_quality(text[:bitstream.SAMPLE_SIZE])
+    return {'width': None, 'offset': 0, 'score': round(score, 4), 'text': text}
+
+
+def _framed(reading: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not reading:
+        return []
+    reading['score'] = round(reading['score'] + FRAMED_BONUS, 4)
+    return [reading]
+
+
+def _candidates(channel: str, name: str, bits: str, top_k: int) -> List[Dict[str, Any]]:
+    """
+    Com separadores, os grupos entre eles são os caracteres: de largura
+    fixa (uma leitura enquadrada) ou de tamanho variável (leitura por
+    grupos). Sem separadores, todas as larguras e deslocamentos do
+    bitstream, com os bytes alinhados enquadrados se o total for múltiplo de 8.
+    """
+    groups = bits.split()
+    if len(groups) > 1:
+        sizes = {len(group) for group in groups}
+        width = sizes.pop() if len(sizes) == 1 else None
+        if width in bitstream.WIDTHS:
+            candidates = _framed(bitstream.read(''.join(groups), width))
+        else:
+            grouped = _grouped(bits)
+            candidates = [grouped] if grouped else []
+    else:
+        bits = ''.join(groups)
+        candidates = bitstream.scan(bits, top_k)
+        if bits and len(bits) % 8 == 0:
+            candidates = [candidate for candidate in candidates
+                          if (candidate['width'], candidate['offset']) != (8, 0)]
+            candidates += _framed(bitstream.read(bits, 8))
+    for candidate in candidates:
+        candidate.update(channel=channel, scheme=name)
+    return candidates
+
+
+def scan(text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Extrai os dois canais e decodifica todas as convenções de uma vez;
+    retorna os `top_k` melhores candidatos, cada um com o canal, a
+    convenção, a largura e o deslocamento dos bits, o texto e a nota.
+    """
+    results = []
+    if _zero_width_count(text):
+        digits = ''.join(_ZERO_WIDTH_PATTERN.findall(text)).translate(ZERO_WIDTH_DIGITS)
+        for name, bits in zero_width_conventions(digits):
+            results.extend(_candidates('zero_width', name, bits, top_k))
+    trailing = _trailing(text)
+    if trailing:
+        for name, table in TRAILING_CONVENTIONS.items():
+            results.extend(_candidates('trailing', name, trailing.translate(table), top_k))
+        snow = snow_bits(trailing)
+        if snow:
+            results.extend(_candidates('trailing', 'snow', snow, top_k))
+    results.sort(key=lambda candidate: -candidate['score'])
+    return results[:top_k]
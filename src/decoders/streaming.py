@@ -0,0 +1,116 @@
+"""
+Decodificação em fluxo (streaming) de Base64, hexadecimal e binário
+
+Os geradores recebem um iterável de pedaços de texto ou um arquivo aberto
+e produzem os bytes decodificados aos poucos. Os caracteres que sobram no
+fim de cada pedaço (um quantum incompleto) são carregados para o próximo,
+então a memória usada depende só do tamanho do pedaço, não da entrada.
+"""
+
+import base64
+import re
+from typing import IO, Iterable, Iterator, Union
+
+import numpy as np
+
+CHUNK_SIZE = 64 * 1024
+
+Source = Union[Iterable[Union[str, bytes]], IO]
+
+_WHITESPACE = re.compile(r'\s+')
+_NOT_BASE64 = re.compile(r'[^A-Za-z0-9+/=_-]+')
+
+
+def iter_chunks(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Normaliza a entrada (iterável de pedaços ou arquivo) em pedaços de texto"""
+    if hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = source
+    for chunk in chunks:
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = str(chunk, 'latin-1')
+        if chunk:
+            yield chunk
+
+
+def stream_base64(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Decodifica Base64 (padrão ou url-safe) em fluxo, em blocos de 4 caracteres"""
+    carry = ''
+    for chunk in iter_chunks(source, chunk_size):
+        # Como o b64decode, ignora o que não pertence ao alfabeto
+        data = carry + _NOT_BASE64.sub('', chunk)
+        cut = len(data) - len(data) % 4
+        carry = data[cut:]
+        if cut:
+            yield _b64decode(data[:cut])
+
+    if carry:
+        if len(carry.rstrip('=')) % 4 == 1:
+            raise ValueError("Base64 truncado: sobrou 1 caractere no final")
+        yield _b64decode(carry + '=' * (-len(carry) % 4))
+
+
+def _b64decode(data: str) -> bytes:
+    """Decodifica um bloco aceitando os alfabetos padrão e url-safe"""
+    return base64.b64decode(data, altchars=b'-_')
+
+
+def stream_hex(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Decodifica hexadecimal em fluxo, ignorando espaços e prefixos 0x"""
+    carry = ''
+    for chunk in iter_chunks(source, chunk_size):
+        data = (carry + _WHITESPACE.sub('', chunk)).replace('0x', '').replace('0X', '')
+        # Um '0' no final pode ser o início de um '0x' no próximo pedaço
+        usable = len(data) - 1 if data.endswith('0') else len(data)
+        cut = usable - usable % 2
+        carry = data[cut:]
+        if cut:
+            yield bytes.fromhex(data[:cut])
+
+    if carry:
+        if len(carry) % 2:
+            raise ValueError("Texto hexadecimal com número ímpar de dígitos")
+        yield bytes.fromhex(carry)
+
+
+def stream_binary(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Decodifica texto binário ('0'/'1') em fluxo, 8 bits por byte"""
+    carry = ''
+    for chunk in iter_chunks(source, chunk_size):
+        data = carry + _WHITESPACE.sub('', chunk)
+        cut = len(data) - len(data) % 8
+        carry = data[cut:]
+        if cut:
+            yield _pack_bits(data[:cut])
+
+    if carry:
+        _pack_bits(carry)  # valida os caracteres antes de reclamar do tamanho
+        raise ValueError("Comprimento do texto binário deve ser múltiplo de 8")
+
+
+def _pack_bits(data: str) -> bytes:
+    """Empacota uma string de '0'/'1' em bytes com np.packbits"""
+    bits = np.frombuffer(data.encode('utf-8'), dtype=np.uint8) - ord('0')
+    if bits.size and bits.max() > 1:
+        raise ValueError("Texto contém caracteres não binários")
+    return np.packbits(bits).tobytes()
+
+
+STREAM_DECODERS = {
+    'base64': stream_base64,
+    'hex': stream_hex,
+    'binary': stream_binary
+}
+
+
+def stream_decode(source: Source, encoding: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Escolhe o decodificador em fluxo pelo nome do formato (os demais Base-N ficam em base_n)"""
+    if encoding in STREAM_DECODERS:
+        return STREAM_DECODERS[encoding](source, chunk_size)
+    from . import base_n
+    try:
+        name = base_n.codec_name(encoding)
+    except ValueError:
+        raise ValueError(f"Formato sem suporte a fluxo: {encoding}") from None
+    return base_n.stream_decode(source, name, chunk_size)
@@ -0,0 +1,168 @@
+"""
+Quebra de substituição monoalfabética por subida de encosta (hill climbing)
+
+A chave é uma permutação NumPy de 26 posições: key[letra cifrada] = letra
+clara. O texto é pontuado pelo modelo de quadrigramas, e cada troca de duas
+letras da chave só recalcula os quadrigramas que contêm uma delas. Vários
+reinícios aleatórios evitam máximos locais; eles podem rodar em paralelo,
+em processos separados que compartilham o modelo por memory-mapping. As
+melhores chaves dos reinícios ainda passam por uma busca local iterada
+(algumas trocas aleatórias e nova subida), que escapa de máximos em que
+várias letras estão trocadas em ciclo.
+"""
+
+import string
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from . import language_model
+from . import quadgrams
+
+# Pesos para empacotar 4 letras num código de quadrigrama
+_PACK = np.array([26 ** 3, 26 ** 2, 26, 1])
+
+# Trocas testadas numa varredura (todas as 325 combinações de duas letras)
+_PAIRS = [(a, b) for a in range(26) for b in range(a + 1, 26)]
+
+# Busca local iterada: quantas das melhores chaves distintas são refinadas,
+# quantas perturbações cada uma recebe e quantas trocas por perturbação
+POLISH_RUNS = 4
+POLISH_ROUNDS = 15
+POLISH_SWAPS = 3
+
+
+def apply_key(text: str, key: str) -> str:
+    """Decifra com uma chave de 26 letras (key[i] = letra clara da i-ésima letra cifrada)"""
+    table = str.maketrans(string.ascii_uppercase, key.upper())
+    return text.upper().translate(table)
+
+
+def frequency_key(indices: np.ndarray, lang: int) -> np.ndarray:
+    """Chave inicial: a letra cifrada mais comum vira a letra clara mais comum, e assim por diante"""
+    cipher_order = np.argsort(-np.bincount(indices, minlength=26), kind='stable')
+    plain_order = np.argsort(-language_model.LETTER_PROBS[lang], kind='stable')
+    key = np.empty(26, dtype=np.int64)
+    key[cipher_order] = plain_order
+    return key
+
+
+def climb(indices: np.ndarray, key: np.ndarray, lang: int, max_steps: int = 1000):
+    """
+    Sobe a encosta a partir de `key`, sempre pela melhor troca, até nenhuma
+    troca melhorar a nota. Retorna (chave, soma dos log-probs).
+
+    Cada troca só afeta os quadrigramas que contêm uma das duas letras; esses
+    trechos de todas as 325 trocas ficam num único vetor, e o ganho de cada
+    troca sai de um bincount sobre ele, sem pontuar o texto inteiro de novo.
+    """
+    model = quadgrams.get_model()[lang]
+    quads = np.lib.stride_tricks.sliding_window_view(indices, 4)
+
+    # Quadrigramas afetados por cada troca (os que contêm uma das duas letras)
+    contains = [(quads == letter).any(axis=1) for letter in range(26)]
+    rows_per_pair = [np.flatnonzero(contains[a] | contains[b]) for a, b in _PAIRS]
+    rows = np.concatenate(rows_per_pair)
+    pair_of_row = np.repeat(np.arange(len(_PAIRS)), [r.size for r in rows_per_pair])
+    letters = quads[rows]
+    first = np.array([a for a, _ in _PAIRS])[pair_of_row][:, None]
+    second = np.array([b for _, b in _PAIRS])[pair_of_row][:, None]
+    is_first = letters == first
+    is_second = letters == second
+
+    key = key.copy()
+    scores = model[key[quads] @ _PACK].astype(np.float64)
+    for _ in range(max_steps):
+        # Letras claras de cada trecho com a troca aplicada
+        plain = key[letters]
+        plain = np.where(is_first, key[second], plain)
+        plain = np.where(is_second, key[first], plain)
+        new = model[plain @ _PACK]
+        gains = (np.bincount(pair_of_row, weights=new, minlength=len(_PAIRS)) -
+                 np.bincount(pair_of_row, weights=scores[rows], minlength=len(_PAIRS)))
+        best = int(gains.argmax())
+        if gains[best] <= 1e-9:
+            break
+        a, b = _PAIRS[best]
+        key[a], key[b] = key[b], key[a]
+        changed = rows_per_pair[best]
+        scores[changed] = model[key[quads[changed]] @ _PACK]
+    return key, float(scores.sum())
+
+
+def _restart(args) -> Dict[str, Any]:
+    """Um reinício: chave inicial (por frequência ou aleatória) + subida de encosta"""
+    indices, lang, seed = args
+    if seed == 0:
+        start = frequency_key(indices, lang)
+    else:
+        start = np.random.default_rng(seed).permutation(26)
+    key, total = climb(indices, start, lang)
+    return {'key': key, 'total': total, 'lang': lang}
+
+
+def _polish(args) -> Dict[str, Any]:
+    """Busca local iterada: perturba a chave com trocas aleatórias, sobe de novo e fica com a melhor"""
+    indices, run, seed = args
+    rng = np.random.default_rng(seed)
+    key, total = run['key'], run['total']
+    for _ in range(POLISH_ROUNDS):
+        trial = key.copy()
+        for _ in range(POLISH_SWAPS):
+            a, b = rng.choice(26, 2, replace=False)
+            trial[a], trial[b] = trial[b], trial[a]
+        trial, trial_total = climb(indices, trial, run['lang'])
+        if trial_total > total:
+            key, total = trial, trial_total
+    return {'key': key, 'total': total, 'lang': run['lang']}
+
+
+def solve(text: str, restarts: int = 40, top_k: int = 3,
+          workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Recupera a chave de uma substituição simples sem conhecê-la.
+
+    Os reinícios alternam entre português e inglês; o primeiro de cada
+    idioma parte da chave por frequência. As POLISH_RUNS melhores chaves
+    distintas são refinadas pela busca local iterada. Com `workers` > 1 as
+    subidas rodam em processos paralelos. Retorna as `top_k` melhores
+    chaves distintas.
+    """
+    indices = language_model.letter_indices(text).astype(np.int64)
+    if indices.size < 4:
+        return []
+
+    n_langs = len(language_model.LANGUAGES)
+    jobs = [(indices, run % n_langs, run // n_langs) for run in range(max(restarts, n_langs))]
+    pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        run_map = pool.map if pool else map
+        runs = sorted(run_map(_restart, jobs), key=lambda run: -run['total'])
+        distinct = {}
+        for run in runs:
+            distinct.setdefault((run['key'].tobytes(), run['lang']), run)
+        best = list(distinct.values())[:POLISH_RUNS]
+        runs = list(run_map(_polish, [(indices, run, seed) for seed, run in enumerate(best)])) + runs
+    finally:
+        if pool:
+            pool.shutdown()
+
+    runs.sort(key=lambda run: -run['total'])
+    results = []
+    seen = set()
+    upper = text.upper()
+    for run in runs:
+        key = ''.join(chr(ord('A') + int(letter)) for letter in run['key'])
+        if key in seen:
+            continue
+        seen.add(key)
+        results.append({
+            'key': key,
+            'text': apply_key(upper, key),
+            'score': run['total'] / (indices.size - 3),
+            'language': language_model.LANGUAGES[run['lang']]
+        })
+        if len(results) == top_k:
+            break
+    return results
@@ -5,111 +5,306 @@ Módulo para decodificação de texto em vários formatos
 import base64
 import binascii
 import logging
-from typing import Optional
-import codecs
+import re
+import string
+from typing import Dict, Iterator, Optional
+
+from . import bacon
+from . import base_n
+from . import bitstream
+from . import braille
+from . import buffers
+from . import carver
+from . import cipher_families
+from . import cipher_tables
+from . import cribs
+from . import cryptanalysis
+from . import format_detector
+from . import grid_ciphers
+from . import hill
+from . import morse
+from . import numeric
+from . import quadgrams
+from .morse_segmenter import MorseSegmenter
+from .layered_solver import LayeredSolver
+from . import stego
+from . import streaming
+from . import substitution
+from . import transposition
+from . import xor_analysis
 
 class TextDecoder:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-        # Tabela Morse
-        self.morse_code = {
-            '.-': 'A', '-...': 'B', '-.-.': 'C', '-..': 'D', '.': 'E',
-            '..-.': 'F', '--.': 'G', '....': 'H', '..': 'I', '.---': 'J',
-            '-.-': 'K', '.-..': 'L', '--': 'M', '-.': 'N', '---': 'O',
-            '.--.': 'P', '--.-': 'Q', '.-.': 'R', '...': 'S', '-': 'T',
-            '..-': 'U', '...-': 'V', '.--': 'W', '-..-': 'X', '-.--': 'Y',
-            '--..': 'Z', '.----': '1', '..---': '2', '...--': '3', '....-': '4',
-            '.....': '5', '-....': '6', '--...': '7', '---..': '8', '----.': '9',
-            '-----': '0', '.-.-.-': '.', '--..--': ',', '..--..': '?',
-            '.----.': "'", '-.-.--': '!', '-..-.': '/', '-.--.': '(',
-            '-.--.-': ')', '.-...': '&', '---...': ':', '-.-.-.': ';',
-            '-...-': '=', '.-.-.': '+', '-....-': '-', '..--.-': '_',
-            '.-..-.': '"', '...-..-': '$', '.--.-.': '@', '...---...': 'SOS'
-        }
+        # Tabela Morse (compartilhada com o AudioDecoder; o motor fica em morse.py)
+        self.morse_code = morse.MORSE_CODE
+        self.morse_segmenter = None  # criado na primeira segmentação
+
+        # Cribs (palavras do jogo) procurados nos resultados de força bruta
+        self.extra_cribs = []
+        self.crib_detector = None  # criado na primeira busca
         
-        # Dicionário de tradução Braille
+        # Dicionários de tradução Braille (letras e números usam as mesmas
+        # células, por isso ficam separados; o motor fica em braille.py)
         self.braille_dict = {
-            '⠨⠨': '[MAIÚSCULO]',  # Indicador de maiúsculo
-            '⠁': 'a', '⠃': 'b', '⠉': 'c', '⠙': 'd', '⠑': 'e',
-            '⠋': 'f', '⠛': 'g', '⠓': 'h', '⠊': 'i', '⠚': 'j',
-            '⠅': 'k', '⠇': 'l', '⠍': 'm', '⠝': 'n', '⠕': 'o',
-            '⠏': 'p', '⠟': 'q', '⠗': 'r', '⠎': 's', '⠞': 't',
-            '⠥': 'u', '⠧': 'v', '⠺': 'w', '⠭': 'x', '⠽': 'y', '⠵': 'z',
-            '⠼': '[NÚMERO]',  # Indicador de número
-            '⠚': '0', '⠁': '1', '⠃': '2', '⠉': '3', '⠙': '4',
-            '⠑': '5', '⠋': '6', '⠛': '7', '⠓': '8', '⠊': '9',
-            '⠂': ',', '⠄': "'", '⠲': '.', '⠖': '!', '⠢': '?', '⠱': '-',
-            ' ': ' '
+            braille.CAPITAL: '[MAIÚSCULO]',  # Indicador de maiúsculo
+            braille.NUMBER: '[NÚMERO]',      # Indicador de número
+            **{cell: char for char, cell in braille.ENCODE_CELLS.items()}
         }
+        self.braille_digits = {cell: digit for digit, cell in braille.DIGIT_ENCODE_CELLS.items()}
+
+        # Contrações do Braille grau 2 (podem ser trocadas por uma tabela em JSON)
+        self.braille_grade2 = braille.Grade2Codec()
+
+    def detect_encoding(self, text: str) -> Dict[str, float]:
+        """Detecta os formatos prováveis do texto, ordenados pela confiança"""
+        return format_detector.detect_encoding(text)
+
+    def detect_format(self, text: str) -> Optional[str]:
+        """Retorna o formato mais provável do texto, ou None se nenhum for reconhecido"""
+        return next(iter(self.detect_encoding(text)), None)
+
+    def solve_layers(self, text: str, top_k: int = 5, max_depth: int = 4,
+                     beam_width: int = 8, time_budget: Optional[float] = None) -> list:
+        """Procura automaticamente cadeias de decodificação em camadas"""
+        solver = LayeredSolver(self, beam_width=beam_width, max_depth=max_depth, time_budget=time_budget)
+        return solver.solve(text, top_k)
+
+    def decode_layers(self, text: str) -> str:
+        """Decodifica camadas aninhadas e lista as melhores cadeias com seus caminhos"""
+        try:
+            results = self.solve_layers(text)
+            if not results:
+                return "Nenhuma decodificação encontrada"
+            return "\n".join(f"{' -> '.join(result['path'])}: {result['text']}" for result in results)
+        except Exception as e:
+            return f"Erro na decodificação em camadas: {str(e)}"
 
     def decode_base64(self, text: str) -> Optional[str]:
-        """Decodifica texto em Base64"""
+        """Decodifica texto em Base64 (padding opcional, alfabeto url-safe e quebras de linha aceitos)"""
         try:
-            decoded = base64.b64decode(text).decode('utf-8')
-            return decoded
+            return buffers.to_text(self.decode_bytes(text, 'base64'))
         except Exception as e:
             self.logger.error(f"Erro ao decodificar Base64: {str(e)}")
             return None
 
+    def decode_base(self, text: str, base=None) -> Optional[str]:
+        """
+        Decodifica base32, base36, base58, base62, base64, base85/ascii85 ou
+        base91 (`base` como 32, 'base58', 'a85'...). Sem `base`, testa os
+        alfabetos compatíveis com o texto e usa o mais provável.
+        """
+        try:
+            if base is not None:
+                return buffers.to_text(self.decode_bytes(text, base_n.codec_name(base)))
+            candidates = self.scan_base(text, top_k=1)
+            if candidates:
+                return candidates[0]['text']
+            self.logger.error("Erro ao decodificar Base-N: nenhum alfabeto compatível com o texto")
+            return None
+        except Exception as e:
+            self.logger.error(f"Erro ao decodificar Base-N: {str(e)}")
+            return None
+
+    def scan_base(self, text: str, top_k: int = 5) -> list:
+        """Decodifica com cada alfabeto Base-N compatível com o texto e ranqueia"""
+        return base_n.scan(text, top_k)
+
+    def decode_bytes(self, data, encoding: str) -> bytes:
+        """
+        Decodifica hex, binário ou Base-N de bytes para bytes. Aceita str,
+        bytes, bytearray ou memoryview e não exige que o resultado seja
+        UTF-8; o texto fica para a apresentação (buffers.to_text).
+        """
+        return buffers.decode(data, encoding)
+
+    def decode_chain(self, data, encodings) -> bytes:
+        """Aplica decodificações em sequência (ex.: ['hex', 'base64']) passando só bytes entre as etapas"""
+        return buffers.decode_chain(data, encodings)
+
     def decode_hex(self, text: str) -> Optional[str]:
-        """Decodifica texto em hexadecimal"""
+        """Decodifica texto em hexadecimal (espaços, ':' e prefixos 0x são ignorados)"""
         try:
-            # Remove espaços e '0x' se presentes
-            text = text.replace(' ', '').replace('0x', '')
-            decoded = bytes.fromhex(text).decode('utf-8')
-            return decoded
+            return buffers.to_text(self.decode_bytes(text, 'hex'))
         except Exception as e:
             self.logger.error(f"Erro ao decodificar Hex: {str(e)}")
             return None
 
     def decode_binary(self, text: str) -> Optional[str]:
-        """Decodifica texto em binário"""
+        """Decodifica texto em binário (bytes alinhados; senão procura largura e deslocamento)"""
         try:
-            # Remove espaços
-            text = text.replace(' ', '')
-            
-            # Verifica se é uma string binária válida
-            if not all(bit in '01' for bit in text):
-                raise ValueError("Texto contém caracteres não binários")
-            
-            # Garante que o comprimento é múltiplo de 8
-            if len(text) % 8 != 0:
-                raise ValueError("Comprimento do texto binário deve ser múltiplo de 8")
-            
-            # Converte para bytes e depois para string
-            bytes_data = int(text, 2).to_bytes(len(text) // 8, byteorder='big')
-            return bytes_data.decode('utf-8')
+            # Valida e empacota os bits com np.packbits (tempo linear, sem um int gigante)
+            return buffers.to_text(self.decode_bytes(text, 'binary'))
+        except ValueError:
+            candidates = self.scan_binary(text, top_k=1)
+            if candidates:
+                return candidates[0]['text']
+            self.logger.error("Erro ao decodificar Binário: nenhum bit encontrado")
+            return None
         except Exception as e:
             self.logger.error(f"Erro ao decodificar Binário: {str(e)}")
             return None
 
+    def scan_binary(self, text: str, top_k: int = 5) -> list:
+        """Testa larguras de 8, 7 e 5 bits (Baudot) em todos os deslocamentos e ranqueia"""
+        return bitstream.scan(text, top_k)
+
+    def decode_bacon(self, text: str) -> Optional[str]:
+        """Decodifica cifra de Bacon (A/B, dois símbolos, maiúsculas/minúsculas ou paridade de dígitos)"""
+        try:
+            candidates = self.scan_bacon(text, top_k=1)
+            if candidates:
+                return candidates[0]['text']
+            self.logger.error("Erro ao decodificar Bacon: nenhum classificador de bits se aplica ao texto")
+            return None
+        except Exception as e:
+            self.logger.error(f"Erro ao decodificar Bacon: {str(e)}")
+            return None
+
+    def scan_bacon(self, text: str, top_k: int = 5) -> list:
+        """Testa as 5 fases, as duas polaridades e os alfabetos de 24 e 26 letras e ranqueia"""
+        return bacon.scan(text, top_k)
+
+    def decode_tap(self, text: str) -> Optional[str]:
+        """Decodifica tap code (grupos de batidas em pares; grade 5x5 com K=C)"""
+        try:
+            return grid_ciphers.decode_tap(text)
+        except Exception as e:
+            self.logger.error(f"Erro ao decodificar tap code: {str(e)}")
+            return None
+
+    def decode_polybius(self, text):
+        """Decodifica Polybius 5x5/6x6 ("PALAVRA:dígitos" para uma grade com palavra-chave)"""
+        try:
+            keyword, _, digits = text.rpartition(':')
+            return grid_ciphers.decode_polybius(digits, keyword.strip())
+        except Exception as e:
+            return f"Erro na decodificação Polybius: {str(e)}"
+
+    def decode_nihilist(self, text):
+        """Decodifica Nihilist ("CHAVE:números" ou "GRADE,CHAVE:números")"""
+        try:
+            keys, numbers = text.split(':', 1)
+            keyword, _, key = keys.rpartition(',')
+            return grid_ciphers.decode_nihilist(numbers, key.strip(), keyword.strip())
+        except Exception as e:
+            return f"Erro na decodificação Nihilist: {str(e)}"
+
+    def decode_adfgvx(self, text):
+        """Decodifica ADFGVX/ADFGX ("CHAVE:texto" ou "GRADE,CHAVE:texto")"""
+        try:
+            keys, body = text.split(':', 1)
+            keyword, _, key = keys.rpartition(',')
+            return grid_ciphers.decode_adfgvx(body, key.strip(), keyword.strip())
+        except Exception as e:
+            return f"Erro na decodificação ADFGVX: {str(e)}"
+
+    def search_grid_keywords(self, text: str, cipher: str = 'polybius', key: str = '',
+                             words=None, top_k: int = 5) -> list:
+        """
+        Procura a palavra-chave de uma grade Polybius, Nihilist ou ADFGVX numa
+        lista de palavras. A própria palavra-chave não conta como crib: as
+        primeiras casas de qualquer grade a soletram, então ela aparece no
+        texto de toda grade sempre que o texto claro contém a chave verdadeira.
+        """
+        return self._boost_cribs(grid_ciphers.search_keywords(text, cipher, key, words, top_k), exclude='keyword')
+
+    def solve_xor(self, data, top_k: int = 5) -> list:
+        """
+        Recupera chaves XOR (um byte ou repetidas) de um payload em bytes, ou
+        em hex/Base64. Candidatos com palavras do jogo ganham um bônus na nota.
+        """
+        if isinstance(data, str):
+            data = self._payload_bytes(data)
+        return self._boost_cribs(xor_analysis.solve(data, top_k))
+
+    @staticmethod
+    def _payload_bytes(text: str) -> bytes:
+        """Payload em hexadecimal (se só tiver dígitos hex) ou Base64"""
+        compact = ''.join(text.split()).replace('0x', '').replace('0X', '')
+        if compact and all(c in string.hexdigits for c in compact):
+            return b''.join(streaming.stream_hex([compact]))
+        return b''.join(streaming.stream_base64([text]))
+
+    def decode_xor(self, text):
+        """Decodifica XOR ("CHAVEHEX:payload"; sem chave, usa a mais provável). O payload é hex ou Base64"""
+        try:
+            key, _, body = text.rpartition(':')
+            data = self._payload_bytes(body)
+            if key.strip():
+                return xor_analysis.apply_key(data, bytes.fromhex(key.strip())).decode('utf-8')
+            candidates = self.solve_xor(data, top_k=1)
+            if not candidates:
+                return "Erro: Payload vazio"
+            return candidates[0]['text']
+        except Exception as e:
+            return f"Erro na decodificação XOR: {str(e)}"
+
+    def stream_decode(self, source, encoding: str) -> Iterator[bytes]:
+        """
+        Decodifica Base64, hexadecimal, binário ou outro Base-N em fluxo.
+
+        `source` pode ser um iterável de pedaços de texto ou um arquivo aberto;
+        os bytes decodificados são produzidos aos poucos, com memória constante.
+        """
+        return streaming.stream_decode(source, encoding)
+
+    def carve_fragments(self, source, keep_binary: bool = False) -> list:
+        """
+        Procura fragmentos Base64, hex e binário no meio de um texto misto (ou
+        iterável de pedaços, ou arquivo aberto) e os decodifica, com a posição
+        de cada um no texto.
+        """
+        return list(carver.carve(source, keep_binary=keep_binary))
+
+    def decode_fragments(self, text: str) -> str:
+        """Uma linha '[início:fim] formato: texto' por fragmento legível encontrado"""
+        fragments = self.carve_fragments(text)
+        if not fragments:
+            return "Nenhum fragmento codificado encontrado"
+        return "\n".join(f"[{fragment['start']}:{fragment['end']}] {fragment['kind']}: {fragment['text']}"
+                         for fragment in fragments)
+
+    def analyze_stego(self, text: str) -> dict:
+        """Conta os caracteres invisíveis (largura zero, espaços/tabs no fim das linhas) e diz se são suspeitos"""
+        return stego.analyze(text)
+
+    def scan_stego(self, text: str, top_k: int = 5) -> list:
+        """Decodifica os caracteres invisíveis em todas as convenções de bits e ranqueia"""
+        return stego.scan(text, top_k)
+
+    def decode_stego(self, text: str) -> Optional[str]:
+        """Revela a mensagem escondida em caracteres de largura zero ou em espaços no fim das linhas"""
+        candidates = self.scan_stego(text, top_k=1)
+        if candidates:
+            return candidates[0]['text']
+        self.logger.error("Erro ao decodificar esteganografia: nenhum caractere invisível encontrado")
+        return None
+
     def decode_morse(self, text: str) -> Optional[str]:
-        """Decodifica código Morse"""
+        """Decodifica código Morse (palavras separadas por '/', '|', quebras de linha ou vários espaços)"""
         try:
-            # Remove espaços extras e divide em palavras
-            words = text.strip().split('   ')
-            decoded_words = []
-            
-            for word in words:
-                # Divide a palavra em letras
-                letters = word.strip().split(' ')
-                decoded_letters = []
-                
-                for letter in letters:
-                    if letter in self.morse_code:
-                        decoded_letters.append(self.morse_code[letter])
-                    else:
-                        self.logger.warning(f"Símbolo Morse desconhecido: {letter}")
-                
-                if decoded_letters:
-                    decoded_words.append(''.join(decoded_letters))
-            
-            return ' '.join(decoded_words)
+            result, unknown = morse.decode_report(text)
+            if unknown and len(text.split()) == 1:
+                # Sem separadores: procura a segmentação mais provável em letras e palavras
+                readings = self.segment_morse(text, top_k=1)
+                if readings:
+                    return readings[0]['text']
+            if unknown:
+                self.logger.warning(
+                    f"{sum(unknown.values())} símbolo(s) Morse desconhecido(s): {', '.join(list(unknown)[:10])}")
+            return result
         except Exception as e:
             self.logger.error(f"Erro ao decodificar Morse: {str(e)}")
             return None
 
+    def segment_morse(self, text: str, top_k: int = 5) -> list:
+        """Lista as leituras mais prováveis de Morse sem separadores (texto e custo)"""
+        if self.morse_segmenter is None:
+            self.morse_segmenter = MorseSegmenter()
+        return self.morse_segmenter.segment(text, top_k)
+
     def decode_caesar(self, text):
         """Decodifica texto usando cifra de César"""
         try:
@@ -117,45 +312,47 @@ class TextDecoder:
             if ':' in text:
                 shift, text = text.split(':', 1)
                 shift = int(shift)
-                result = ""
-                for char in text.upper():
-                    if char.isalpha():
-                        # Converte para 0-25, aplica o shift e volta para ASCII
-                        ascii_val = ord(char) - ord('A')
-                        shifted = (ascii_val - shift) % 26
-                        result += chr(shifted + ord('A'))
-                    else:
-                        result += char
-                return result
+                return cipher_tables.rotate(text.upper(), -shift)
             else:
-                # Se não tem shift, tenta todos os possíveis
+                # Se não tem shift, tenta todos os possíveis, do mais provável ao menos provável
                 results = []
-                for shift in range(26):
-                    result = ""
-                    for char in text.upper():
-                        if char.isalpha():
-                            ascii_val = ord(char) - ord('A')
-                            shifted = (ascii_val - shift) % 26
-                            result += chr(shifted + ord('A'))
-                        else:
-                            result += char
-                    results.append(f"Shift {shift}: {result}")
+                for candidate in self.brute_force_caesar(text, top_k=26):
+                    results.append(f"Shift {candidate['shift']}: {candidate['text']}")
                 return "\n".join(results)
         except Exception as e:
             return f"Erro na decodificação César: {str(e)}"
 
+    def rank_candidates(self, candidates: list, key: str = 'text') -> list:
+        """Ordena candidatos (dicionários com o texto em `key`) pelo modelo de quadrigramas"""
+        return quadgrams.rank(candidates, key)
+
+    def add_cribs(self, words) -> None:
+        """Acrescenta cribs próprios às palavras-chave e arquivos do labirinto"""
+        self.extra_cribs.extend(words)
+        self.crib_detector = None
+
+    def find_cribs(self, texts: list) -> list:
+        """Lista, para cada texto, as palavras do jogo encontradas nele"""
+        return self._get_crib_detector().scan(texts)
+
+    def _get_crib_detector(self) -> cribs.CribDetector:
+        if self.crib_detector is None:
+            self.crib_detector = cribs.CribDetector(cribs.game_cribs() + self.extra_cribs)
+        return self.crib_detector
+
+    def _boost_cribs(self, candidates: list, exclude: Optional[str] = None) -> list:
+        """Soma à nota dos candidatos um bônus limitado pelas palavras do jogo que eles contêm"""
+        return self._get_crib_detector().rank(candidates, limit=cribs.SCAN_LIMIT, exclude=exclude)
+
+    def brute_force_caesar(self, text: str, top_k: int = 5) -> list:
+        """Testa todos os deslocamentos de César e retorna os melhores candidatos pontuados"""
+        return self._boost_cribs(cryptanalysis.brute_force_caesar(text, 26))[:top_k]
+
     def decode_atbash(self, text):
         """Decodifica texto usando cifra Atbash"""
         try:
-            result = ""
-            for char in text.upper():
-                if char.isalpha():
-                    # Inverte a posição no alfabeto (A->Z, B->Y, etc)
-                    ascii_val = ord('Z') - (ord(char) - ord('A'))
-                    result += chr(ascii_val)
-                else:
-                    result += char
-            return result
+            # Inverte a posição no alfabeto (A->Z, B->Y, etc)
+            return cipher_tables.atbash(text.upper())
         except Exception as e:
             return f"Erro na decodificação Atbash: {str(e)}"
 
@@ -163,7 +360,8 @@ class TextDecoder:
         """Decodifica texto usando cifra de Vigenère"""
         try:
             if ':' not in text:
-                return "Erro: Formato deve ser KEY:texto"
+                # Sem chave: tenta recuperá-la pela estatística do texto
+                return self._format_vigenere_candidates(text)
             
             key, text = text.split(':', 1)
             key = key.upper()
@@ -172,54 +370,162 @@ class TextDecoder:
             if not key:
                 return "Erro: Chave não fornecida"
                 
-            result = ""
-            key_index = 0
-            
-            for char in text:
-                if char.isalpha():
-                    # Pega o valor do deslocamento da chave (0-25)
-                    key_shift = ord(key[key_index % len(key)]) - ord('A')
-                    # Converte o caractere para 0-25, remove o shift e volta para ASCII
-                    ascii_val = ord(char) - ord('A')
-                    shifted = (ascii_val - key_shift) % 26
-                    result += chr(shifted + ord('A'))
-                    key_index += 1
-                else:
-                    result += char
-                    
-            return result
+            # A chave só avança nas letras
+            return cipher_tables.vigenere(text, key)
         except Exception as e:
             return f"Erro na decodificação Vigenère: {str(e)}"
 
+    def solve_vigenere(self, text: str, top_k: int = 5, deadline: Optional[float] = None) -> list:
+        """Recupera as chaves de Vigenère mais prováveis sem conhecê-las (até o prazo `deadline`, se houver)"""
+        return self._boost_cribs(cryptanalysis.solve_vigenere(text, top_k, deadline=deadline))
+
+    def _format_vigenere_candidates(self, text: str) -> str:
+        """Lista os candidatos de Vigenère sem chave, do mais provável ao menos provável"""
+        candidates = self.solve_vigenere(text)
+        if not candidates:
+            return "Erro: Nenhuma letra para analisar"
+        return "\n".join(f"Chave {candidate['key']}: {candidate['text']}" for candidate in candidates)
+
+    def decode_affine(self, text):
+        """Decodifica cifra afim ("a,b:texto"); sem chave, lista as melhores das 312"""
+        try:
+            if ':' in text:
+                key, text = text.split(':', 1)
+                a, b = (int(value) for value in key.split(','))
+                return cipher_families.affine_decrypt(text, a, b)
+            candidates = self.brute_force_affine(text)
+            if not candidates:
+                return "Erro: Nenhuma letra para analisar"
+            return "\n".join(f"Chave {candidate['key']}: {candidate['text']}" for candidate in candidates)
+        except Exception as e:
+            return f"Erro na decodificação afim: {str(e)}"
+
+    def brute_force_affine(self, text: str, top_k: int = 5) -> list:
+        """Testa as 312 chaves afins numa única matriz e ranqueia"""
+        return self._boost_cribs(cipher_families.brute_force_affine(text, top_k))
+
+    def solve_cipher_family(self, text: str, family: str, top_k: int = 5) -> list:
+        """Recupera as chaves mais prováveis de Beaufort, Gronsfeld, Porta, autokey etc."""
+        return self._boost_cribs(cipher_families.solve(text, family, top_k))
+
+    def _decode_family(self, text: str, family: str, name: str) -> str:
+        """"CHAVE:texto" decifra direto; sem chave, lista os candidatos da família"""
+        try:
+            if ':' in text:
+                key, text = text.split(':', 1)
+                return cipher_families.decrypt(text, family, key.strip())
+            candidates = self.solve_cipher_family(text, family)
+            if not candidates:
+                return "Erro: Nenhuma letra para analisar"
+            return "\n".join(f"Chave {candidate['key']}: {candidate['text']}" for candidate in candidates)
+        except Exception as e:
+            return f"Erro na decodificação {name}: {str(e)}"
+
+    def decode_beaufort(self, text):
+        """Decodifica cifra de Beaufort"""
+        return self._decode_family(text, 'beaufort', 'Beaufort')
+
+    def decode_variant_beaufort(self, text):
+        """Decodifica a variante de Beaufort"""
+        return self._decode_family(text, 'variant_beaufort', 'Beaufort variante')
+
+    def decode_gronsfeld(self, text):
+        """Decodifica cifra de Gronsfeld (chave numérica)"""
+        return self._decode_family(text, 'gronsfeld', 'Gronsfeld')
+
+    def decode_porta(self, text):
+        """Decodifica cifra de Porta"""
+        return self._decode_family(text, 'porta', 'Porta')
+
+    def decode_autokey(self, text):
+        """Decodifica cifra autokey (Vigenère com o texto claro como chave)"""
+        return self._decode_family(text, 'autokey', 'autokey')
+
+    def solve_hill(self, text: str, size: int = 2, top_k: int = 5) -> list:
+        """Recupera chaves de Hill 2x2 (busca completa) ou 3x3 (linha por linha)"""
+        return self._boost_cribs(hill.solve(text, size, top_k))
+
+    def decode_hill(self, text):
+        """Decodifica cifra de Hill ("CHAVE:texto"); sem chave, testa 2x2 e 3x3"""
+        try:
+            if ':' in text:
+                key, text = text.split(':', 1)
+                return hill.decrypt(text, key.strip())
+            candidates = sorted(hill.solve(text, 2) + hill.solve(text, 3), key=lambda c: -c['score'])
+            candidates = self._boost_cribs(candidates[:5])
+            if not candidates:
+                return "Erro: Nenhuma letra para analisar"
+            return "\n".join(f"Chave {candidate['key']}: {candidate['text']}" for candidate in candidates)
+        except Exception as e:
+            return f"Erro na decodificação Hill: {str(e)}"
+
+    def search_transposition(self, text: str, top_k: int = 5, max_columns: int = 9,
+                             workers: Optional[int] = None) -> list:
+        """Procura rail fence, colunar (até `max_columns` colunas), cítala e rota"""
+        return self._boost_cribs(transposition.search(text, top_k, max_columns, workers))
+
+    def decode_transposition(self, text):
+        """Lista as transposições mais prováveis (família, chave e texto)"""
+        try:
+            candidates = self.search_transposition(text)
+            if not candidates:
+                return "Erro: Nenhuma letra para analisar"
+            return "\n".join(f"{candidate['cipher']} {candidate['key']}: {candidate['text']}"
+                             for candidate in candidates)
+        except Exception as e:
+            return f"Erro na decodificação por transposição: {str(e)}"
+
+    def decode_rail_fence(self, text):
+        """Decodifica rail fence ("trilhos:texto")"""
+        try:
+            rails, text = text.split(':', 1)
+            return transposition.decrypt(text, 'rail_fence', int(rails))
+        except Exception as e:
+            return f"Erro na decodificação rail fence: {str(e)}"
+
+    def decode_columnar(self, text):
+        """Decodifica transposição colunar ("PALAVRA-CHAVE:texto")"""
+        try:
+            key, text = text.split(':', 1)
+            return transposition.decrypt(text, 'columnar', key.strip())
+        except Exception as e:
+            return f"Erro na decodificação colunar: {str(e)}"
+
+    def decode_substitution(self, text):
+        """
+        Decodifica substituição simples. Com "CHAVE:texto" (26 letras) aplica a
+        chave; sem ela, lista as chaves mais prováveis encontradas pelo solver.
+        """
+        try:
+            key, _, body = text.partition(':')
+            key = key.strip().upper()
+            if body and len(key) == 26 and key.isalpha():
+                return substitution.apply_key(body, key)
+            candidates = self.solve_substitution(text)
+            if not candidates:
+                return "Erro: Nenhuma letra para analisar"
+            return "\n".join(f"Chave {candidate['key']}: {candidate['text']}" for candidate in candidates)
+        except Exception as e:
+            return f"Erro na decodificação por substituição: {str(e)}"
+
+    def solve_substitution(self, text: str, restarts: int = 40, top_k: int = 3,
+                           workers: Optional[int] = None) -> list:
+        """Recupera as chaves de substituição simples mais prováveis (subida de encosta)"""
+        return self._boost_cribs(substitution.solve(text, restarts, top_k, workers))
+
     def decode_rot13(self, text):
         """Decodifica texto usando ROT13"""
         try:
-            result = ""
-            for char in text.upper():
-                if char.isalpha():
-                    # Desloca 13 posições
-                    ascii_val = ord(char) - ord('A')
-                    shifted = (ascii_val + 13) % 26
-                    result += chr(shifted + ord('A'))
-                else:
-                    result += char
-            return result
+            # Desloca 13 posições
+            return cipher_tables.rotate(text.upper(), 13)
         except Exception as e:
             return f"Erro na decodificação ROT13: {str(e)}"
 
     def caesar_cipher(self, text: str, shift: int = -3) -> str:
         """Decodifica cifra de César"""
         try:
-            result = ""
-            for char in text:
-                if char.isalpha():
-                    # Determina o caso (maiúsculo/minúsculo)
-                    ascii_offset = ord('A') if char.isupper() else ord('a')
-                    # Aplica a cifra de César
-                    result += chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
-                else:
-                    result += char
-            return result
+            # A tabela preserva maiúsculas/minúsculas
+            return cipher_tables.rotate(text, shift)
         except Exception as e:
             self.logger.error(f"Erro ao decodificar Cifra de César: {str(e)}")
             return None
@@ -227,61 +533,20 @@ class TextDecoder:
     def atbash_cipher(self, text: str) -> str:
         """Decodifica cifra Atbash"""
         try:
-            result = ""
-            for char in text:
-                if char.isalpha():
-                    # Determina o caso (maiúsculo/minúsculo)
-                    if char.isupper():
-                        result += chr(ord('Z') - (ord(char) - ord('A')))
-                    else:
-                        result += chr(ord('z') - (ord(char) - ord('a')))
-                else:
-                    result += char
-            return result
+            # A tabela preserva maiúsculas/minúsculas
+            return cipher_tables.atbash(text)
         except Exception as e:
             self.logger.error(f"Erro ao decodificar Cifra Atbash: {str(e)}")
             return None
 
+    def load_braille_contractions(self, path: str) -> None:
+        """Substitui as contrações do Braille grau 2 pelas de um arquivo JSON"""
+        self.braille_grade2 = braille.Grade2Codec.from_file(path)
+
     def decode_braille(self, text):
-        """Decodifica texto Braille"""
-        try:
-            # Dicionário de decodificação Braille
-            braille_dict = {
-                '⠁': 'a', '⠃': 'b', '⠉': 'c', '⠙': 'd', '⠑': 'e',
-                '⠋': 'f', '⠛': 'g', '⠓': 'h', '⠊': 'i', '⠚': 'j',
-                '⠅': 'k', '⠇': 'l', '⠍': 'm', '⠝': 'n', '⠕': 'o',
-                '⠏': 'p', '⠟': 'q', '⠗': 'r', '⠎': 's', '⠞': 't',
-                '⠥': 'u', '⠧': 'v', '⠺': 'w', '⠭': 'x', '⠽': 'y',
-                '⠵': 'z', ' ': ' ', '\n': '\n'
-            }
-
-            result = ""
-            i = 0
-            next_upper = False
-            
-            while i < len(text):
-                char = text[i]
-                
-                # Se for indicador de maiúscula
-                if char == '⠨':
-                    next_upper = True
-                    i += 1
-                    continue
-                
-                # Se for um caractere Braille válido
-                if char in braille_dict:
-                    letter = braille_dict[char]
-                    if next_upper:
-                        letter = letter.upper()
-                        next_upper = False
-                    result += letter
-                else:
-                    # Preserva caracteres não-Braille
-                    result += char
-                
-                i += 1
-            
-            return result
+        """Decodifica texto Braille (maiúsculas com ⠨ ou ⠨⠨, números com ⠼, contrações do grau 2)"""
+        try:
+            return self.braille_grade2.decode(text)
         except Exception as e:
             self.logger.error(f"Erro ao decodificar Braille: {str(e)}")
             return None
@@ -289,46 +554,12 @@ class TextDecoder:
     def encode_braille(self, text: str) -> Optional[str]:
         """Codifica texto em Braille com alinhamento justificado em 50 caracteres"""
         try:
-            # Dicionário de padrões especiais que devem ser aplicados primeiro
-            special_patterns = {
-                'for': '⠿',
-                'st': '⠌',
-                'of': '⠷',
-                'er': '⠻',
-                'ar': '⠜',
-                'or': '⠪'
-            }
-
-            # Dicionário de codificação Braille para caracteres individuais
-            braille_encode = {
-                'p': '⠏', 'o': '⠕', 'r': '⠗', 't': '⠞', 'a': '⠁', 'e': '⠑',
-                's': '⠎', 'd': '⠙', 'f': '⠋', 'l': '⠇', 'm': '⠍', 'k': '⠅',
-                'v': '⠧', 'x': '⠭', 'c': '⠉', 'b': '⠃', 'i': '⠊', 'g': '⠛',
-                'w': '⠺', 'q': '⠟', 'y': '⠽', 'u': '⠥', 'z': '⠵', 'h': '⠓',
-                'n': '⠝', 'j': '⠚',
-                ' ': '⠀', '\n': '⠀'  # Trata quebra de linha como espaço Braille
-            }
-
-            # Primeiro processa o texto procurando por padrões especiais
-            result = text.lower()
-            for pattern, braille in special_patterns.items():
-                result = result.replace(pattern, braille)
-
             # Remove todas as quebras de linha existentes
-            result = result.replace('\n', '')
-
-            # Converte para Braille e cria uma única string
-            braille_chars = []
-            for char in result:
-                if char in braille_encode:
-                    braille_chars.append(braille_encode[char])
-                elif char not in '⠿⠌⠷⠻⠜⠪':
-                    braille_chars.append('⠀')
-                else:
-                    braille_chars.append(char)
+            result = text.lower().replace('\n', '')
 
-            # Junta todos os caracteres em uma única string
-            braille_text = ''.join(braille_chars)
+            # Aplica as contrações (casamento mais longo) e converte o restante
+            # para Braille numa única passada; o que não tem célula vira espaço Braille
+            braille_text = self.braille_grade2.encode(result, capitals=False, unknown=braille.BLANK)
 
             # Quebra em linhas de exatamente 50 caracteres
             lines = []
@@ -351,20 +582,34 @@ class TextDecoder:
             return None
 
     def decode_ascii(self, text):
-        """Decodifica texto em ASCII"""
+        """Decodifica texto em ASCII (códigos decimais)"""
         try:
-            # Divide o texto em números
-            ascii_codes = [int(code) for code in text.split()]
-            
-            # Converte cada código em caractere
-            result = ''.join(chr(code) for code in ascii_codes)
-            
-            return result
+            return numeric.decode(text, 'decimal')
         except ValueError:
             return "Erro: Formato inválido. Use números ASCII separados por espaço."
         except Exception as e:
             return f"Erro ao decodificar: {str(e)}"
-            
+
+    def decode_numeric(self, text):
+        """
+        Decodifica tokens numéricos ("ESQUEMA:tokens" força decimal, octal,
+        a1z26, t9, roman ou roman_ascii; sem ele, usa o esquema mais provável)
+        """
+        try:
+            scheme, _, body = text.partition(':')
+            if body and scheme.strip().lower() in numeric.SCHEMES:
+                return numeric.decode(body, scheme.strip().lower())
+            candidates = self.scan_numeric(text, top_k=1)
+            if not candidates:
+                return "Erro: Nenhum token numérico encontrado"
+            return candidates[0]['text']
+        except Exception as e:
+            return f"Erro na decodificação numérica: {str(e)}"
+
+    def scan_numeric(self, text: str, top_k: int = 5) -> list:
+        """Testa decimal, octal, A1Z26, T9 e algarismos romanos de uma vez e ranqueia"""
+        return numeric.scan(text, top_k)
+
     def decode_base64_braille(self, text):
         """Decodifica texto em Base64"""
         try:
@@ -382,26 +627,7 @@ class TextDecoder:
     def decode_morse_braille(self, text):
         """Decodifica texto em código Morse"""
         try:
-            # Divide o texto em palavras
-            words = text.strip().split('/')
-            result = []
-            
-            # Processa cada palavra
-            for word in words:
-                # Divide a palavra em letras
-                letters = word.strip().split()
-                
-                # Traduz cada letra
-                decoded_word = ''
-                for letter in letters:
-                    if letter in self.morse_code:
-                        decoded_word += self.morse_code[letter]
-                    else:
-                        decoded_word += '?'
-                        
-                result.append(decoded_word)
-                
-            return ' '.join(result)
+            return morse.decode(text, unknown='?')
         except Exception as e:
             return f"Erro ao decodificar Morse: {str(e)}"
 
@@ -414,23 +640,15 @@ class TextDecoder:
                 shift = int(shift)
                 shifts = [shift]
             else:
-                # Se não houver deslocamento, tenta todos
-                shifts = range(1, 26)
+                # Se não houver deslocamento, tenta todos, do mais provável ao menos provável
+                shifts = [candidate['shift'] for candidate in self.brute_force_caesar(text, top_k=26)
+                          if candidate['shift'] != 0]
                 
+            upper = text.upper()
             results = []
             for shift in shifts:
-                result = ''
-                for char in text.upper():
-                    if char.isalpha():
-                        # Desloca o caractere
-                        ascii_val = ord(char) - shift
-                        if ascii_val < ord('A'):
-                            ascii_val += 26
-                        result += chr(ascii_val)
-                    else:
-                        result += char
-
-                        
+                # Desloca os caracteres
+                result = cipher_tables.rotate(upper, -shift)
                 if len(shifts) == 1:
                     return result
                 else:
@@ -443,15 +661,8 @@ class TextDecoder:
     def decode_atbash_braille(self, text):
         """Decodifica texto usando cifra Atbash"""
         try:
-            result = ''
-            for char in text.upper():
-                if char.isalpha():
-                    # Inverte a letra no alfabeto
-                    ascii_val = ord('Z') - (ord(char) - ord('A'))
-                    result += chr(ascii_val)
-                else:
-                    result += char
-            return result
+            # Inverte a letra no alfabeto
+            return cipher_tables.atbash(text.upper())
         except Exception as e:
             return f"Erro ao decodificar Atbash: {str(e)}"
 
@@ -460,7 +671,7 @@ class TextDecoder:
         try:
             # Verifica se há uma chave especificada
             if ':' not in text:
-                return "Erro: Formato inválido. Use CHAVE:TEXTO"
+                return self._format_vigenere_candidates(text)
                 
             key, text = text.split(':', 1)
             key = key.upper()
@@ -469,26 +680,8 @@ class TextDecoder:
             if not key:
                 return "Erro: Chave não fornecida"
                 
-            result = ''
-            key_index = 0
-            
-            for char in text:
-                if char.isalpha():
-                    # Calcula o deslocamento baseado na chave
-                    shift = ord(key[key_index % len(key)]) - ord('A')
-                    
-                    # Desloca o caractere
-                    ascii_val = ord(char) - shift
-                    if ascii_val < ord('A'):
-                        ascii_val += 26
-
-                        
-                    result += chr(ascii_val)
-                    key_index += 1
-                else:
-                    result += char
-                    
-            return result
+            # O deslocamento de cada letra vem da chave
+            return cipher_tables.vigenere(text, key)
         except Exception as e:
             return f"Erro ao decodificar Vigenère: {str(e)}"
 
@@ -496,19 +689,14 @@ class TextDecoder:
         """Decodifica texto em binário"""
         try:
             # Remove espaços e outros caracteres
-            binary = ''.join(c for c in text if c in '01')
+            binary = re.sub(r'[^01]', '', text)
             
             # Verifica se o comprimento é múltiplo de 8
             if len(binary) % 8 != 0:
                 return "Erro: O texto binário deve ter um número de bits múltiplo de 8"
                 
-            # Converte grupos de 8 bits em caracteres
-            result = ''
-            for i in range(0, len(binary), 8):
-                byte = binary[i:i+8]
-                result += chr(int(byte, 2))
-                
-            return result
+            # Bits empacotados com np.packbits, como no decode_binary; um caractere por byte
+            return str(buffers.decode_binary(binary), 'latin-1')
         except Exception as e:
             return f"Erro ao decodificar binário: {str(e)}"
 
@@ -516,22 +704,21 @@ class TextDecoder:
         """Decodifica texto em hexadecimal"""
         try:
             # Remove 0x, espaços e outros caracteres
-            hex_text = ''.join(c for c in text if c in '0123456789abcdefABCDEF')
+            hex_text = re.sub(r'[^0-9a-fA-F]', '', text)
             
             # Verifica se o comprimento é par
             if len(hex_text) % 2 != 0:
                 return "Erro: O texto hexadecimal deve ter um número par de caracteres"
                 
-            # Converte pares de caracteres em bytes
-            result = bytes.fromhex(hex_text).decode('utf-8')
-            return result
+            # Pares de dígitos convertidos pela tabela do decode_hex
+            return buffers.to_text(buffers.decode_hex(hex_text))
         except Exception as e:
             return f"Erro ao decodificar hexadecimal: {str(e)}"
 
     def decode_rot13_braille(self, text):
         """Decodifica texto usando ROT13"""
         try:
-            return codecs.encode(text, 'rot_13')
+            return cipher_tables.rotate(text, 13)
         except Exception as e:
             return f"Erro ao decodificar ROT13: {str(e)}"
 
@@ -565,23 +752,10 @@ class TextDecoder:
     def encode_morse(self, text: str) -> Optional[str]:
         """Codifica texto em código Morse"""
         try:
-            # Inverte o dicionário morse_code
-            morse_encode = {v: k for k, v in self.morse_code.items()}
-            
-            # Converte para maiúsculas e divide em palavras
-            words = text.upper().split()
-            encoded_words = []
-            
-            for word in words:
-                encoded_letters = []
-                for char in word:
-                    if char in morse_encode:
-                        encoded_letters.append(morse_encode[char])
-                    else:
-                        self.logger.warning(f"Caractere não suportado em Morse: {char}")
-                encoded_words.append(' '.join(encoded_letters))
-            
-            return ' / '.join(encoded_words)
+            result, unsupported = morse.encode(text)
+            if unsupported:
+                self.logger.warning(f"Caracteres não suportados em Morse: {''.join(sorted(set(unsupported)))}")
+            return result
         except Exception as e:
             self.logger.error(f"Erro ao codificar Morse: {str(e)}")
             return None
@@ -595,16 +769,7 @@ class TextDecoder:
             else:
                 shift = 3  # Deslocamento padrão
             
-            result = ""
-            for char in text.upper():
-                if char.isalpha():
-                    # Converte para número (0-25), aplica o deslocamento e volta para letra
-                    ascii_offset = ord('A')
-                    shifted = (ord(char) - ascii_offset + shift) % 26
-                    result += chr(shifted + ascii_offset)
-                else:
-                    result += char
-            return result
+            return cipher_tables.rotate(text.upper(), shift)
         except Exception as e:
             self.logger.error(f"Erro ao codificar César: {str(e)}")
             return None
@@ -612,16 +777,8 @@ class TextDecoder:
     def encode_atbash(self, text: str) -> Optional[str]:
         """Codifica texto usando cifra Atbash"""
         try:
-            result = ""
-            for char in text.upper():
-                if char.isalpha():
-                    # Inverte a posição da letra no alfabeto
-                    ascii_offset = ord('A')
-                    inverted = 25 - (ord(char) - ascii_offset)
-                    result += chr(inverted + ascii_offset)
-                else:
-                    result += char
-            return result
+            # Inverte a posição da letra no alfabeto
+            return cipher_tables.atbash(text.upper())
         except Exception as e:
             self.logger.error(f"Erro ao codificar Atbash: {str(e)}")
             return None
@@ -633,25 +790,11 @@ class TextDecoder:
                 raise ValueError("Formato inválido. Use CHAVE:TEXTO")
             
             key, text = text.split(':', 1)
-            key = key.upper()
-            text = text.upper()
-            result = ""
-            key_length = len(key)
-            
-            for i, char in enumerate(text):
-                if char.isalpha():
-                    # Pega a letra da chave correspondente
-                    key_char = key[i % key_length]
-                    # Calcula o deslocamento baseado na letra da chave
-                    shift = ord(key_char) - ord('A')
-                    # Aplica o deslocamento
-                    ascii_offset = ord('A')
-                    shifted = (ord(char) - ascii_offset + shift) % 26
-                    result += chr(shifted + ascii_offset)
-                else:
-                    result += char
-            
-            return result
+            if not key:
+                raise ValueError("Chave não fornecida")
+
+            # A chave só avança nas letras, como na decodificação
+            return cipher_tables.vigenere(text.upper(), key, decrypt=False)
         except Exception as e:
             self.logger.error(f"Erro ao codificar Vigenère: {str(e)}")
             return None
@@ -659,7 +802,7 @@ class TextDecoder:
     def encode_rot13(self, text: str) -> Optional[str]:
         """Codifica texto usando ROT13"""
         try:
-            return codecs.encode(text, 'rot_13')
+            return cipher_tables.rotate(text, 13)
         except Exception as e:
             self.logger.error(f"Erro ao codificar ROT13: {str(e)}")
             return None
@@ -672,9 +815,13 @@ class TextDecoder:
             self.logger.error(f"Erro ao codificar ASCII: {str(e)}")
             return None
 
-    def format_braille_grade2(self, text: str, chars_per_line: int = 64) -> str:
+    def format_braille_grade2(self, text: str, chars_per_line: int = 64, highlight: str = "portare") -> str:
         """Formata texto Braille em grade2 para criar efeito visual"""
         try:
+            # Células da palavra destacada, tanto em grau 1 quanto em grau 2
+            highlight = highlight.lower()
+            highlight_cells = set(braille.encode(highlight)) | set(self.braille_grade2.encode(highlight))
+
             # Primeiro, vamos separar o texto em linhas do tamanho desejado
             lines = [text[i:i + chars_per_line] for i in range(0, len(text), chars_per_line)]
             
@@ -687,7 +834,7 @@ class TextDecoder:
                 formatted_line = ""
                 for char in line:
                     # Substitui cada caractere Braille por ⠿ ou ⠄
-                    if char in '⠏⠕⠗⠞⠁⠗⠑':  # Caracteres que formam PORTARE
+                    if char in highlight_cells:  # Caracteres que formam a palavra destacada
                         formatted_line += '⠿'
                     else:
                         formatted_line += '⠄'
@@ -0,0 +1,267 @@
+"""
+Busca de cifras de transposição (rail fence, colunar, cítala e rota)
+
+Toda transposição é uma permutação de posições: decifrar é uma única
+indexação NumPy, claro = cifrado[perm]. As permutações de cada família são
+calculadas como arrays (uma linha por chave), e muitas chaves são testadas
+juntas pontuando só o começo do texto claro com os quadrigramas.
+
+A colunar testa todas as ordens de colunas até 9 colunas (~400 mil chaves).
+O espaço é dividido em lotes pela primeira coluna lida, que podem rodar num
+pool de processos; cada lote devolve só seus melhores, e um heap guarda os
+top-k globais. Os finalistas são pontuados de novo no texto inteiro.
+"""
+
+import heapq
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import language_model
+from . import quadgrams
+
+# Letras do texto claro pontuadas na busca (o começo basta para separar as chaves)
+SAMPLE_SIZE = 80
+
+MAX_COLUMNS = 9
+MAX_RAILS = 20
+
+# Finalistas por família, repontuados no texto inteiro
+FINALISTS = 20
+
+ROUTES = ('spiral', 'spiral_ccw', 'snake_columns', 'columns')
+
+
+def _codes(text: str) -> np.ndarray:
+    """Code points do texto sem espaços em branco"""
+    return np.frombuffer(''.join(text.split()).encode('utf-32-le'), dtype=np.uint32)
+
+
+def _from_codes(codes: np.ndarray) -> str:
+    return codes.astype(np.uint32).tobytes().decode('utf-32-le')
+
+
+def _letter_indices(codes: np.ndarray) -> np.ndarray:
+    """Índice 0-25 de cada caractere, ou -1 para o que não é letra"""
+    upper = np.where((codes >= ord('a')) & (codes <= ord('z')), codes - 32, codes).astype(np.int64)
+    return np.where((upper >= ord('A')) & (upper <= ord('Z')), upper - ord('A'), -1)
+
+
+# Permutações de decifração (claro = cifrado[perm])
+
+def rail_fence_permutation(n: int, rails: int) -> np.ndarray:
+    """Rail fence: o cifrado lê o zigue-zague trilho por trilho"""
+    if rails < 2:
+        return np.arange(n)
+    cycle = 2 * (rails - 1)
+    phase = np.arange(n) % cycle
+    rail = np.minimum(phase, cycle - phase)
+    order = np.argsort(rail, kind='stable')   # posição clara de cada letra cifrada
+    return np.argsort(order)
+
+
+def columnar_permutations(n: int, ranks: np.ndarray, length: Optional[int] = None) -> np.ndarray:
+    """
+    Colunar com colunas irregulares, para várias chaves de uma vez (só as
+    primeiras `length` posições do texto claro, se indicado).
+
+    `ranks` (chaves x k) dá a ordem de leitura de cada coluna. A letra clara
+    i está na coluna i % k, linha i // k; no cifrado, ela fica no início da
+    sua coluna (soma dos tamanhos das colunas lidas antes) mais a linha.
+    """
+    ranks = np.atleast_2d(ranks)
+    k = ranks.shape[1]
+    lengths = n // k + (np.arange(k) < n % k)
+    read_order = np.argsort(ranks, axis=1)
+    read_lengths = lengths[read_order]
+    read_starts = np.cumsum(read_lengths, axis=1) - read_lengths
+    starts = np.empty_like(read_starts)
+    np.put_along_axis(starts, read_order, read_starts, axis=1)
+    positions = np.arange(n if length is None else min(length, n))
+    return starts[:, positions % k] + positions // k
+
+
+def scytale_permutation(n: int, turns: int) -> np.ndarray:
+    """Cítala: colunar com as colunas lidas na ordem natural"""
+    return columnar_permutations(n, np.arange(turns))[0]
+
+
+def route_permutation(rows: int, columns: int, route: str) -> np.ndarray:
+    """
+    Rota: o texto claro foi escrito em linhas numa grade (rows x columns) e o
+    cifrado lê a grade pelo caminho indicado (espiral horária ou anti-horária
+    a partir do canto superior esquerdo, colunas em zigue-zague ou colunas).
+    """
+    grid = np.arange(rows * columns).reshape(rows, columns)
+    if route == 'columns':
+        order = grid.T.ravel()
+    elif route == 'snake_columns':
+        order = np.concatenate([grid[::1 - 2 * (c % 2), c] for c in range(columns)])
+    elif route in ('spiral', 'spiral_ccw'):
+        pieces = []
+        rest = grid if route == 'spiral' else grid.T
+        while rest.size:
+            pieces.append(rest[0])
+            rest = np.rot90(rest[1:])   # gira para a próxima borda virar a primeira linha
+        order = np.concatenate(pieces)
+    else:
+        raise ValueError(f"Rota desconhecida: {route}")
+    return np.argsort(order)
+
+
+def keyword_ranks(keyword: str) -> np.ndarray:
+    """
+    Ordem de leitura das colunas por uma palavra-chave (letras iguais da
+    esquerda para a direita) ou por números separados por hífens ('3-10-1-2')
+    """
+    order = [int(part) for part in keyword.split('-')] if '-' in keyword else list(keyword.upper())
+    return np.argsort(np.argsort(order, kind='stable'), kind='stable')
+
+
+def format_key(ranks: Sequence[int]) -> str:
+    """Chave colunar para exibição: '3142' até 9 colunas, '3-10-1-...' a partir de 10"""
+    numbers = [str(int(rank) + 1) for rank in ranks]
+    return ('-' if len(numbers) > 9 else '').join(numbers)
+
+
+def decrypt(text: str, cipher: str, key) -> str:
+    """Decifra com uma família e chave conhecidas (o texto perde os espaços)"""
+    codes = _codes(text)
+    n = codes.size
+    if cipher == 'rail_fence':
+        perm = rail_fence_permutation(n, int(key))
+    elif cipher == 'scytale':
+        perm = scytale_permutation(n, int(key))
+    elif cipher == 'columnar':
+        ranks = keyword_ranks(key) if isinstance(key, str) else np.asarray(key)
+        perm = columnar_permutations(n, ranks)[0]
+    elif cipher == 'route':
+        columns, route = key
+        if n % columns:
+            raise ValueError("A rota exige uma grade completa")
+        perm = route_permutation(n // columns, columns, route)
+    else:
+        raise ValueError(f"Transposição desconhecida: {cipher}")
+    return _from_codes(codes[perm])
+
+
+# Busca
+
+def _top(scores: np.ndarray, keys, limit: int) -> List[Tuple[float, int, Any]]:
+    """Os `limit` melhores (nota, índice, chave) de um lote"""
+    if scores.size > limit:
+        chosen = np.argpartition(-scores, limit)[:limit]
+    else:
+        chosen = np.arange(scores.size)
+    return [(float(scores[i]), int(i), keys[i]) for i in chosen]
+
+
+def _columnar_shard(args) -> List[Tuple[float, int, Any]]:
+    """Um lote da colunar: todas as chaves de k colunas que leem `first` primeiro"""
+    letters, k, first, limit = args
+    n = letters.size
+    rest = [column for column in range(k) if column != first]
+    read_orders = np.array([(first,) + tail for tail in itertools.permutations(rest)], dtype=np.int64)
+    ranks = np.argsort(read_orders, axis=1)
+    # Só o começo do texto claro é montado e pontuado
+    perms = columnar_permutations(n, ranks, SAMPLE_SIZE)
+    best = _top(quadgrams.score_masked_rows(letters[perms]).max(axis=1), ranks, limit)
+    return [(score, index, tuple(int(r) for r in key)) for score, index, key in best]
+
+
+def _shards(letters: np.ndarray, max_columns: int, limit: int) -> Iterable[tuple]:
+    for k in range(2, min(max_columns, letters.size // 2) + 1):
+        for first in range(k):
+            yield (letters, k, first, limit)
+
+
+def _simple_limit(n: int) -> int:
+    """Voltas da cítala e colunas da rota testadas: até √n (ao menos MAX_RAILS), nunca mais que n/2"""
+    return min(n // 2, max(MAX_RAILS, math.isqrt(n)))
+
+
+def _simple_candidates(n: int) -> Iterable[Tuple[str, Any, np.ndarray]]:
+    """
+    Rail fence, cítala e rotas: poucas chaves, geradas direto. Só as
+    primeiras SAMPLE_SIZE posições de cada permutação são guardadas; a
+    permutação inteira é montada de novo só para os finalistas.
+    """
+    for rails in range(2, min(MAX_RAILS, n - 1) + 1):
+        yield 'rail_fence', rails, rail_fence_permutation(n, rails)[:SAMPLE_SIZE]
+    limit = _simple_limit(n)
+    for turns in range(2, limit + 1):
+        yield 'scytale', turns, columnar_permutations(n, np.arange(turns), SAMPLE_SIZE)[0]
+    for columns in range(2, limit + 1):
+        if n % columns == 0:
+            for route in ROUTES:
+                yield 'route', (columns, route), route_permutation(n // columns, columns, route)[:SAMPLE_SIZE]
+
+
+def search(text: str, top_k: int = 5, max_columns: int = MAX_COLUMNS,
+           workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Procura a transposição mais provável entre rail fence, cítala, rota e
+    colunar (todas as ordens até `max_columns` colunas). Com `workers` > 1
+    os lotes da colunar rodam em processos paralelos.
+
+    Retorna dicionários com 'cipher', 'key', 'text', 'score' e 'language'.
+    """
+    codes = _codes(text)
+    letters = _letter_indices(codes)
+    n = codes.size
+    if np.count_nonzero(letters >= 0) < 4:
+        return []
+
+    # Heap de mínimo com os melhores finalistas: (nota, desempate, família, chave)
+    heap: List[Tuple[float, int, str, Any]] = []
+    counter = itertools.count()
+
+    def push(score: float, cipher: str, key: Any) -> None:
+        item = (score, next(counter), cipher, key)
+        if len(heap) < FINALISTS:
+            heapq.heappush(heap, item)
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    simple = list(_simple_candidates(n))
+    if simple:
+        perms = np.stack([perm for _, _, perm in simple])
+        scores = quadgrams.score_masked_rows(letters[perms]).max(axis=1)
+        for score, index, _ in _top(scores, list(range(len(simple))), FINALISTS):
+            push(score, simple[index][0], simple[index][1])
+
+    shards = list(_shards(letters, max_columns, FINALISTS))
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_columnar_shard, shards))
+    else:
+        results = [_columnar_shard(shard) for shard in shards]
+    for result in results:
+        for score, _, ranks in result:
+            push(score, 'columnar', ranks)
+
+    # Finalistas: texto inteiro, pontuados juntos
+    finalists = sorted(heap, reverse=True)
+    candidates = []
+    seen = set()
+    for _, _, cipher, key in finalists:
+        if cipher == 'columnar':
+            plain = _from_codes(codes[columnar_permutations(n, np.array(key))[0]])
+            key = format_key(key)
+        else:
+            plain = decrypt(text, cipher, key)
+        if plain in seen:
+            continue   # a cítala e algumas rotas coincidem com colunares
+        seen.add(plain)
+        if cipher == 'route':
+            key = f"{key[0]}:{key[1]}"
+        candidates.append({'cipher': cipher, 'key': str(key), 'text': plain})
+    best = language_model.best_language(quadgrams.score_batch([c['text'] for c in candidates]))
+    for candidate, value, language in zip(candidates, best['score'], best['language']):
+        candidate['score'] = float(value)
+        candidate['language'] = str(language)
+    candidates.sort(key=lambda c: -c['score'])
+    return candidates[:top_k]
@@ -0,0 +1,182 @@
+"""
+Recuperação de chaves XOR (um byte ou chave repetida) em payloads binários
+
+Cada byte tem uma nota (log-probabilidade de aparecer num texto em
+português/inglês: letras, espaço, pontuação, bytes de acentos UTF-8). Como
+XOR com uma chave só permuta os valores dos bytes, a nota das 256 chaves
+sai do histograma do payload: uma tabela (256 chaves x 256 valores) de
+índices hist[valor ^ chave], sem percorrer os dados 256 vezes. Isso vale
+para megabytes de payload.
+
+Para chaves repetidas, o tamanho é estimado pela distância de Hamming
+normalizada entre o payload e ele mesmo deslocado (popcount vetorizado), e
+cada byte da chave é resolvido pela sua coluna com o mesmo histograma.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from . import language_model
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+MAX_KEY_LENGTH = 40
+
+# Bytes usados para estimar o tamanho da chave (a distância converge rápido)
+HAMMING_SAMPLE = 1 << 16
+
+# Bytes mínimos por coluna: abaixo disso cada byte da chave "decora" os
+# poucos bytes que cifra e o tamanho não é testado
+MIN_COLUMN = 8
+
+# Tamanhos de chave mais prováveis resolvidos e comparados
+TOP_LENGTHS = 4
+
+# Bytes de cada candidato decodificados para exibição
+PREVIEW = 1 << 20
+
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+# XOR_TABLE[chave, valor] = valor ^ chave
+XOR_TABLE = np.bitwise_xor.outer(np.arange(256), np.arange(256)).astype(np.uint8)
+
+
+def _byte_log_probs() -> np.ndarray:
+    """Log-probabilidade de cada byte num texto comum (modelo simples por classes)"""
+    probs = np.full(256, 1e-6)
+    letters = language_model.LETTER_PROBS.mean(axis=0)
+    probs[ord('a'):ord('z') + 1] = 0.70 * letters
+    probs[ord('A'):ord('Z') + 1] = 0.03 * letters
+    probs[ord(' ')] = 0.16
+    for char, share in ((',', 0.01), ('.', 0.01), ('\n', 0.005)):
+        probs[ord(char)] = share
+    probs[ord('0'):ord('9') + 1] = 0.002
+    for char in "!\"'()-:;?":
+        probs[ord(char)] = 0.001
+    probs[0x21:0x7f] = np.maximum(probs[0x21:0x7f], 1e-4)   # demais imprimíveis
+    probs[0xc3] = 0.005                                     # início de acento UTF-8
+    probs[0x80:0xc0] = 0.005 / 64                           # continuação UTF-8
+    return np.log(probs / probs.sum())
+
+
+BYTE_LOG_PROBS = _byte_log_probs()
+
+
+def _array(data: BytesLike) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def key_scores(histograms: np.ndarray) -> np.ndarray:
+    """
+    Nota média por byte de cada chave para cada histograma (k x 256):
+    resultado (k x 256 chaves), a partir da tabela hist[valor ^ chave].
+    """
+    histograms = np.atleast_2d(histograms).astype(np.float64)
+    totals = np.maximum(histograms.sum(axis=1, keepdims=True), 1)
+    # permuted[h, chave, valor] = quantos bytes viram `valor` com a chave
+    permuted = histograms[:, XOR_TABLE]
+    return (permuted @ BYTE_LOG_PROBS) / totals
+
+
+def apply_key(data: BytesLike, key: BytesLike) -> bytes:
+    """XOR do payload com a chave repetida"""
+    array = _array(data)
+    key_array = _array(key)
+    if key_array.size == 0:
+        return bytes(array)
+    return (array ^ np.resize(key_array, array.size)).tobytes()
+
+
+def _candidate(data: np.ndarray, key: np.ndarray, score: float) -> Dict[str, Any]:
+    plain = (data ^ np.resize(key, data.size)).tobytes()
+    return {
+        'key': key.tobytes(),
+        'key_hex': key.tobytes().hex(),
+        'data': plain,
+        'text': plain[:PREVIEW].decode('utf-8', errors='replace'),
+        'score': score
+    }
+
+
+def single_byte(data: BytesLike, top_k: int = 5) -> List[Dict[str, Any]]:
+    """As 256 chaves de um byte pontuadas juntas; retorna as `top_k` melhores"""
+    array = _array(data)
+    if array.size == 0:
+        return []
+    scores = key_scores(np.bincount(array, minlength=256))[0] - np.log(256) / array.size
+    order = np.argsort(-scores, kind='stable')[:top_k]
+    return [_candidate(array, np.array([key], dtype=np.uint8), float(scores[key])) for key in order]
+
+
+def hamming_profile(data: BytesLike, max_length: int = MAX_KEY_LENGTH) -> np.ndarray:
+    """
+    Distância de Hamming normalizada (bits diferentes por bit) entre o payload
+    e ele mesmo deslocado de L bytes, para L = 1..max_length. Com a chave de
+    tamanho L (ou múltiplo), os bytes alinhados tiveram a mesma chave e a
+    distância cai para a do texto claro.
+    """
+    array = _array(data)[:HAMMING_SAMPLE]
+    max_length = min(max_length, array.size - 1)
+    profile = np.ones(max(max_length, 0))
+    for length in range(1, max_length + 1):
+        profile[length - 1] = POPCOUNT[array[length:] ^ array[:-length]].mean() / 8
+    return profile
+
+
+def _minimal_key(key: np.ndarray) -> np.ndarray:
+    """Reduz uma chave repetida (ABAB) à sua menor unidade (AB)"""
+    for size in range(1, key.size + 1):
+        if key.size % size == 0 and np.array_equal(np.resize(key[:size], key.size), key):
+            return key[:size]
+    return key
+
+
+def repeating_key(data: BytesLike, top_k: int = 5, max_length: int = MAX_KEY_LENGTH,
+                  deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Recupera chaves XOR repetidas: os tamanhos com menor distância de Hamming
+    são resolvidos coluna por coluna (histograma de cada coluna contra as
+    256 chaves de uma vez) e os resultados são ranqueados pela nota dos bytes.
+    Com `deadline` (um instante de time.monotonic), os tamanhos seguintes
+    deixam de ser testados quando o prazo passa.
+    """
+    array = _array(data)
+    max_length = min(max_length, array.size // MIN_COLUMN)
+    if max_length < 2:
+        return single_byte(array, top_k)
+    profile = hamming_profile(array, max_length)
+    lengths = np.argsort(profile, kind='stable')[:TOP_LENGTHS] + 1
+
+    candidates = {}
+    positions = np.arange(array.size)
+    for length in sorted(int(length) for length in lengths):
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        histograms = np.bincount((positions % length) * 256 + array,
+                                 minlength=length * 256).reshape(length, 256)
+        key = _minimal_key(key_scores(histograms).argmax(axis=1).astype(np.uint8))
+        if key.tobytes() in candidates:
+            continue
+        plain_histogram = np.bincount(array ^ np.resize(key, array.size), minlength=256)
+        # Cada byte da chave é um parâmetro livre (escolhido entre 256): sem a
+        # penalidade, chaves longas "decoram" payloads curtos
+        score = float(key_scores(plain_histogram)[0, 0]) - key.size * np.log(256) / array.size
+        candidates[key.tobytes()] = (key, score)
+
+    ranked = sorted(candidates.values(), key=lambda item: -item[1])[:top_k]
+    return [_candidate(array, key, score) for key, score in ranked]
+
+
+def solve(data: BytesLike, top_k: int = 5, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Chaves de um byte e repetidas juntas, da mais provável para a menos; as
+    repetidas só são procuradas até o prazo `deadline`, se houver
+    """
+    found = {}
+    for candidate in single_byte(data, top_k) + repeating_key(data, top_k, deadline=deadline):
+        previous = found.get(candidate['key'])
+        if previous is None or candidate['score'] > previous['score']:
+            found[candidate['key']] = candidate
+    return sorted(found.values(), key=lambda candidate: -candidate['score'])[:top_k]
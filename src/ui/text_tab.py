@@ -100,7 +100,9 @@ class TextTab(ttk.Frame):
             ("Vigenère", "vigenere"),
             ("Binário", "binary"),
             ("Hexadecimal", "hex"),
-            ("ROT13", "rot13")
+            ("ROT13", "rot13"),
+            ("Automático", "auto"),
+            ("Camadas", "layers")
         ]
         
         for text, value in decoders:
@@ -358,7 +360,8 @@ NÚMEROS:
 
 Exemplo: 3:KHOOR (decodifica para "Hello")
 
-Dica: Se não souber o deslocamento, tente números diferentes ou deixe em branco para ver todas as possibilidades."""
+Dica: Se não souber o deslocamento, deixe em branco para ver todas as possibilidades,
+da mais provável (português/inglês) para a menos provável."""
             
             self.instructions.insert(tk.END, instructions)
             
@@ -387,7 +390,8 @@ Exemplo: SVOOL (decodifica para "HELLO")"""
 Exemplo: KEY:RIJVS (com chave "KEY" decodifica para "HELLO")
 
 Dica: A chave é repetida para cobrir todo o texto. Se não souber a chave,
-tente palavras relacionadas ao contexto ou ao jogo."""
+cole só o texto cifrado: as chaves mais prováveis são estimadas pela
+frequência das letras e listadas da melhor para a pior."""
             
             self.instructions.insert(tk.END, instructions)
             
@@ -417,6 +421,32 @@ Exemplos:
             
             self.instructions.insert(tk.END, instructions)
             
+        elif self.decode_type.get() == "auto":
+            instructions = """INSTRUÇÕES PARA DETECÇÃO AUTOMÁTICA:
+
+1. Cole o texto codificado
+2. Clique em "Processar"
+
+O formato (Base64, hexadecimal, binário, Morse, Braille, ASCII decimal
+ou texto cifrado só com letras) é detectado automaticamente e o texto é
+decodificado com o formato mais provável."""
+            
+            self.instructions.insert(tk.END, instructions)
+            
+        elif self.decode_type.get() == "layers":
+            instructions = """INSTRUÇÕES PARA DECODIFICAÇÃO EM CAMADAS:
+
+1. Cole o texto codificado em várias camadas
+2. Clique em "Processar"
+
+As combinações de decodificadores (Base64, hexadecimal, binário, Morse,
+César, Atbash, Vigenère...) são testadas automaticamente e as melhores
+cadeias são listadas com o caminho usado.
+
+Exemplo: hex -> base64 -> caesar(7): THE PATH IS THE ANSWER"""
+            
+            self.instructions.insert(tk.END, instructions)
+            
         else:  # rot13
             instructions = """INSTRUÇÕES PARA DECODIFICAÇÃO ROT13:
 
@@ -448,6 +478,17 @@ Exemplo: URYYB (decodifica para "HELLO")"""
         mode = self.mode_var.get()
         
         try:
+            # Detecta o formato, usando o mais provável que tenha decodificador
+            if decode_type == "auto":
+                detected = [fmt for fmt in self.decoder.detect_encoding(input_text)
+                            if hasattr(self.decoder, f"{mode}_{fmt}")]
+                if not detected:
+                    self.output_text.delete("1.0", tk.END)
+                    self.output_text.insert("1.0", "Formato não reconhecido")
+                    return
+                decode_type = detected[0]
+                
+
             # Chama o método apropriado do decoder
             method_name = f"{mode}_{decode_type}"
             decoder_method = getattr(self.decoder, method_name, None)
@@ -1,5 +1,39 @@
+import base64
+import json
+import os
+import tempfile
+import time
 import unittest
+
+import numpy as np
+
 from src.decoders.text_decoder import TextDecoder
+from src.decoders import bacon
+from src.decoders import base_n
+from src.decoders import braille
+from src.decoders import cipher_families
+from src.decoders import cipher_tables
+from src.decoders import grid_ciphers
+from src.decoders import hill
+from src.decoders import morse
+from src.decoders import numeric
+from src.decoders import quadgrams
+from src.decoders import stego
+from src.decoders import transposition
+from src.decoders import xor_analysis
+
+# Textos fora dos corpora do modelo de quadrigramas, para testar a quebra
+# de cifras em texto que o modelo nunca viu
+HELD_OUT = {
+    'en': ("FOUR SCORE AND SEVEN YEARS AGO OUR FATHERS BROUGHT FORTH ON THIS CONTINENT A NEW NATION, "
+           "CONCEIVED IN LIBERTY, AND DEDICATED TO THE PROPOSITION THAT ALL MEN ARE CREATED EQUAL. NOW WE "
+           "ARE ENGAGED IN A GREAT CIVIL WAR, TESTING WHETHER THAT NATION, OR ANY NATION SO CONCEIVED AND "
+           "SO DEDICATED, CAN LONG ENDURE. WE ARE MET ON A GREAT BATTLEFIELD OF THAT WAR."),
+    'pt': ("UMA NOITE DESTAS, VINDO DA CIDADE PARA O ENGENHO NOVO, ENCONTREI NO TREM DA CENTRAL UM RAPAZ "
+           "AQUI DO BAIRRO, QUE EU CONHECO DE VISTA E DE CHAPEU. CUMPRIMENTOU-ME, SENTOU-SE AO PE DE MIM, "
+           "FALOU DA LUA E DOS MINISTROS, E ACABOU RECITANDO-ME VERSOS. A VIAGEM ERA CURTA, E OS VERSOS "
+           "PODE SER QUE NAO FOSSEM INTEIRAMENTE MAUS.")
+}
 
 class TestTextDecoder(unittest.TestCase):
     def setUp(self):
@@ -97,5 +131,426 @@ class TestTextDecoder(unittest.TestCase):
         result = self.decoder.decode_vigenere(encrypted, key)
         self.assertEqual(result, "HELLO WORLD")
 
+    def test_cipher_tables(self):
+        """Testa as cifras baseadas em tabelas de tradução"""
+        self.assertEqual(self.decoder.caesar_cipher("Khoor, Zruog!", -3), "Hello, World!")
+        self.assertEqual(self.decoder.atbash_cipher("Svool"), "Hello")
+        self.assertEqual(self.decoder.decode_caesar("3:khoor"), "HELLO")
+        self.assertEqual(self.decoder.decode_rot13("uryyb"), "HELLO")
+        self.assertEqual(self.decoder.decode_vigenere("KEY:RIJVS"), "HELLO")
+        # A chave só avança nas letras, nos dois sentidos
+        self.assertEqual(self.decoder.encode_vigenere("key:Hello, World!"), "RIJVS, UYVJN!")
+        self.assertEqual(self.decoder.decode_vigenere("KEY:RIJVS, UYVJN!"), "HELLO, WORLD!")
+        self.assertIsNone(self.decoder.encode_vigenere(":HELLO"))
+        self.assertEqual(cipher_tables.rotate(b"Abc-z", 1), b"Bcd-a")
+
+    def test_caesar_brute_force(self):
+        """Testa a força bruta de César com ranking dos candidatos"""
+        candidates = self.decoder.brute_force_caesar("WKH TXLFN EURZQ IRA MXPSV RYHU WKH ODCB GRJ", top_k=3)
+        self.assertEqual(len(candidates), 3)
+        self.assertEqual(candidates[0]['shift'], 3)
+        self.assertEqual(candidates[0]['text'], "THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG")
+        self.assertGreaterEqual(candidates[0]['score'], candidates[1]['score'])
+
+    def test_vigenere_keyless(self):
+        """Testa a recuperação da chave de Vigenère sem conhecê-la"""
+        plain = ("IT WAS THE BEST OF TIMES IT WAS THE WORST OF TIMES IT WAS THE AGE OF WISDOM "
+                 "IT WAS THE AGE OF FOOLISHNESS IT WAS THE EPOCH OF BELIEF")
+        encrypted = self.decoder.encode_vigenere("STRACH:" + plain.replace(" ", ""))
+        candidates = self.decoder.solve_vigenere(encrypted)
+        self.assertEqual(candidates[0]['key'], "STRACH")
+        self.assertEqual(candidates[0]['text'], plain.replace(" ", ""))
+
+    def test_quadgram_ranking(self):
+        """Testa o ranking de candidatos pelo modelo de quadrigramas"""
+        texts = ["XQZVKJWQPPLMXQZV", "THE KEY IS UNDER THE DOOR", "A CHAVE ESTA NA PORTA"]
+        scores = quadgrams.score_batch(texts)
+        self.assertEqual(scores.shape, (3, 2))
+        ranked = self.decoder.rank_candidates([{'text': text} for text in texts])
+        self.assertEqual(ranked[-1]['text'], texts[0])
+        self.assertEqual({candidate['text']: candidate['language'] for candidate in ranked[:2]},
+                         {texts[1]: 'en', texts[2]: 'pt'})
+        self.assertTrue(np.isneginf(quadgrams.score_batch(["abc"])).all())
+
+    def test_crib_detection(self):
+        """Testa a busca das palavras do jogo nos candidatos"""
+        hits = self.decoder.find_cribs(["A CHAVE E ZNA LOST", "nada aqui", "o arquivo demo_disc e o dreamcatcher"])
+        self.assertEqual(hits, [['ZNALOST'], [], ['DEMODISC', 'DREAMCATCHER']])
+        self.decoder.add_cribs(["portare"])
+        self.assertEqual(self.decoder.find_cribs(["PORTARE"]), [['PORTARE']])
+        # Um deslocamento com palavra do jogo vence o ranking estatístico
+        candidates = self.decoder.brute_force_caesar(cipher_tables.rotate("STRACH", 5), top_k=3)
+        self.assertEqual(candidates[0]['text'], "STRACH")
+        self.assertEqual(candidates[0]['cribs'], ['STRACH'])
+        # Nenhum caractere é reservado: um \x00 no candidato não impede a decodificação
+        self.assertEqual(self.decoder.find_cribs(["ZNA\x00LOST", "DEMO_DISC"]), [['ZNALOST'], ['DEMODISC']])
+        # Cribs curtos só casam como palavras inteiras
+        self.assertEqual(self.decoder.find_cribs(["A COW", "SCOWL", "CO WL", "cow."]), [['COW'], [], [], ['COW']])
+        # O crib é um bônus limitado: o deslocamento errado que contém COW
+        # (SEM -> COW) não passa na frente do texto claro
+        plain = "O MENINO SAIU SEM CASACO E VOLTOU PARA CASA MOLHADO DA CHUVA"
+        candidates = self.decoder.brute_force_caesar(cipher_tables.rotate(plain, 7), top_k=26)
+        self.assertEqual(candidates[0]['text'], plain)
+        wrong = next(candidate for candidate in candidates if candidate['shift'] == 23)
+        self.assertEqual(wrong['cribs'], ['COW'])
+        self.assertTrue(self.decoder.decode_caesar("KHOOR\x00ZRUOG").startswith("Shift 3: HELLO\x00WORLD"))
+
+    def test_substitution_solver(self):
+        """Testa a quebra de substituição simples sem a chave, em textos fora do corpus do modelo"""
+        key = "QWERTYUIOPASDFGHJKLZXCVBNM"
+        for language, plain in HELD_OUT.items():
+            cipher = plain.translate(str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", key))
+            best = self.decoder.solve_substitution(cipher)[0]
+            self.assertEqual(best['language'], language)
+            matches = sum(a == b for a, b in zip(best['text'], plain))
+            self.assertGreater(matches / len(plain), 0.95, language)
+        # Com a chave de decifração, ela é aplicada diretamente
+        inverse = ''.join(chr(ord('A') + key.index(c)) for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        self.assertEqual(self.decoder.decode_substitution(f"{inverse}:{cipher}"), plain)
+
+    def test_cipher_families(self):
+        """Testa a quebra de afim, Beaufort, Gronsfeld, Porta e autokey"""
+        plain = HELD_OUT['en']
+        letters = np.array([ord(c) - ord('A') for c in plain if c.isalpha()])
+        keystream = np.resize([11, 14, 2, 10], letters.size)  # LOCK
+        encrypted = {
+            'affine': (7 * letters + 3) % 26,
+            'beaufort': (keystream - letters) % 26,
+            'gronsfeld': (letters + np.resize([3, 1, 4], letters.size)) % 26,
+            'porta': cipher_families.PORTA_TABLE[keystream // 2, letters],
+            'autokey': (letters + np.concatenate(([11, 14, 2, 10], letters))[:letters.size]) % 26,
+        }
+        texts = {}
+        for family, values in encrypted.items():
+            chars = iter(chr(ord('A') + int(v)) for v in values)
+            texts[family] = ''.join(next(chars) if c.isalpha() else c for c in plain)
+
+        best = self.decoder.brute_force_affine(texts['affine'])[0]
+        self.assertEqual((best['a'], best['b'], best['text']), (7, 3, plain))
+        self.assertEqual(self.decoder.decode_affine(f"7,3:{texts['affine']}"), plain)
+        for family, key in [('beaufort', 'LOCK'), ('gronsfeld', '314'), ('porta', 'KOCK'), ('autokey', 'LOCK')]:
+            best = cipher_families.solve(texts[family], family)[0]
+            self.assertEqual((best['key'], best['text']), (key, plain), family)
+        self.assertEqual(self.decoder.decode_beaufort(f"LOCK:{texts['beaufort']}"), plain)
+
+    def test_transposition_search(self):
+        """Testa a busca de rail fence e colunar sem a chave"""
+        plain = ("THELABYRINTHKEEPSITSSECRETSWELLHIDDENBEHINDDOORSTHATONLYOPEN"
+                 "FORTHOSEWHOKNOWTHERIGHTWORDSEVERYROOMHOLDSANOBJECT")
+        for cipher, key, perm in [
+            ('rail_fence', '3', transposition.rail_fence_permutation(len(plain), 3)),
+            ('columnar', '512384697',
+             transposition.columnar_permutations(len(plain), transposition.keyword_ranks("LABIRINTO"))[0]),
+        ]:
+            encrypted = np.empty(len(plain), dtype='<U1')
+            encrypted[perm] = list(plain)
+            best = transposition.search(''.join(encrypted))[0]
+            self.assertEqual((best['cipher'], best['key'], best['text']), (cipher, key, plain))
+        self.assertEqual(self.decoder.decode_rail_fence("3:WECRLTEERDSOEEFEAOCAIVDEN"),
+                         "WEAREDISCOVEREDFLEEATONCE")
+        self.assertEqual(self.decoder.decode_columnar("ZEBRAS:EVLNACDTESEAROFODEECWIREE"),
+                         "WEAREDISCOVEREDFLEEATONCE")
+        # A partir de 10 colunas a chave exibida leva hífens e volta às mesmas ordens
+        ranks = transposition.keyword_ranks("LABIRINTOS")
+        key = transposition.format_key(ranks)
+        self.assertEqual(key, "5-1-2-3-8-4-6-10-7-9")
+        self.assertEqual(transposition.keyword_ranks(key).tolist(), ranks.tolist())
+        encrypted = np.empty(len(plain), dtype='<U1')
+        encrypted[transposition.columnar_permutations(len(plain), ranks)[0]] = list(plain)
+        self.assertEqual(self.decoder.decode_columnar(f"{key}:{''.join(encrypted)}"), plain)
+
+    def test_hill_key_recovery(self):
+        """Testa a recuperação de chaves de Hill 2x2 e 3x3"""
+        plain = HELD_OUT['pt']
+        letters = ''.join(c for c in plain if c.isalpha())
+        self.assertEqual(hill.encrypt("ACT", "GYBNQKURP"), "POH")
+        for key in ("HILL", "GYBNQKURP"):
+            encrypted = hill.encrypt(plain, key)
+            best = self.decoder.solve_hill(encrypted, size=int(len(key) ** 0.5))[0]
+            self.assertEqual(best['key'], key)
+            self.assertTrue(best['text'].startswith(letters[:-2]))
+            self.assertEqual(self.decoder.decode_hill(f"{key}:{encrypted}")[:len(letters)], letters)
+
+    def test_bacon_variants(self):
+        """Testa Bacon com dois símbolos, maiúsculas/minúsculas, fases e polaridade"""
+        letters = bacon.ALPHABETS[26]
+        bits = ''.join(format(letters.index(c), '05b') for c in "THELABYRINTH")
+        self.assertEqual(self.decoder.decode_bacon(bits.replace('0', 'A').replace('1', 'B')), "THELABYRINTH")
+        # Símbolos quaisquer, nas duas polaridades
+        self.assertEqual(self.decoder.decode_bacon(bits.translate(str.maketrans('01', '#*'))), "THELABYRINTH")
+        inverted = bits.translate(str.maketrans('01', '*#'))
+        self.assertEqual(self.decoder.decode_bacon(inverted), "THELABYRINTH")
+        # Bits escondidos na caixa de um texto de cobertura, fora de fase e no alfabeto de 24 letras
+        bits = ''.join(format(bacon.ALPHABETS[24].index(c), '05b') for c in "SEGREDO")
+        cover = "osxlabirintoguardamuitossegredosantigosparaquem"
+        hidden = ''.join(c.upper() if b == '1' else c for c, b in zip(cover, bits))
+        best = self.decoder.scan_bacon("xx " + hidden, top_k=1)[0]
+        self.assertEqual((best['text'], best['classifier'], best['alphabet'], best['offset']),
+                         ("SEGREDO", 'case', 24, 2))
+        self.assertIsNone(self.decoder.decode_bacon("AABCC"))
+        self.assertEqual(self.decoder.decode_bacon("AABAA BABAA AABBA"), "EUG")
+        self.assertEqual(self.decoder.detect_format("AABAA BABAA AABBA"), "bacon")
+
+    def test_grid_ciphers(self):
+        """Testa tap code, Polybius com palavra-chave, Nihilist, ADFGVX e a busca da grade"""
+        self.assertEqual(self.decoder.decode_tap(".... ... ... .... .... ... / . ..... . ....."), "SOS EE")
+        self.assertEqual(self.decoder.decode_polybius("23 15 31 31 34"), "HELLO")
+        plain = "OSEGREDOESTANASALADOLABIRINTOPERTODAPORTAPRINCIPAL"
+        grid = grid_ciphers.keyed_grid("LABIRINTO")
+        position = {grid_ciphers.SYMBOLS[symbol]: cell for cell, symbol in enumerate(grid)}
+        coordinates = [(position[c] // 5 + 1) * 10 + position[c] % 5 + 1 for c in plain]
+        self.assertEqual(self.decoder.decode_polybius("LABIRINTO:" + ' '.join(map(str, coordinates))), plain)
+        best = self.decoder.search_grid_keywords(' '.join(map(str, coordinates)))[0]
+        self.assertEqual((best['keyword'], best['text']), ("LABIRINTO", plain))
+        # Nihilist: coordenada do texto claro + coordenada da chave MEDO
+        key = [(position[c] // 5 + 1) * 10 + position[c] % 5 + 1 for c in "MEDO"]
+        numbers = ' '.join(str(value + key[i % 4]) for i, value in enumerate(coordinates))
+        self.assertEqual(self.decoder.decode_nihilist(f"LABIRINTO,MEDO:{numbers}"), plain)
+        # ADFGX: pares de rótulos da grade 5x5 e transposição colunar com a chave PORTA
+        stream = ''.join('ADFGX'[position[c] // 5] + 'ADFGX'[position[c] % 5] for c in plain)
+        perm = transposition.columnar_permutations(len(stream), transposition.keyword_ranks("PORTA"))[0]
+        encrypted = np.empty(len(stream), dtype='<U1')
+        encrypted[perm] = list(stream)
+        self.assertEqual(self.decoder.decode_adfgvx(f"LABIRINTO,PORTA:{''.join(encrypted)}"), plain)
+
+    def test_xor_analysis(self):
+        """Testa a recuperação de chaves XOR de um byte e repetidas, e o XOR como camada"""
+        plain = ("O segredo do labirinto está guardado atrás da porta principal, "
+                 "perto da fonte antiga onde a estátua aponta para o norte. ").encode('utf-8') * 3
+        best = xor_analysis.solve(xor_analysis.apply_key(plain, b'\x5a'))[0]
+        self.assertEqual((best['key'], best['data']), (b'\x5a', plain))
+        for key in (b'ICE', b'labirinto', b'\x13\x37\xbe\xef\x42'):
+            best = self.decoder.solve_xor(xor_analysis.apply_key(plain, key))[0]
+            self.assertEqual((best['key'], best['data']), (key, plain))
+        encrypted = xor_analysis.apply_key(plain, b'k3y')
+        self.assertEqual(self.decoder.decode_xor(encrypted.hex()), plain.decode('utf-8'))
+        self.assertEqual(self.decoder.decode_xor("6b3379:" + encrypted.hex()), plain.decode('utf-8'))
+        paths = [result['path'] for result in self.decoder.solve_layers(base64.b64encode(encrypted).decode(), top_k=10)]
+        self.assertIn(['base64+xor(6b3379)'], paths)
+
+    def test_numeric_schemes(self):
+        """Testa os esquemas numéricos (decimal, octal, A1Z26, T9, romanos) e o ranking entre eles"""
+        cases = {
+            "72 101 108 108 111": ('decimal', "Hello"),
+            "110 145 154 154 157": ('octal', "Hello"),
+            "8-5-12-12-15 23-15-18-12-4": ('a1z26', "HELLO WORLD"),
+            "8 5 12 12 15 / 23 15 18 12 4": ('a1z26', "HELLO WORLD"),
+            "44 33 555 555 666 0 9 666 777 555 3": ('t9', "HELLO WORLD"),
+            "VIII V XII XII XV": ('roman', "HELLO"),
+            "LXXII CI CVIII CVIII CXI": ('roman_ascii', "Hello"),
+        }
+        for text, (scheme, plain) in cases.items():
+            best = self.decoder.scan_numeric(text)[0]
+            self.assertEqual((best['scheme'], best['text']), (scheme, plain))
+        self.assertEqual(self.decoder.decode_numeric("t9:44 33 555 555 666"), "HELLO")
+        self.assertEqual(self.decoder.decode_ascii("72 105"), "Hi")
+        self.assertEqual(numeric.parse_radix(numeric.tokenize("17 9 " + "1" * 30), 8).tolist(), [15, -1, -1])
+        with self.assertRaises(ValueError):
+            numeric.decode("72 999999999", 'decimal')
+
+    def test_base_n_family(self):
+        """Testa a família Base-N: ida e volta, padding/espaços tolerados, fluxo e detecção"""
+        message = "O segredo do labirinto está na porta principal".encode('utf-8')
+        for codec in base_n.CODECS:
+            encoded = base_n.encode(message, codec)
+            self.assertEqual(self.decoder.decode_base(encoded, codec), message.decode('utf-8'))
+            self.assertEqual(self.decoder.decode_base(encoded), message.decode('utf-8'))
+            chunks = [encoded[i:i + 7] for i in range(0, len(encoded), 7)]
+            self.assertEqual(b''.join(self.decoder.stream_decode(chunks, codec)), message)
+        self.assertEqual(base_n.decode("1112", 58), b"\x00\x00\x00\x01")
+        self.assertEqual(self.decoder.decode_base64("SGVsbG8g\nV29ybGQ"), "Hello World")
+        self.assertEqual(self.decoder.decode_base("jbswy3dp", 32), "Hello")
+        self.assertEqual(self.decoder.detect_format("JBSWY3DPEBLW64TMMQ======"), "base32")
+        self.assertEqual(self.decoder.detect_format("<~87cURD]i,\"Ebo80~>"), "ascii85")
+        self.assertIsNone(self.decoder.decode_base("Hello World", 91))
+
+    def test_bytes_pipeline(self):
+        """Testa as entradas em bytes: etapas encadeadas sem passar por texto, mesmo fora do UTF-8"""
+        payload = b"\xff\xfe\x00 segredo binario"
+        layered = base64.b64encode(payload).hex().encode()
+        self.assertEqual(self.decoder.decode_chain(layered, ['hex', 'base64']), payload)
+        self.assertEqual(self.decoder.decode_chain(memoryview(layered), ['hex', 'base64']), payload)
+        self.assertEqual(self.decoder.decode_bytes(bytearray(b"0x48 0x69"), 'hex'), b"Hi")
+        self.assertEqual(self.decoder.decode_bytes("de:ad:BE:ef", 'hex'), b"\xde\xad\xbe\xef")
+        self.assertEqual(self.decoder.decode_bytes(b"01001000 01101001", 'binary'), b"Hi")
+        self.assertEqual(self.decoder.decode_bytes(memoryview(b"JBSWY3DP"), 'base32'), b"Hello")
+        self.assertEqual(self.decoder.decode_hex(b"48656c6c6f"), "Hello")
+        self.assertEqual(self.decoder.decode_base64(memoryview(b"SGVsbG8=")), "Hello")
+        with self.assertRaises(ValueError):
+            self.decoder.decode_bytes(b"4g", 'hex')
+        self.assertIsNone(self.decoder.decode_hex("fffe"))
+        # As variantes da aba Braille usam os mesmos kernels e ignoram o que não é dígito
+        self.assertEqual(self.decoder.decode_binary_braille("01001000, 01101001!"), "Hi")
+        self.assertEqual(self.decoder.decode_binary_braille("11101001"), "é")
+        self.assertTrue(self.decoder.decode_binary_braille("0100100").startswith("Erro"))
+        self.assertEqual(self.decoder.decode_hex_braille("48 65:6C-6c 6f"), "Hello")
+        self.assertTrue(self.decoder.decode_hex_braille("486").startswith("Erro"))
+
+    def test_carve_fragments(self):
+        """Testa a extração de fragmentos codificados no meio de prosa, inteira e em pedaços"""
+        secrets = ["A chave está no relógio da torre", "Siga o rio até a ponte velha", "Hello"]
+        encoded = [base64.b64encode(secrets[0].encode('utf-8')).decode(),
+                   secrets[1].encode('utf-8').hex(),
+                   ' '.join(f"{b:08b}" for b in secrets[2].encode())]
+        filler = "Relatório do turno da noite, nada de incomum por aqui. " * 40
+        dump = filler + encoded[0] + ". " + filler + encoded[1] + "\n" + filler + encoded[2] + " fim"
+        fragments = self.decoder.carve_fragments(dump)
+        self.assertEqual([f['kind'] for f in fragments], ['base64', 'hex', 'binary'])
+        self.assertEqual([f['text'] for f in fragments], secrets)
+        for fragment, chunk in zip(fragments, encoded):
+            self.assertEqual(dump[fragment['start']:fragment['end']], chunk)
+        chunks = [dump[i:i + 300] for i in range(0, len(dump), 300)]
+        self.assertEqual(self.decoder.carve_fragments(chunks), fragments)
+        self.assertEqual(self.decoder.carve_fragments("palavrasmuitolongasmasnormais " * 5), [])
+        self.assertIn("base64: " + secrets[0], self.decoder.decode_fragments(dump))
+
+    def test_stego_extraction(self):
+        """Testa a extração de mensagens em caracteres de largura zero e em espaços no fim das linhas"""
+        bits = ''.join(f"{b:08b}" for b in "segredo na torre".encode())
+        cover = "Bom dia a todos, a reunião foi remarcada para quinta."
+        hidden = bits.translate(str.maketrans('01', '\u200b\u200c'))
+        text = cover[:10] + hidden + cover[10:]
+        self.assertEqual(self.decoder.decode_stego(text), "segredo na torre")
+        self.assertEqual(self.decoder.detect_format(text), "stego")
+        # Invertido e com um separador entre os caracteres (tamanho variável)
+        groups = '\u200b'.join(format(ord(c), 'b').translate(str.maketrans('01', '\u200d\u200c'))
+                                for c in "segredo na torre")
+        self.assertEqual(self.decoder.decode_stego(cover + groups), "segredo na torre")
+        # Espaço = 0 e tab = 1 no fim das linhas
+        trailing = bits.translate(str.maketrans('01', ' \t'))
+        lines = [f"linha {i}" + trailing[i * 16:(i + 1) * 16] for i in range(8)]
+        self.assertEqual(self.decoder.scan_stego("\n".join(lines), top_k=1)[0]['text'], "segredo na torre")
+        self.assertEqual(self.decoder.analyze_stego("\n".join(lines))['trailing'], len(bits))
+        # Mensagens curtas: a leitura em bytes enquadrada vence as de 5 e 7 bits
+        for word in ("hi", "ok", "key", "flag"):
+            word_bits = ''.join(f"{b:08b}" for b in word.encode())
+            zero_width = cover + word_bits.translate(str.maketrans('01', '\u200b\u200c'))
+            self.assertEqual(self.decoder.decode_stego(zero_width), word)
+            framed = '\u200d'.join(word_bits[i:i + 8] for i in range(0, len(word_bits), 8))
+            self.assertEqual(self.decoder.decode_stego(cover + framed.translate(str.maketrans('01', '\u200b\u200c'))),
+                             word)
+            lines = [f"linha {i}" + word_bits[i * 8:(i + 1) * 8].translate(str.maketrans('01', ' \t'))
+                     for i in range(len(word))]
+            self.assertEqual(self.decoder.scan_stego("\n".join(lines), top_k=1)[0]['text'], word)
+        # Um BOM no início ou espaços no fim das linhas sozinhos não são suspeitos
+        self.assertFalse(stego.analyze("\ufeff" + cover)['suspicious'])
+        self.assertFalse(stego.analyze("linha um   \nlinha dois  ")['suspicious'])
+        self.assertEqual(self.decoder.scan_stego(cover), [])
+
+    def test_stream_decode(self):
+        """Testa a decodificação em fluxo com quanta divididos entre pedaços"""
+        self.assertEqual(b''.join(self.decoder.stream_decode(["SGVs", "bG8g", "V29y", "bGQ="], 'base64')),
+                         b"Hello World")
+        self.assertEqual(b''.join(self.decoder.stream_decode(["SGVsb", "G8"], 'base64')), b"Hello")
+        self.assertEqual(b''.join(self.decoder.stream_decode(["0x48 0", "x69"], 'hex')), b"Hi")
+        self.assertEqual(b''.join(self.decoder.stream_decode(["0100", "1000 011", "01001"], 'binary')), b"Hi")
+        with self.assertRaises(ValueError):
+            b''.join(self.decoder.stream_decode(["0100100"], 'binary'))
+
+    def test_detect_encoding_ranking(self):
+        """Testa a detecção de formatos ordenada pela confiança"""
+        self.assertEqual(self.decoder.detect_format("SGVsbG8gV29ybGQ="), "base64")
+        self.assertEqual(self.decoder.detect_format("SGVsbG8_d29ybGQ-"), "base64")
+        self.assertEqual(self.decoder.detect_format("48656C6C6F"), "hex")
+        self.assertEqual(self.decoder.detect_format("01001000 01101001"), "binary")
+        self.assertEqual(self.decoder.detect_format("72 69 76 76 79"), "ascii")
+        self.assertEqual(self.decoder.detect_format("KHOOR ZRUOG"), "caesar")
+        self.assertIsNone(self.decoder.detect_format("   "))
+        encodings = self.decoder.detect_encoding("01001000 01101001")
+        self.assertEqual(list(encodings.values()), sorted(encodings.values(), reverse=True))
+        # Checagens derivadas do histograma ou só rodadas quando as classes permitem
+        self.assertIn('tap', self.decoder.detect_encoding(".... ... / ... .... .... ..."))
+        self.assertNotIn('tap', self.decoder.detect_encoding(".... ... / ... ...... ...."))
+        self.assertNotIn('tap', self.decoder.detect_encoding(".... ... / ... .... ."))
+        self.assertEqual(self.decoder.detect_encoding("VIII/V-XII XII")['ascii'], 0.5)
+        self.assertNotIn('ascii', self.decoder.detect_encoding("VIII V XIIB XII"))
+        self.assertEqual(self.decoder.detect_encoding("ABBAA BAABA")['bacon'], 0.95)
+        self.assertIn('ascii85', self.decoder.detect_encoding("<~87cURD]i,\"Ebo80~>"))
+
+    def test_solve_layers(self):
+        """Testa a busca automática de decodificações em camadas"""
+        # "THE PATH IS THE ANSWER" -> César 7 -> Base64 -> hex
+        encoded = self.decoder.encode_hex(self.decoder.encode_base64(self.decoder.encode_caesar("7:THE PATH IS THE ANSWER")))
+        results = self.decoder.solve_layers(encoded)
+        self.assertEqual(results[0]['path'], ['hex', 'base64', 'caesar(7)'])
+        self.assertEqual(results[0]['text'], "THE PATH IS THE ANSWER")
+        self.assertEqual(self.decoder.solve_layers(encoded, time_budget=0), [])
+        # O orçamento vale para entradas grandes: as buscas de chave e as
+        # decodificações param no prazo (a folga cobre um passo vetorizado)
+        letters = np.random.RandomState(0).choice(list("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ "), 500_000)
+        payload = base64.b64encode(''.join(letters).encode()).decode()
+        for data, budget in ((''.join(letters), 0.3), (payload, 0.15)):
+            start = time.monotonic()
+            self.decoder.solve_layers(data, time_budget=budget)
+            self.assertLess(time.monotonic() - start, budget + 0.05)
+
+    def test_braille_modes(self):
+        """Testa os indicadores de maiúscula e número do Braille"""
+        self.assertEqual(self.decoder.decode_braille("⠨⠨⠓⠑⠇⠇⠕"), "HELLO")
+        self.assertEqual(self.decoder.decode_braille("⠨⠓⠑⠇⠇⠕⠀⠼⠁⠚⠀⠁⠚"), "Hello 10 aj")
+        self.assertEqual(self.decoder.decode_braille("⠓⠊⠖ x"), "hi! x")
+        self.assertEqual(braille.decode(braille.encode("Sala 42, ok?")), "Sala 42, ok?")
+        # Indicador de letra (⠰) depois de dígitos; a maiúscula também encerra o modo numérico
+        self.assertEqual(braille.encode("room 4b"), "⠗⠕⠕⠍⠀⠼⠙⠰⠃")
+        for text in ("room 4b", "42a", "x1c", "Room 4B"):
+            self.assertEqual(braille.decode(braille.encode(text)), text)
+        self.assertEqual(self.decoder.decode_braille("⠼⠁⠃⠨⠁"), "12A")
+
+    def test_morse_separators(self):
+        """Testa os separadores de palavra do Morse e a contagem de símbolos desconhecidos"""
+        for separator in (" / ", " | ", "   ", "\n"):
+            self.assertEqual(self.decoder.decode_morse(f".... ..{separator}- .... . .-. ."), "HI THERE")
+        self.assertEqual(self.decoder.encode_morse("hi there"), ".... .. / - .... . .-. .")
+        text, unknown = morse.decode_report("... x-- ..--.. ..-- ...", unknown="#")
+        self.assertEqual(text, "S#?#S")
+        self.assertEqual(unknown, {'x--': 1, '..--': 1})
+        self.assertEqual(morse.decode_symbols(['...', '---', '...', '.-.-.-.-']), ['S', 'O', 'S'])
+
+    def test_morse_segmentation(self):
+        """Testa a segmentação de Morse sem separadores"""
+        unspaced = "......-...-..---.-----.-..-..-.."  # HELLO WORLD
+        self.assertEqual(self.decoder.decode_morse(unspaced), "HELLO WORLD")
+        readings = self.decoder.segment_morse(unspaced, top_k=3)
+        self.assertEqual(len(readings), 3)
+        self.assertEqual(readings[0]['text'], "HELLO WORLD")
+        self.assertLessEqual(readings[0]['cost'], readings[1]['cost'])
+
+    def test_binary_alignment_scan(self):
+        """Testa binário desalinhado e em 7 e 5 bits"""
+        bits = ''.join(f'{byte:08b}' for byte in b"Hello world")
+        self.assertEqual(self.decoder.decode_binary("101" + bits), "Hello world")
+        seven = ''.join(f'{byte:07b}' for byte in b"Hello world")
+        best = self.decoder.scan_binary(seven)[0]
+        self.assertEqual((best['width'], best['offset'], best['text']), (7, 0, "Hello world"))
+        baudot = ''.join(f'{code:05b}' for code in (20, 1, 18, 18, 24, 4, 19, 24, 10, 18, 9))
+        self.assertEqual(self.decoder.scan_binary(baudot)[0]['text'], "HELLO WORLD")
+        # Em palavras curtas, leituras de 5 e 7 bits que deixam bits sobrando não vencem os bytes
+        for word in ("flag", "key", "hi", "ok"):
+            best = self.decoder.scan_binary(''.join(f'{byte:08b}' for byte in word.encode()))[0]
+            self.assertEqual((best['width'], best['text']), (8, word))
+
+    def test_braille_grade2(self):
+        """Testa as contrações do grau 2 (casamento mais longo, ida e volta, JSON)"""
+        codec = braille.Grade2Codec()
+        # 'for' vence 'or' independentemente da ordem da tabela
+        reordered = braille.Grade2Codec(dict(reversed(list(braille.DEFAULT_CONTRACTIONS.items()))))
+        self.assertEqual(codec.encode("forest"), "⠿⠑⠌")
+        self.assertEqual(reordered.encode("forest"), "⠿⠑⠌")
+        self.assertEqual(codec.decode(codec.encode("the forest of stars")), "the forest of stars")
+        self.assertEqual(self.decoder.decode_braille(self.decoder.encode_braille("for")).split()[0], "for")
+        # A maiúscula antes de uma contração vale para a expansão
+        for text in ("Forest", "Star 42", "FOREST now", "Order 4b"):
+            self.assertEqual(codec.decode(codec.encode(text)), text)
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as file:
+            json.dump({"the": "⠮", "and": "⠯"}, file, ensure_ascii=False)
+        try:
+            custom = braille.Grade2Codec.from_file(file.name)
+        finally:
+            os.unlink(file.name)
+        self.assertEqual(custom.encode("The band"), "⠨⠮⠀⠃⠯")
+        self.assertEqual(custom.decode("⠮⠀⠃⠯"), "the band")
+        self.assertEqual(custom.decode("⠨⠮⠀⠨⠨⠯"), "The AND")
+
 if __name__ == '__main__':
     unittest.main()